@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Confronta il caricamento di un piano Excel sintetico con core.utils.load_excel
+(lettura unica del file e operazioni sulle colonne) e con l'implementazione
+precedente basata su iterrows, verificando che i risultati coincidano.
+
+Richiede pandas e openpyxl.
+
+Uso:
+    python benchmarks/excel_import.py
+    python benchmarks/excel_import.py --rows 100000 --runs 3
+"""
+
+import argparse
+import datetime
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from core.utils import load_excel
+
+# Colonne del foglio degli allenamenti
+WORKOUT_COLUMNS = ['Nome', 'TipoPasso', 'Dettagli', 'SubTipoPasso', 'SubDettagli', 'TipoSport', 'Data']
+
+# Righe di un allenamento sintetico (TipoPasso, Dettagli, SubTipoPasso, SubDettagli)
+WORKOUT_TEMPLATE = [
+    ('warmup', '10min @ Z1 -- Riscaldamento', None, None),
+    ('repeat', '5', None, None),
+    (None, None, 'interval', '1km @ Z4 -- Ripetuta'),
+    (None, None, 'recovery', '2min @ Z1'),
+    ('steady', '20min @hr Z2_HR', None, None),
+    ('repeat', '3', None, None),
+    (None, None, 'interval', '400m @pwr threshold'),
+    (None, None, 'recovery', '1:30'),
+    ('cooldown', '10min @ Z1 -- Defaticamento', None, None),
+]
+
+
+def legacy_load_excel(filename):
+    """
+    Implementazione precedente di load_excel (un read_excel per foglio e iterrows).
+
+    Args:
+        filename: Nome del file Excel
+
+    Returns:
+        dict: Dati caricati dal file Excel
+    """
+    config_df = pd.read_excel(filename, sheet_name='Config')
+    config = {}
+    for _, row in config_df.iterrows():
+        if pd.notna(row['Chiave']) and pd.notna(row['Valore']):
+            config[row['Chiave']] = row['Valore']
+
+    zone_sheets = {}
+    for key, sheet in (('paces', 'Paces'), ('heart_rates', 'HeartRates'), ('power_values', 'PowerValues')):
+        zone_sheets[key] = {}
+        try:
+            df = pd.read_excel(filename, sheet_name=sheet)
+            for _, row in df.iterrows():
+                if pd.notna(row['Nome']) and pd.notna(row['Valore']):
+                    zone_sheets[key][row['Nome']] = row['Valore']
+        except Exception:
+            logging.warning(f"Foglio '{sheet}' non trovato o vuoto.")
+
+    workouts_df = pd.read_excel(filename, sheet_name='Workouts')
+    workouts = {}
+    current_workout = None
+    current_steps = []
+    for _, row in workouts_df.iterrows():
+        if pd.notna(row['Nome']) and row['Nome'].strip():
+            if current_workout:
+                workouts[current_workout] = current_steps
+            current_workout = row['Nome'].strip()
+            current_steps = []
+            if pd.notna(row['TipoSport']):
+                current_steps.append({"sport_type": row['TipoSport'].strip()})
+            if pd.notna(row['Data']):
+                date_str = None
+                if isinstance(row['Data'], str):
+                    date_str = row['Data'].strip()
+                elif isinstance(row['Data'], datetime.datetime):
+                    date_str = row['Data'].strftime('%Y-%m-%d')
+                if date_str:
+                    current_steps.append({"date": date_str})
+
+        if pd.notna(row['TipoPasso']) and pd.notna(row['Dettagli']):
+            step_type = row['TipoPasso'].strip()
+            step_details = row['Dettagli'].strip()
+            if step_type.lower() == 'repeat':
+                try:
+                    current_steps.append({"repeat": int(step_details), "steps": []})
+                except ValueError:
+                    logging.warning(f"Formato non valido per ripetizione: {step_details}")
+            else:
+                current_steps.append({step_type: step_details})
+
+        if pd.isna(row['TipoPasso']) and pd.notna(row['SubTipoPasso']) and pd.notna(row['SubDettagli']):
+            for step in reversed(current_steps):
+                if "repeat" in step:
+                    step["steps"].append({row['SubTipoPasso'].strip(): row['SubDettagli'].strip()})
+                    break
+
+    if current_workout:
+        workouts[current_workout] = current_steps
+
+    result = dict(workouts)
+    result['config'] = dict(zone_sheets)
+    result['config'].update(config)
+    return result
+
+
+def write_plan(filename, rows):
+    """
+    Scrive un piano Excel sintetico con circa il numero di righe indicato.
+
+    Args:
+        filename: Nome del file Excel
+        rows: Numero di righe del foglio degli allenamenti
+    """
+    records = []
+    index = 0
+    start = datetime.date(2026, 1, 1)
+    while len(records) < rows:
+        index += 1
+        date = start + datetime.timedelta(days=index % 365)
+        for position, (step_type, details, sub_type, sub_details) in enumerate(WORKOUT_TEMPLATE):
+            first = position == 0
+            records.append({
+                'Nome': f"W{index:05d} Sintetico" if first else None,
+                'TipoPasso': step_type,
+                'Dettagli': details,
+                'SubTipoPasso': sub_type,
+                'SubDettagli': sub_details,
+                'TipoSport': 'running' if first else None,
+                'Data': date.strftime('%Y-%m-%d') if first else None,
+            })
+
+    with pd.ExcelWriter(filename) as writer:
+        pd.DataFrame({'Chiave': ['athlete_name', 'name_prefix'],
+                      'Valore': ['Benchmark', 'BENCH']}).to_excel(writer, sheet_name='Config', index=False)
+        pd.DataFrame({'Nome': ['Z1', 'Z2', 'Z4'],
+                      'Valore': ['6:30', '5:45', '4:30']}).to_excel(writer, sheet_name='Paces', index=False)
+        pd.DataFrame({'Nome': ['max_hr', 'Z2_HR'],
+                      'Valore': ['190', '62-76% max_hr']}).to_excel(writer, sheet_name='HeartRates', index=False)
+        pd.DataFrame({'Nome': ['ftp', 'threshold'],
+                      'Valore': ['250', '235-260']}).to_excel(writer, sheet_name='PowerValues', index=False)
+        pd.DataFrame(records, columns=WORKOUT_COLUMNS).to_excel(writer, sheet_name='Workouts', index=False)
+
+
+def timed(loader, filename, runs):
+    """
+    Esegue un caricamento più volte e restituisce il tempo migliore.
+
+    Args:
+        loader: Funzione di caricamento
+        filename: Nome del file Excel
+        runs: Numero di esecuzioni
+
+    Returns:
+        tuple: (secondi del caricamento più veloce, risultato)
+    """
+    best = None
+    result = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = loader(filename)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del caricamento dei piani Excel")
+    parser.add_argument("--rows", type=int, default=50000, help="Righe del foglio Workouts")
+    parser.add_argument("--runs", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "plan.xlsx")
+        write_plan(filename, args.rows)
+
+        legacy_time, legacy = timed(legacy_load_excel, filename, args.runs)
+        current_time, current = timed(load_excel, filename, args.runs)
+
+    workouts = len(current) - 1
+    print(f"{args.rows} righe, {workouts} allenamenti")
+    print(f"iterrows   {legacy_time:7.2f}s")
+    print(f"colonne    {current_time:7.2f}s  ({legacy_time / current_time:.1f}x)")
+
+    if current != legacy:
+        print("ERRORE: i risultati non coincidono")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
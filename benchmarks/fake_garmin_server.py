@@ -0,0 +1,342 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Server HTTP locale che simula gli endpoint di Garmin Connect usati da
+GarminClient (workout-service, calendar-service, userprofile-service).
+Permette di misurare caricamento, download e pianificazione senza rete,
+con latenza, errori e limiti di richieste configurabili.
+
+Uso:
+    python benchmarks/fake_garmin_server.py --port 8765 --latency 80 --error-rate 0.02 --rate-limit 20
+    GARMIN_TRAINER_API_URL=http://127.0.0.1:8765 python main.py
+"""
+
+import argparse
+import copy
+import datetime
+import json
+import logging
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Porta predefinita del server
+DEFAULT_PORT = 8765
+
+
+class FakeGarminState:
+    """Stato in memoria del server: allenamenti, calendario e parametri"""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, rate_limit=0.0, seed_workouts=0):
+        """
+        Inizializza lo stato.
+
+        Args:
+            latency: Latenza media di ogni risposta (secondi)
+            jitter: Variazione massima della latenza (secondi)
+            error_rate: Probabilità di rispondere con un 503
+            rate_limit: Richieste al secondo consentite (0 = nessun limite)
+            seed_workouts: Numero di allenamenti creati all'avvio
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+
+        self.lock = threading.Lock()
+        self.workouts = {}
+        self.schedules = {}
+        self.next_id = 1000
+        self.request_count = 0
+        self.throttled_count = 0
+        self.error_count = 0
+        self._window_start = time.monotonic()
+        self._window_count = 0
+
+        for i in range(seed_workouts):
+            self.create_workout({
+                "workoutName": f"Seed {i + 1:04d}",
+                "sportType": {"sportTypeId": 1, "sportTypeKey": "running"},
+                "workoutSegments": [{
+                    "segmentOrder": 1,
+                    "sportType": {"sportTypeId": 1, "sportTypeKey": "running"},
+                    "workoutSteps": [{
+                        "type": "ExecutableStepDTO", "stepOrder": 1,
+                        "stepType": {"stepTypeId": 3, "stepTypeKey": "interval"},
+                        "endCondition": {"conditionTypeId": 2, "conditionTypeKey": "time"},
+                        "endConditionValue": 600,
+                    }],
+                }],
+            })
+
+    def _new_id(self):
+        self.next_id += 1
+        return self.next_id
+
+    def create_workout(self, data):
+        """Crea un allenamento e restituisce i dettagli memorizzati."""
+        with self.lock:
+            workout = copy.deepcopy(data)
+            workout["workoutId"] = self._new_id()
+            workout["updateDate"] = datetime.datetime.now().isoformat(timespec='milliseconds')
+            self.workouts[workout["workoutId"]] = workout
+            return workout
+
+    def admit(self):
+        """
+        Decide l'esito di una richiesta prima di elaborarla.
+
+        Returns:
+            tuple: (codice HTTP di errore o None, secondi di Retry-After o None)
+        """
+        with self.lock:
+            self.request_count += 1
+
+            if self.rate_limit > 0:
+                now = time.monotonic()
+                if now - self._window_start >= 1.0:
+                    self._window_start = now
+                    self._window_count = 0
+                self._window_count += 1
+                if self._window_count > self.rate_limit:
+                    self.throttled_count += 1
+                    return 429, max(0.0, 1.0 - (now - self._window_start))
+
+            if self.error_rate > 0 and random.random() < self.error_rate:
+                self.error_count += 1
+                return 503, None
+
+        return None, None
+
+    def delay(self):
+        """Attende la latenza simulata."""
+        wait = self.latency + random.uniform(-self.jitter, self.jitter)
+        if wait > 0:
+            time.sleep(wait)
+
+
+class FakeGarminHandler(BaseHTTPRequestHandler):
+    """Gestore delle richieste del server sostitutivo"""
+
+    protocol_version = "HTTP/1.1"
+
+    # Rotte: (metodo, espressione regolare, nome del metodo)
+    ROUTES = [
+        ("GET", r"^/workout-service/workouts$", "list_workouts"),
+        ("GET", r"^/workout-service/workout/(\d+)$", "get_workout"),
+        ("POST", r"^/workout-service/workout$", "add_workout"),
+        ("PUT", r"^/workout-service/workout/(\d+)$", "update_workout"),
+        ("DELETE", r"^/workout-service/workout/(\d+)$", "delete_workout"),
+        ("POST", r"^/workout-service/schedule/(\d+)$", "schedule_workout"),
+        ("DELETE", r"^/workout-service/schedule/(\d+)$", "unschedule_workout"),
+        ("GET", r"^/calendar-service/year/(\d+)/month/(\d+)$", "get_calendar"),
+        ("GET", r"^/userprofile-service/userprofile$", "get_user_profile"),
+    ]
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        logging.debug(format % args)
+
+    def _send(self, status, body=None, headers=None):
+        payload = b"" if body is None else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if payload:
+            self.wfile.write(payload)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length).decode("utf-8"))
+
+    def _dispatch(self, method):
+        url = urlparse(self.path)
+        # Il corpo va sempre letto, per mantenere valida la connessione keep-alive
+        body = self._read_json() if method in ("POST", "PUT") else {}
+
+        status, retry_after = self.state.admit()
+        self.state.delay()
+        if status == 429:
+            self._send(429, {"message": "Too Many Requests"}, {"Retry-After": f"{retry_after:.2f}"})
+            return
+        if status is not None:
+            self._send(status, {"message": "Service Unavailable"})
+            return
+
+        for route_method, pattern, handler in self.ROUTES:
+            match = re.match(pattern, url.path)
+            if route_method == method and match:
+                getattr(self, handler)(*match.groups(), query=parse_qs(url.query), body=body)
+                return
+
+        self._send(404, {"message": "Not Found"})
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    # Endpoint
+
+    def list_workouts(self, query, body):
+        start = int(query.get("start", ["1"])[0])
+        limit = int(query.get("limit", ["100"])[0])
+        with self.state.lock:
+            workouts = sorted(self.state.workouts.values(), key=lambda w: w["workoutId"])
+            page = [{
+                "workoutId": w["workoutId"],
+                "workoutName": w.get("workoutName"),
+                "description": w.get("description"),
+                "sportType": w.get("sportType"),
+                "updateDate": w["updateDate"],
+            } for w in workouts[start - 1:start - 1 + limit]]
+        self._send(200, page)
+
+    def get_workout(self, workout_id, query, body):
+        with self.state.lock:
+            workout = self.state.workouts.get(int(workout_id))
+            workout = copy.deepcopy(workout)
+        if workout is None:
+            self._send(404, {"message": "Workout not found"})
+        else:
+            self._send(200, workout)
+
+    def add_workout(self, query, body):
+        self._send(200, self.state.create_workout(body))
+
+    def update_workout(self, workout_id, query, body):
+        with self.state.lock:
+            if int(workout_id) not in self.state.workouts:
+                self._send(404, {"message": "Workout not found"})
+                return
+            workout = copy.deepcopy(body)
+            workout["workoutId"] = int(workout_id)
+            workout["updateDate"] = datetime.datetime.now().isoformat(timespec='milliseconds')
+            self.state.workouts[int(workout_id)] = workout
+        self._send(204)
+
+    def delete_workout(self, workout_id, query, body):
+        with self.state.lock:
+            self.state.workouts.pop(int(workout_id), None)
+            for schedule_id in [s for s, item in self.state.schedules.items()
+                                if item["workoutId"] == int(workout_id)]:
+                del self.state.schedules[schedule_id]
+        self._send(204)
+
+    def schedule_workout(self, workout_id, query, body):
+        with self.state.lock:
+            workout = self.state.workouts.get(int(workout_id))
+            if workout is None:
+                self._send(404, {"message": "Workout not found"})
+                return
+            schedule_id = self.state._new_id()
+            self.state.schedules[schedule_id] = {
+                "id": schedule_id,
+                "itemType": "workout",
+                "workoutId": int(workout_id),
+                "title": workout.get("workoutName"),
+                "date": body.get("date"),
+            }
+        self._send(200, {"workoutScheduleId": schedule_id, "calendarDate": body.get("date"),
+                         "workout": {"workoutId": int(workout_id)}})
+
+    def unschedule_workout(self, schedule_id, query, body):
+        with self.state.lock:
+            self.state.schedules.pop(int(schedule_id), None)
+        self._send(204)
+
+    def get_calendar(self, year, month, query, body):
+        # Come Garmin Connect, il mese è numerato da 0
+        prefix = f"{int(year):04d}-{int(month) + 1:02d}-"
+        with self.state.lock:
+            items = [dict(item) for item in self.state.schedules.values()
+                     if (item["date"] or "").startswith(prefix)]
+        self._send(200, {"startDayOfMonth": 0, "numOfDaysInMonth": 31, "calendarItems": items})
+
+    def get_user_profile(self, query, body):
+        self._send(200, {"id": 1, "userName": "standin", "displayName": "Atleta di prova"})
+
+
+def create_server(port=DEFAULT_PORT, host="127.0.0.1", **options):
+    """
+    Crea il server sostitutivo (da avviare con serve_forever).
+
+    Args:
+        port: Porta di ascolto (0 per una porta libera)
+        host: Indirizzo di ascolto
+        **options: Parametri di FakeGarminState
+
+    Returns:
+        ThreadingHTTPServer: Il server, con lo stato in server.state
+    """
+    server = ThreadingHTTPServer((host, port), FakeGarminHandler)
+    server.daemon_threads = True
+    server.state = FakeGarminState(**options)
+    return server
+
+
+def start_in_thread(**options):
+    """
+    Avvia il server in un thread in background.
+
+    Args:
+        **options: Parametri di create_server
+
+    Returns:
+        tuple: (server, URL di base)
+    """
+    server = create_server(**options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Server sostitutivo di Garmin Connect")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency", type=float, default=0.0, help="Latenza media in millisecondi")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Variazione della latenza in millisecondi")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probabilità di risposta 503 (0-1)")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Richieste al secondo (0 = illimitate)")
+    parser.add_argument("--seed-workouts", type=int, default=0, help="Allenamenti presenti all'avvio")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = create_server(
+        port=args.port, host=args.host,
+        latency=args.latency / 1000.0, jitter=args.jitter / 1000.0,
+        error_rate=args.error_rate, rate_limit=args.rate_limit,
+        seed_workouts=args.seed_workouts,
+    )
+    logging.info(f"Server sostitutivo in ascolto su http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
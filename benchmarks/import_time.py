@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Misura il tempo di importazione dei moduli di avvio e verifica che le
+dipendenze pesanti (pandas, openpyxl, yaml, tkcalendar) non vengano caricate
+all'avvio. Esce con codice 1 in caso di regressione.
+
+Uso:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --module cli --max-ms 300 --runs 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Radice del progetto
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Moduli da misurare (avvio dell'interfaccia grafica e della riga di comando)
+DEFAULT_MODULES = ["gui.app", "cli"]
+
+# Dipendenze che non devono essere importate all'avvio
+HEAVY_MODULES = ["pandas", "openpyxl", "yaml", "tkcalendar", "gui.zones_frame", "gui.import_export_frame"]
+
+# Codice eseguito in un processo separato per ogni misura
+PROBE = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"ms": elapsed * 1000, "modules": sorted(sys.modules)}}))
+"""
+
+
+def measure(module, runs):
+    """
+    Importa un modulo in processi Python nuovi e ne misura il tempo.
+
+    Args:
+        module: Nome del modulo
+        runs: Numero di misure
+
+    Returns:
+        tuple: (lista dei tempi in ms, moduli caricati nell'ultima misura)
+    """
+    times = []
+    modules = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(root=ROOT, module=module)],
+            capture_output=True, text=True, check=True, cwd=ROOT,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        times.append(result["ms"])
+        modules = result["modules"]
+    return times, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del tempo di avvio")
+    parser.add_argument("--module", action="append", help="Modulo da misurare (ripetibile)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=None,
+                        help="Tempo mediano massimo consentito per modulo")
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.module or DEFAULT_MODULES:
+        try:
+            times, modules = measure(module, args.runs)
+        except subprocess.CalledProcessError as e:
+            print(f"{module:<20} importazione non riuscita:\n{e.stderr}")
+            failed = True
+            continue
+
+        median = statistics.median(times)
+        heavy = [m for m in HEAVY_MODULES if m in modules]
+        print(f"{module:<20} mediana {median:7.1f} ms  min {min(times):7.1f} ms  "
+              f"max {max(times):7.1f} ms  ({len(modules)} moduli)")
+
+        if heavy:
+            print(f"  ERRORE: importati all'avvio: {', '.join(heavy)}")
+            failed = True
+        if args.max_ms is not None and median > args.max_ms:
+            print(f"  ERRORE: oltre il limite di {args.max_ms:.0f} ms")
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
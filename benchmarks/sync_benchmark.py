@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Misura la velocità di caricamento, download e pianificazione degli
+allenamenti usando il server sostitutivo di Garmin Connect.
+
+Uso:
+    python benchmarks/sync_benchmark.py --workouts 200 --latency 80 --concurrency 4
+"""
+
+import argparse
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_garmin_server import start_in_thread
+from core.garmin_client import GarminClient
+from core.uploader import UploadEngine
+from core.sync_planner import SyncPlanner
+from core.workout import Workout, WorkoutStep, Target
+
+
+def make_workouts(count):
+    """
+    Crea allenamenti sintetici, pianificati in giorni consecutivi.
+
+    Args:
+        count: Numero di allenamenti
+
+    Returns:
+        list: Lista di Workout
+    """
+    start = datetime.date.today()
+    workouts = []
+    for i in range(count):
+        workout = Workout("running", f"Benchmark {i + 1:04d}")
+        workout.add_step(WorkoutStep(0, "warmup", end_condition="time", end_condition_value="10:00"))
+        repeat = WorkoutStep(0, "repeat", end_condition="iterations", end_condition_value=5)
+        repeat.add_step(WorkoutStep(0, "interval", end_condition="distance", end_condition_value="1km",
+                                    target=Target("pace.zone", 3.8, 4.2)))
+        repeat.add_step(WorkoutStep(0, "recovery", end_condition="time", end_condition_value="2:00"))
+        workout.add_step(repeat)
+        workout.add_step(WorkoutStep(0, "cooldown", end_condition="time", end_condition_value="10:00"))
+        workout.set_scheduled_date(start + datetime.timedelta(days=i))
+        workouts.append(workout)
+    return workouts
+
+
+def timed(label, func, count):
+    """Esegue func, stampa durata e throughput e restituisce il risultato."""
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {elapsed:8.2f}s  {count / elapsed if elapsed else 0:8.1f} op/s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark della sincronizzazione")
+    parser.add_argument("--workouts", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=50.0, help="Latenza in millisecondi")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0)
+    parser.add_argument("--metrics", help="File JSON in cui salvare le metriche per endpoint")
+    args = parser.parse_args()
+
+    server, url = start_in_thread(port=0, latency=args.latency / 1000.0,
+                                  error_rate=args.error_rate, rate_limit=args.rate_limit)
+    client = GarminClient(tempfile.mkdtemp(prefix="garmin-bench-"), api_url=url)
+    client.configure_connection_pool(args.concurrency)
+    workouts = make_workouts(args.workouts)
+    engine = UploadEngine(client, args.concurrency)
+    planner = SyncPlanner(client, args.concurrency)
+
+    print(f"{args.workouts} allenamenti, concorrenza {args.concurrency}, latenza {args.latency:.0f} ms")
+
+    def sync():
+        plan = planner.plan(workouts, client.list_workouts(), replace=True)
+        return engine.execute(plan, schedule=True)
+
+    report = timed("Primo caricamento", sync, args.workouts)
+    print(f"  {report.summary()}")
+    report = timed("Nuova sincronizzazione", sync, args.workouts)
+    print(f"  {report.summary()}")
+
+    def download():
+        summaries = [s for page in client.iter_workout_pages() for s in page]
+        client.workout_cache.clear()
+        for summary in summaries:
+            client.get_workout(summary["workoutId"], summary["updateDate"])
+        return summaries
+
+    timed("Download dettagli", download, args.workouts)
+
+    print(client.metrics.format_report())
+    if args.metrics:
+        client.metrics.export_json(args.metrics)
+
+    state = server.state
+    print(f"Richieste al server: {state.request_count} "
+          f"(429: {state.throttled_count}, 503: {state.error_count})")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
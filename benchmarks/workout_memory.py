@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Confronta la memoria occupata da una libreria sintetica di allenamenti con il
+modello a __slots__ di core.workout e con un modello equivalente basato su
+__dict__ (come le classi prima dell'introduzione degli slot).
+
+Uso:
+    python benchmarks/workout_memory.py
+    python benchmarks/workout_memory.py --workouts 20000 --repeats 3
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.workout import Workout, WorkoutStep, Target
+
+
+def dict_backed(cls):
+    """
+    Crea una copia della classe senza __slots__, con un __dict__ per istanza.
+
+    Args:
+        cls: Classe del modello a slot
+
+    Returns:
+        type: Classe equivalente basata su __dict__
+    """
+    namespace = {key: value for key, value in vars(cls).items()
+                 if key not in ('__slots__', '__dict__', '__weakref__')
+                 and key not in getattr(cls, '__slots__', ())}
+    return type(f"Dict{cls.__name__}", (), namespace)
+
+
+# Modello basato su __dict__ usato come riferimento
+DICT_MODEL = (dict_backed(Workout), dict_backed(WorkoutStep), dict_backed(Target))
+
+# Modello attuale a slot
+SLOTS_MODEL = (Workout, WorkoutStep, Target)
+
+
+def build_library(model, count, repeats):
+    """
+    Crea una libreria sintetica di allenamenti con ripetizioni annidate.
+
+    Args:
+        model: Tupla (classe Workout, classe WorkoutStep, classe Target)
+        count: Numero di allenamenti
+        repeats: Numero di blocchi di ripetizione per allenamento
+
+    Returns:
+        list: Lista di allenamenti
+    """
+    workout_cls, step_cls, target_cls = model
+    library = []
+    for i in range(count):
+        workout = workout_cls("running", f"Allenamento {i + 1:05d}", "Libreria sintetica")
+        workout.add_step(step_cls(0, "warmup", "Riscaldamento", "time", "10:00", target_cls()))
+        for r in range(repeats):
+            repeat = step_cls(0, "repeat", "", "iterations", 4 + r, target_cls())
+            target = target_cls("pace.zone", 3.8, 4.2)
+            target.zone_name = "Z4"
+            repeat.add_step(step_cls(0, "interval", "Ripetuta", "distance", "1km", target))
+            repeat.add_step(step_cls(0, "recovery", "Recupero", "time", "2:00", target_cls()))
+            workout.add_step(repeat)
+        workout.add_step(step_cls(0, "cooldown", "Defaticamento", "time", "10:00", target_cls()))
+        workout.set_scheduled_date(f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}")
+        library.append(workout)
+    return library
+
+
+def measure(model, count, repeats):
+    """
+    Misura memoria e tempo di costruzione di una libreria.
+
+    Args:
+        model: Tupla delle classi del modello
+        count: Numero di allenamenti
+        repeats: Numero di blocchi di ripetizione per allenamento
+
+    Returns:
+        tuple: (byte allocati, secondi di costruzione, numero di oggetti)
+    """
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    library = build_library(model, count, repeats)
+    elapsed = time.perf_counter() - started
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    steps = sum(1 + sum(len(s.workout_steps) for s in w.workout_steps) for w in library)
+    objects = count + steps * 2
+    del library
+    gc.collect()
+    return allocated, elapsed, objects
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark della memoria del modello degli allenamenti")
+    parser.add_argument("--workouts", type=int, default=10000)
+    parser.add_argument("--repeats", type=int, default=2, help="Blocchi di ripetizione per allenamento")
+    args = parser.parse_args()
+
+    print(f"{args.workouts} allenamenti, {args.repeats} blocchi di ripetizione ciascuno")
+    results = {}
+    for label, model in (("__dict__", DICT_MODEL), ("__slots__", SLOTS_MODEL)):
+        allocated, elapsed, objects = measure(model, args.workouts, args.repeats)
+        results[label] = allocated
+        print(f"{label:<10} {allocated / 1024 / 1024:8.1f} MiB  {elapsed:6.2f}s  "
+              f"{allocated / objects:6.0f} byte/oggetto ({objects} oggetti)")
+
+    saved = 1 - results["__slots__"] / results["__dict__"]
+    print(f"Risparmio: {saved:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Garmin Trainer - Interfaccia a riga di comando
+
+Importa un piano di allenamento (YAML o Excel), lo carica su Garmin Connect
+e lo pianifica senza interfaccia grafica, ad esempio da cron o da un server.
+
+Esempi:
+    python cli.py piano.yaml
+    python cli.py piano.xlsx --no-replace --no-schedule --report report.json
+    python cli.py piano.yaml --dry-run
+    python cli.py piano.yaml --delete-missing --yes
+    python cli.py piano.yaml --athlete Mario=~/.garth-mario --athlete Anna=~/.garth-anna
+
+Codici di uscita:
+    0  tutti gli allenamenti caricati e pianificati
+    1  caricamento completato con errori
+    2  errore fatale (file non valido, login non riuscito, ...)
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+
+# Aggiungi il percorso corrente al path Python
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# core.garmin_client (con garth e requests) viene importato solo quando serve,
+# così l'avvio e --help non dipendono dalle librerie di rete
+
+from core.utils import load_config
+from core.plan_import import load_plan
+from core.sync_planner import SyncPlanner
+from core.uploader import UploadEngine, DEFAULT_CONCURRENCY
+from core.upload_journal import UploadJournal, UPLOAD_JOURNAL_FILE
+from core.batch_sync import Athlete, BatchSync, DEFAULT_ATHLETE_CONCURRENCY
+from core.metrics import format_metrics
+
+# Codici di uscita
+EXIT_OK = 0
+EXIT_ERRORS = 1
+EXIT_FAILURE = 2
+
+# File di configurazione condiviso con l'interfaccia grafica
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json')
+
+
+def parse_args(argv=None):
+    """
+    Interpreta gli argomenti della riga di comando.
+
+    Args:
+        argv: Lista degli argomenti (None per sys.argv)
+
+    Returns:
+        argparse.Namespace: Argomenti interpretati
+    """
+    parser = argparse.ArgumentParser(
+        description="Carica e pianifica su Garmin Connect un piano di allenamento YAML o Excel.")
+    parser.add_argument("plan", help="File del piano (.yaml, .yml, .xlsx, .xls)")
+    parser.add_argument("--config", default=CONFIG_FILE, help="File di configurazione")
+    parser.add_argument("--oauth-folder", help="Cartella dei token OAuth di Garmin Connect")
+    parser.add_argument("--api-url", help="URL di un server sostitutivo di Garmin Connect")
+    parser.add_argument("--no-replace", dest="replace", action="store_false",
+                        help="Crea sempre nuovi allenamenti invece di sostituire quelli con lo stesso nome")
+    parser.add_argument("--no-schedule", dest="schedule", action="store_false",
+                        help="Non pianificare gli allenamenti nelle date indicate")
+    parser.add_argument("--prune-schedules", action="store_true",
+                        help="Rimuovi dal calendario le altre date (o i duplicati) degli allenamenti del piano")
+    parser.add_argument("--delete-missing", action="store_true",
+                        help="ATTENZIONE: elimina da Garmin Connect TUTTI gli allenamenti della libreria "
+                             "non presenti nel piano, anche quelli creati a mano; richiede --yes "
+                             "(provare prima con --dry-run)")
+    parser.add_argument("--yes", action="store_true",
+                        help="Conferma le operazioni distruttive (--delete-missing)")
+    parser.add_argument("--concurrency", type=int, help="Allenamenti caricati in parallelo")
+    parser.add_argument("--athlete", action="append", default=[], metavar="NOME=CARTELLA",
+                        help="Atleta da sincronizzare con la sua cartella OAuth (ripetibile)")
+    parser.add_argument("--athletes-file",
+                        help="File JSON con la lista degli atleti [{\"name\": ..., \"oauth_folder\": ...}]")
+    parser.add_argument("--parallel-athletes", type=int, default=DEFAULT_ATHLETE_CONCURRENCY,
+                        help="Atleti sincronizzati in parallelo")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Mostra le operazioni necessarie senza eseguirle")
+    parser.add_argument("--report", help="File JSON del rapporto ('-' per lo standard output)")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Mostra i messaggi di log dettagliati")
+    return parser.parse_args(argv)
+
+
+def load_athletes(args):
+    """
+    Costruisce la lista degli atleti dalle opzioni --athlete e --athletes-file.
+
+    Args:
+        args: Argomenti della riga di comando
+
+    Returns:
+        list: Lista di Athlete (vuota se non indicati)
+
+    Raises:
+        ValueError: Se un atleta non è nel formato NOME=CARTELLA
+    """
+    athletes = []
+    if args.athletes_file:
+        with open(args.athletes_file, 'r', encoding='utf-8') as f:
+            for entry in json.load(f):
+                athletes.append(Athlete(entry["name"], entry["oauth_folder"], args.api_url))
+
+    for value in args.athlete:
+        name, sep, folder = value.partition('=')
+        if not sep or not name or not folder:
+            raise ValueError(f"Atleta non valido '{value}': usa il formato NOME=CARTELLA")
+        athletes.append(Athlete(name, folder, args.api_url))
+
+    return athletes
+
+
+def write_report(report, destination):
+    """
+    Scrive il rapporto in formato JSON.
+
+    Args:
+        report: Dizionario del rapporto
+        destination: Percorso del file, '-' per lo standard output, None per non scriverlo
+    """
+    if not destination:
+        return
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if destination == '-':
+        print(text)
+    else:
+        with open(destination, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+
+
+def print_metrics(title, snapshot):
+    """
+    Mostra sullo standard error le metriche delle richieste a Garmin Connect.
+
+    Args:
+        title: Nome dell'operazione o dell'atleta
+        snapshot: Metriche restituite da MetricsRegistry.snapshot
+    """
+    if snapshot:
+        print(f"Richieste a Garmin Connect ({title}):\n{format_metrics(snapshot)}", file=sys.stderr)
+
+
+def run(args):
+    """
+    Esegue l'importazione, il caricamento e la pianificazione.
+
+    Args:
+        args: Argomenti della riga di comando
+
+    Returns:
+        int: Codice di uscita
+    """
+    # L'eliminazione riguarda tutta la libreria remota: va confermata esplicitamente
+    if args.delete_missing and not (args.yes or args.dry_run):
+        message = ("--delete-missing elimina da Garmin Connect tutti gli allenamenti non presenti "
+                   "nel piano: aggiungi --yes per confermare o usa --dry-run per vedere l'elenco.")
+        print(message, file=sys.stderr)
+        write_report({"plan": args.plan, "error": message}, args.report)
+        return EXIT_FAILURE
+
+    config = load_config(args.config)
+    report = {"plan": args.plan, "replace": args.replace, "schedule": args.schedule,
+              "delete_missing": args.delete_missing, "prune_schedules": args.prune_schedules,
+              "dry_run": args.dry_run}
+
+    # Importa il piano
+    try:
+        workouts, _ = load_plan(args.plan, config.get('workout_config'))
+    except Exception as e:
+        logging.error(f"Impossibile leggere il piano '{args.plan}': {str(e)}")
+        report["error"] = str(e)
+        write_report(report, args.report)
+        return EXIT_FAILURE
+
+    report["workouts"] = len(workouts)
+
+    try:
+        athletes = load_athletes(args)
+    except Exception as e:
+        logging.error(f"Impossibile leggere gli atleti: {str(e)}")
+        report["error"] = str(e)
+        write_report(report, args.report)
+        return EXIT_FAILURE
+
+    if athletes:
+        return run_batch(args, config, workouts, athletes, report)
+
+    # Collegati a Garmin Connect con i token salvati
+    from core.garmin_client import GarminClient
+    oauth_folder = args.oauth_folder or config.get('oauth_folder', '~/.garth')
+    client = GarminClient(oauth_folder, api_url=args.api_url)
+    if not client.is_logged_in():
+        message = "Sessione Garmin Connect non disponibile: effettua il login dall'applicazione."
+        logging.error(message)
+        report["error"] = message
+        write_report(report, args.report)
+        return EXIT_FAILURE
+
+    concurrency = args.concurrency or config.get('upload_concurrency', DEFAULT_CONCURRENCY)
+
+    try:
+        # Calcola solo le operazioni necessarie
+        plan = SyncPlanner(client, concurrency).plan(
+            workouts,
+            client.list_workouts(),
+            replace=args.replace,
+            delete_missing=args.delete_missing
+        )
+        report["plan_summary"] = plan.describe()
+        print(f"Piano: {plan.describe()}", file=sys.stderr)
+
+        if args.dry_run:
+            report["operations"] = [
+                {"name": op.workout.workout_name, "action": op.action, "workout_id": op.workout_id}
+                for op in plan.operations
+            ]
+            report["deletes"] = [{"workout_id": i, "name": n} for i, n in plan.deletes]
+            write_report(report, args.report)
+            return EXIT_OK
+
+        def on_progress(done, total, name, message):
+            print(f"[{done}/{total}] {name} {message}".rstrip(), file=sys.stderr)
+
+        # Carica e pianifica, riprendendo un eventuale caricamento interrotto
+        journal = UploadJournal(os.path.join(client.oauth_folder, UPLOAD_JOURNAL_FILE))
+        engine = UploadEngine(client, concurrency, journal=journal)
+        result = engine.execute(plan, schedule=args.schedule, progress_callback=on_progress,
+                                prune_schedules=args.prune_schedules)
+    except Exception as e:
+        logging.error(f"Errore durante il caricamento: {str(e)}")
+        report["error"] = str(e)
+        write_report(report, args.report)
+        return EXIT_FAILURE
+    finally:
+        print_metrics("riga di comando", client.metrics.snapshot())
+        client.metrics.log_report("riga di comando")
+
+    print(result.summary(), file=sys.stderr)
+    report.update(result.to_dict())
+    write_report(report, args.report)
+
+    if result.error_count or result.schedule_error_count:
+        return EXIT_ERRORS
+    return EXIT_OK
+
+
+def run_batch(args, config, workouts, athletes, report):
+    """
+    Carica e pianifica lo stesso piano su più atleti in parallelo.
+
+    Args:
+        args: Argomenti della riga di comando
+        config: Configurazione dell'applicazione
+        workouts: Allenamenti del piano
+        athletes: Lista di Athlete
+        report: Rapporto da completare
+
+    Returns:
+        int: Codice di uscita
+    """
+    concurrency = args.concurrency or config.get('upload_concurrency', DEFAULT_CONCURRENCY)
+
+    def on_progress(athlete, done, total, name, message):
+        print(f"{athlete.name} [{done}/{total}] {name} {message}".rstrip(), file=sys.stderr)
+
+    batch = BatchSync(workouts, replace=args.replace, schedule=args.schedule,
+                      delete_missing=args.delete_missing, concurrency=concurrency,
+                      max_athletes=args.parallel_athletes, dry_run=args.dry_run,
+                      prune_schedules=args.prune_schedules)
+    result = batch.run(athletes, progress_callback=on_progress)
+
+    for athlete_result in result.results:
+        print_metrics(athlete_result.athlete.name, athlete_result.metrics)
+    print(result.summary(), file=sys.stderr)
+    report.update(result.to_dict())
+    write_report(report, args.report)
+
+    return EXIT_OK if result.failure_count == 0 else EXIT_ERRORS
+
+
+def main(argv=None):
+    """Punto di ingresso della riga di comando"""
+    args = parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    )
+
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Client asincrono per Garmin Connect.
+Espone la stessa interfaccia di GarminClient come coroutine asyncio, così da
+poter lanciare centinaia di richieste in parallelo da un unico event loop.
+Viene usato per scaricare i dettagli degli allenamenti (download dall'interfaccia
+e confronto con Garmin Connect prima del caricamento, anche da riga di comando).
+"""
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+# core.garmin_client (con garth e requests) viene importato solo se il client
+# asincrono deve creare una propria sessione
+
+# Numero predefinito di connessioni keep-alive (e di richieste in volo)
+DEFAULT_POOL_SIZE = 8
+
+
+class AsyncGarminClient:
+    """Client asyncio per l'API di Garmin Connect"""
+
+    def __init__(self, oauth_folder='~/.garth', pool_size=DEFAULT_POOL_SIZE, client=None):
+        """
+        Inizializza il client asincrono.
+
+        Le richieste vengono eseguite sulla sessione HTTP di garth, che riutilizza
+        i token OAuth salvati nella cartella indicata. Il numero di richieste in
+        volo è limitato alla dimensione del pool di connessioni keep-alive, quindi
+        anche centinaia di coroutine usano al massimo pool_size thread.
+
+        Args:
+            oauth_folder: Cartella dove sono memorizzati i token OAuth
+            pool_size: Numero di connessioni keep-alive e di richieste contemporanee
+            client: Istanza di GarminClient già esistente (opzionale, il suo pool
+                    di connessioni non viene modificato)
+        """
+        if client is None:
+            from core.garmin_client import GarminClient
+            client = GarminClient(oauth_folder)
+            client.configure_connection_pool(pool_size)
+        self.client = client
+        self.pool_size = pool_size
+        self._executor = ThreadPoolExecutor(max_workers=pool_size,
+                                            thread_name_prefix="garmin-async")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Chiude il pool di esecuzione delle richieste."""
+        self._executor.shutdown(wait=False)
+
+    async def _call(self, func, *args, **kwargs):
+        """
+        Esegue un metodo del client sincrono senza bloccare l'event loop.
+
+        Args:
+            func: Metodo di GarminClient da eseguire
+
+        Returns:
+            Il valore restituito dal metodo
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def login(self, email, password, save_token=True):
+        """Versione asincrona di GarminClient.login."""
+        return await self._call(self.client.login, email, password, save_token)
+
+    async def list_workouts(self, limit=999):
+        """Versione asincrona di GarminClient.list_workouts."""
+        return await self._call(self.client.list_workouts, limit)
+
+    async def iter_workout_pages(self, page_size=None):
+        """
+        Iteratore asincrono sulle pagine della lista degli allenamenti.
+
+        Args:
+            page_size: Numero di allenamenti per pagina (None per WORKOUTS_PAGE_SIZE)
+
+        Yields:
+            list: Pagina di allenamenti
+        """
+        if page_size is None:
+            from core.garmin_client import WORKOUTS_PAGE_SIZE
+            page_size = WORKOUTS_PAGE_SIZE
+
+        start = 1
+        while True:
+            page = await self._call(self.client.list_workouts_page, start, page_size)
+
+            if page:
+                yield page
+
+            if len(page) < page_size:
+                break
+
+            start += page_size
+
+    async def get_workout(self, workout_id, update_date=None):
+        """Versione asincrona di GarminClient.get_workout (con la cache dei dettagli)."""
+        return await self._call(self.client.get_workout, workout_id, update_date)
+
+    async def add_workout(self, workout):
+        """Versione asincrona di GarminClient.add_workout."""
+        return await self._call(self.client.add_workout, workout)
+
+    async def update_workout(self, workout_id, workout):
+        """Versione asincrona di GarminClient.update_workout."""
+        return await self._call(self.client.update_workout, workout_id, workout)
+
+    async def delete_workout(self, workout_id):
+        """Versione asincrona di GarminClient.delete_workout."""
+        return await self._call(self.client.delete_workout, workout_id)
+
+    async def get_calendar(self, year, month):
+        """Versione asincrona di GarminClient.get_calendar."""
+        return await self._call(self.client.get_calendar, year, month)
+
+    async def schedule_workout(self, workout_id, date):
+        """Versione asincrona di GarminClient.schedule_workout."""
+        return await self._call(self.client.schedule_workout, workout_id, date)
+
+    async def unschedule_workout(self, schedule_id):
+        """Versione asincrona di GarminClient.unschedule_workout."""
+        return await self._call(self.client.unschedule_workout, schedule_id)
+
+    async def get_user_profile(self):
+        """Versione asincrona di GarminClient.get_user_profile."""
+        return await self._call(self.client.get_user_profile)
+
+    def is_logged_in(self):
+        """Verifica se il client è attualmente loggato."""
+        return self.client.is_logged_in()
+
+    async def get_workouts(self, summaries, progress_callback=None):
+        """
+        Scarica in parallelo i dettagli di più allenamenti.
+
+        Args:
+            summaries: Riepiloghi restituiti da list_workouts (workoutId e updateDate,
+                       usati per leggere dalla cache i dettagli non cambiati)
+            progress_callback: Funzione chiamata come (completati, totale, riepilogo, dettagli)
+                               al termine di ogni allenamento (dettagli None se non scaricato)
+
+        Returns:
+            dict: Dizionario ID -> dettagli (None per gli allenamenti non scaricati)
+        """
+        total = len(summaries)
+        done = 0
+
+        async def fetch(summary):
+            nonlocal done
+            try:
+                detail = await self.get_workout(summary["workoutId"], summary.get("updateDate"))
+            except Exception as e:
+                name = summary.get("workoutName", summary["workoutId"])
+                logging.error(f"Errore nel recupero dell'allenamento '{name}': {str(e)}")
+                detail = None
+            done += 1
+            if progress_callback:
+                progress_callback(done, total, summary, detail)
+            return detail
+
+        details = await asyncio.gather(*(fetch(summary) for summary in summaries))
+        return {summary["workoutId"]: detail for summary, detail in zip(summaries, details)}
+
+    async def get_calendars(self, months):
+        """
+        Scarica in parallelo il calendario di più mesi.
+
+        Args:
+            months: Lista di tuple (anno, mese)
+
+        Returns:
+            dict: Dizionario (anno, mese) -> dati del calendario
+        """
+        calendars = await asyncio.gather(*(self.get_calendar(y, m) for y, m in months))
+        return dict(zip(months, calendars))
+
+
+def fetch_workout_details(client, summaries, pool_size=DEFAULT_POOL_SIZE, progress_callback=None):
+    """
+    Scarica i dettagli di più allenamenti con un client asincrono, da codice sincrono.
+    Da chiamare da un thread senza event loop (thread di lavoro o riga di comando).
+
+    Args:
+        client: Istanza di GarminClient autenticata
+        summaries: Riepiloghi restituiti da list_workouts
+        pool_size: Numero di richieste contemporanee
+        progress_callback: Funzione di avanzamento (vedi AsyncGarminClient.get_workouts)
+
+    Returns:
+        dict: Dizionario ID -> dettagli (None per gli allenamenti non scaricati)
+    """
+    if not summaries:
+        return {}
+
+    async def run():
+        async with AsyncGarminClient(client=client, pool_size=max(1, int(pool_size))) as async_client:
+            return await async_client.get_workouts(summaries, progress_callback)
+
+    return asyncio.run(run())
@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Sincronizzazione dello stesso blocco di allenamenti su più atleti.
+Ogni atleta usa il proprio GarminClient (e quindi la propria sessione garth),
+così gli account vengono elaborati in parallelo nello stesso processo.
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from core.sync_planner import SyncPlanner
+from core.uploader import UploadEngine, DEFAULT_CONCURRENCY
+from core.upload_journal import UploadJournal, UPLOAD_JOURNAL_FILE
+
+# Numero predefinito di atleti elaborati in parallelo
+DEFAULT_ATHLETE_CONCURRENCY = 4
+
+
+class Athlete:
+    """Account Garmin Connect di un atleta"""
+
+    def __init__(self, name, oauth_folder, api_url=None):
+        """
+        Inizializza l'atleta.
+
+        Args:
+            name: Nome dell'atleta (usato nei rapporti)
+            oauth_folder: Cartella con i token OAuth dell'account
+            api_url: URL di un server sostitutivo di Garmin Connect (opzionale)
+        """
+        self.name = name
+        self.oauth_folder = oauth_folder
+        self.api_url = api_url
+
+
+class AthleteResult:
+    """Esito della sincronizzazione di un atleta"""
+
+    def __init__(self, athlete):
+        """
+        Inizializza l'esito.
+
+        Args:
+            athlete: Oggetto Athlete
+        """
+        self.athlete = athlete
+        self.plan_summary = None
+        self.report = None
+        self.error = None
+        self.metrics = None
+
+    @property
+    def success(self):
+        """True se tutti gli allenamenti sono stati caricati e pianificati"""
+        if self.error is not None:
+            return False
+        return self.report is None or (self.report.error_count == 0
+                                       and self.report.schedule_error_count == 0)
+
+    def to_dict(self):
+        """
+        Restituisce l'esito in formato serializzabile.
+
+        Returns:
+            dict: Esito della sincronizzazione dell'atleta
+        """
+        result = {
+            "athlete": self.athlete.name,
+            "oauth_folder": self.athlete.oauth_folder,
+            "success": self.success,
+            "plan_summary": self.plan_summary,
+            "error": self.error,
+            "metrics": self.metrics,
+        }
+        if self.report is not None:
+            result.update(self.report.to_dict())
+        return result
+
+
+class BatchReport:
+    """Rapporto aggregato della sincronizzazione di più atleti"""
+
+    def __init__(self, results):
+        """
+        Inizializza il rapporto.
+
+        Args:
+            results: Lista di AthleteResult, nell'ordine degli atleti
+        """
+        self.results = results
+
+    @property
+    def success_count(self):
+        return sum(1 for r in self.results if r.success)
+
+    @property
+    def failure_count(self):
+        return len(self.results) - self.success_count
+
+    def summary(self):
+        """
+        Genera un messaggio riassuntivo per l'utente.
+
+        Returns:
+            str: Messaggio riassuntivo, una riga per atleta
+        """
+        lines = [f"Sincronizzati {self.success_count} atleti su {len(self.results)}."]
+        for result in self.results:
+            if result.error:
+                lines.append(f"- {result.athlete.name}: errore: {result.error}")
+            elif result.report is None:
+                lines.append(f"- {result.athlete.name}: {result.plan_summary}")
+            else:
+                lines.append(f"- {result.athlete.name}: {result.report.summary().splitlines()[0]} "
+                             f"({result.report.error_count} errori)")
+        return "\n".join(lines)
+
+    def to_dict(self):
+        """
+        Restituisce il rapporto in formato serializzabile.
+
+        Returns:
+            dict: Rapporto della sincronizzazione
+        """
+        return {
+            "success_count": self.success_count,
+            "failure_count": self.failure_count,
+            "athletes": [r.to_dict() for r in self.results],
+        }
+
+
+class BatchSync:
+    """Carica e pianifica gli stessi allenamenti su più account in parallelo"""
+
+    def __init__(self, workouts, replace=True, schedule=True, delete_missing=False,
+                 concurrency=DEFAULT_CONCURRENCY, max_athletes=DEFAULT_ATHLETE_CONCURRENCY,
+                 dry_run=False, prune_schedules=False):
+        """
+        Inizializza la sincronizzazione.
+
+        Args:
+            workouts: Lista degli allenamenti da caricare
+            replace: Se True, sostituisce gli allenamenti esistenti con lo stesso nome
+            schedule: Se True, pianifica gli allenamenti nelle date specificate
+            delete_missing: Se True, elimina gli allenamenti remoti non presenti nella lista
+            concurrency: Allenamenti caricati in parallelo per ogni atleta
+            max_athletes: Numero di atleti elaborati in parallelo
+            dry_run: Se True, calcola solo il piano di ogni atleta senza eseguirlo
+            prune_schedules: Se True, rimuove le altre pianificazioni degli allenamenti caricati
+        """
+        self.workouts = workouts
+        self.replace = replace
+        self.schedule = schedule
+        self.delete_missing = delete_missing
+        self.concurrency = concurrency
+        self.max_athletes = max(1, int(max_athletes))
+        self.dry_run = dry_run
+        self.prune_schedules = prune_schedules
+
+    def run(self, athletes, progress_callback=None):
+        """
+        Sincronizza tutti gli atleti.
+
+        Args:
+            athletes: Lista di Athlete
+            progress_callback: Funzione chiamata come (atleta, completati, totale, nome, messaggio)
+                               dai thread di lavoro
+
+        Returns:
+            BatchReport: Rapporto con l'esito di ogni atleta
+        """
+        results = [AthleteResult(athlete) for athlete in athletes]
+
+        with ThreadPoolExecutor(max_workers=self.max_athletes,
+                                thread_name_prefix="garmin-athlete") as executor:
+            futures = [executor.submit(self._sync_athlete, result, progress_callback)
+                       for result in results]
+            for future in as_completed(futures):
+                future.result()
+
+        return BatchReport(results)
+
+    def _sync_athlete(self, result, progress_callback):
+        """
+        Sincronizza un singolo atleta.
+
+        Args:
+            result: AthleteResult da compilare
+            progress_callback: Funzione di avanzamento (o None)
+
+        Returns:
+            AthleteResult: L'esito compilato
+        """
+        athlete = result.athlete
+
+        def on_progress(done, total, name, message):
+            if progress_callback:
+                progress_callback(athlete, done, total, name, message)
+
+        client = None
+        try:
+            # Importato qui: garth e requests non servono per caricare il modulo
+            from core.garmin_client import GarminClient
+
+            client = GarminClient(athlete.oauth_folder, api_url=athlete.api_url)
+            if not client.is_logged_in():
+                raise Exception("Sessione Garmin Connect non disponibile: effettua il login.")
+
+            plan = SyncPlanner(client, self.concurrency).plan(
+                self.workouts,
+                client.list_workouts(),
+                replace=self.replace,
+                delete_missing=self.delete_missing
+            )
+            result.plan_summary = plan.describe()
+            if self.dry_run:
+                return result
+
+            journal = UploadJournal(os.path.join(client.oauth_folder, UPLOAD_JOURNAL_FILE))
+            engine = UploadEngine(client, self.concurrency, journal=journal)
+            result.report = engine.execute(plan, schedule=self.schedule, progress_callback=on_progress,
+                                           prune_schedules=self.prune_schedules)
+        except Exception as e:
+            logging.error(f"Errore nella sincronizzazione dell'atleta '{athlete.name}': {str(e)}")
+            result.error = str(e)
+        finally:
+            if client is not None:
+                result.metrics = client.metrics.snapshot()
+                client.metrics.log_report(f"atleta {athlete.name}")
+
+        return result
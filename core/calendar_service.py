@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Accesso in cache al calendario di Garmin Connect.
+Scarica in parallelo i mesi di un intervallo di date, li conserva in memoria
+per un tempo limitato (TTL) e mantiene un indice data -> elementi pianificati.
+"""
+
+import datetime
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Durata (in secondi) di validità di un mese in cache
+CALENDAR_TTL = 300
+
+# Numero di mesi scaricati in parallelo
+CALENDAR_WORKERS = 4
+
+
+def _to_date(value):
+    """
+    Converte una data (stringa YYYY-MM-DD, date o datetime) in un oggetto date.
+
+    Args:
+        value: Data da convertire
+
+    Returns:
+        datetime.date: La data convertita
+    """
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.datetime.strptime(value[:10], '%Y-%m-%d').date()
+
+
+def months_between(start, end):
+    """
+    Elenca i mesi compresi in un intervallo di date.
+
+    Args:
+        start: Data iniziale
+        end: Data finale (inclusa)
+
+    Returns:
+        list: Lista di tuple (anno, mese)
+    """
+    start, end = _to_date(start), _to_date(end)
+    if end < start:
+        start, end = end, start
+
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append((year, month))
+        month += 1
+        if month > 12:
+            year, month = year + 1, 1
+    return months
+
+
+class CalendarService:
+    """Cache del calendario di Garmin Connect con indice per data"""
+
+    def __init__(self, garmin_client, ttl=CALENDAR_TTL, max_workers=CALENDAR_WORKERS):
+        """
+        Inizializza il servizio.
+
+        Args:
+            garmin_client: Istanza di GarminClient
+            ttl: Secondi di validità di un mese scaricato
+            max_workers: Numero di mesi scaricati in parallelo
+        """
+        self.garmin_client = garmin_client
+        self.ttl = ttl
+        self.max_workers = max(1, int(max_workers))
+
+        # (anno, mese) -> (istante del download, elementi del calendario)
+        self._months = {}
+        # "YYYY-MM-DD" -> elementi pianificati in quella data
+        self._index = {}
+        self._lock = threading.Lock()
+
+    def _is_fresh(self, key):
+        entry = self._months.get(key)
+        return entry is not None and time.monotonic() - entry[0] < self.ttl
+
+    def _fetch(self, year, month):
+        """
+        Scarica un mese e lo memorizza in cache.
+
+        Args:
+            year: Anno
+            month: Mese (1-12)
+
+        Returns:
+            list: Elementi del calendario del mese
+        """
+        response = self.garmin_client.get_calendar(year, month) or {}
+        items = response.get('calendarItems') or []
+
+        prefix = f"{year:04d}-{month:02d}-"
+        with self._lock:
+            # Rimuovi dall'indice gli elementi precedenti del mese
+            self._drop_month(year, month)
+
+            for item in items:
+                date = item.get('date')
+                # Il calendario include anche i giorni di bordo dei mesi vicini
+                if date and date.startswith(prefix):
+                    self._index.setdefault(date, []).append(item)
+
+            self._months[(year, month)] = (time.monotonic(), items)
+
+        return items
+
+    def _drop_month(self, year, month):
+        """
+        Rimuove un mese dalla cache e dall'indice per data (con il lock acquisito).
+
+        Args:
+            year: Anno
+            month: Mese (1-12)
+        """
+        self._months.pop((year, month), None)
+        prefix = f"{year:04d}-{month:02d}-"
+        for date in [d for d in self._index if d.startswith(prefix)]:
+            del self._index[date]
+
+    def prefetch(self, start, end, force=False):
+        """
+        Scarica in parallelo i mesi di un intervallo non ancora in cache.
+
+        Args:
+            start: Data iniziale
+            end: Data finale (inclusa)
+            force: Se True, riscarica anche i mesi ancora validi
+        """
+        missing = [key for key in months_between(start, end) if force or not self._is_fresh(key)]
+        if not missing:
+            return
+
+        logging.info(f"Download di {len(missing)} mesi del calendario")
+
+        if len(missing) == 1:
+            self._fetch(*missing[0])
+            return
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing)),
+                                thread_name_prefix="garmin-calendar") as executor:
+            # list() propaga il primo errore eventuale
+            list(executor.map(lambda key: self._fetch(*key), missing))
+
+    def get_month(self, year, month):
+        """
+        Restituisce gli elementi di un mese, dalla cache se ancora validi.
+
+        Args:
+            year: Anno
+            month: Mese (1-12)
+
+        Returns:
+            list: Elementi del calendario del mese
+        """
+        if not self._is_fresh((year, month)):
+            return self._fetch(year, month)
+        return self._months[(year, month)][1]
+
+    def items_on(self, date, item_type=None):
+        """
+        Restituisce gli elementi pianificati in una data.
+
+        Args:
+            date: Data (stringa YYYY-MM-DD, date o datetime)
+            item_type: Se indicato, filtra per tipo (es. 'workout')
+
+        Returns:
+            list: Elementi pianificati nella data
+        """
+        date = _to_date(date)
+        if not self._is_fresh((date.year, date.month)):
+            self._fetch(date.year, date.month)
+
+        items = self._index.get(date.isoformat(), [])
+        if item_type is not None:
+            items = [item for item in items if item.get('itemType') == item_type]
+        return list(items)
+
+    def scheduled_workouts(self, start, end):
+        """
+        Restituisce gli allenamenti pianificati in un intervallo di date.
+
+        Args:
+            start: Data iniziale
+            end: Data finale (inclusa)
+
+        Returns:
+            dict: Data (YYYY-MM-DD) -> lista degli allenamenti pianificati
+        """
+        start, end = _to_date(start), _to_date(end)
+        self.prefetch(start, end)
+
+        first, last = start.isoformat(), end.isoformat()
+        with self._lock:
+            return {
+                date: [item for item in items if item.get('itemType') == 'workout']
+                for date, items in self._index.items()
+                if first <= date <= last and any(item.get('itemType') == 'workout' for item in items)
+            }
+
+    def invalidate(self, date=None):
+        """
+        Invalida il mese di una data, o l'intera cache.
+
+        Args:
+            date: Data del mese da invalidare (None per tutta la cache)
+        """
+        with self._lock:
+            if date is None:
+                self._months.clear()
+                self._index.clear()
+                return
+
+            date = _to_date(date)
+            self._drop_month(date.year, date.month)
+
+    def invalidate_item(self, item_id):
+        """
+        Invalida il mese che contiene un elemento del calendario.
+
+        Args:
+            item_id: ID dell'elemento (es. ID della pianificazione)
+        """
+        with self._lock:
+            dates = [date for date, items in self._index.items()
+                     if any(item.get('id') == item_id for item in items)]
+            if dates:
+                date = _to_date(dates[0])
+                self._drop_month(date.year, date.month)
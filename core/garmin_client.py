@@ -11,18 +11,81 @@ import json
 import logging
 import os
 import datetime
+import threading
+import time
 from getpass import getpass
 import garth
+import requests
+
+from core.workout_cache import WorkoutCache
+from core.rate_limiter import RateLimiter
+from core.calendar_service import CalendarService
+from core.metrics import MetricsRegistry, RequestTimer
+
+# Numero di allenamenti richiesti per ogni pagina di list_workouts
+WORKOUTS_PAGE_SIZE = 100
+
+# Variabile d'ambiente con l'URL di un server sostitutivo di Garmin Connect
+# (es. benchmarks/fake_garmin_server.py), usato per test e misure offline
+API_URL_ENV = 'GARMIN_TRAINER_API_URL'
+
+# File della sessione salvata nella cartella OAuth (token garth e token legacy)
+SESSION_TOKEN_FILES = ('oauth1_token.json', 'oauth2_token.json', 'token.json')
+
+# Secondi di anticipo con cui rinnovare il token OAuth2 prima della scadenza
+TOKEN_REFRESH_MARGIN = 600
+
+# Attesa minima e massima (secondi) tra due controlli del rinnovo automatico
+TOKEN_CHECK_MIN_INTERVAL = 30
+TOKEN_CHECK_MAX_INTERVAL = 3600
+
+# Sessioni garth per account, indicizzate per cartella dei token OAuth
+_garth_sessions = {}
+_garth_sessions_lock = threading.Lock()
+
+
+def garth_session(oauth_folder):
+    """
+    Restituisce la sessione garth dell'account salvato in una cartella OAuth.
+    
+    Ogni account ha una propria istanza di garth.Client (token e sessione HTTP),
+    così più account possono essere usati contemporaneamente nello stesso
+    processo; i client dello stesso account condividono la stessa sessione.
+    
+    Args:
+        oauth_folder: Cartella dei token OAuth (percorso normalizzato)
+        
+    Returns:
+        garth.Client: Sessione dell'account
+    """
+    with _garth_sessions_lock:
+        session = _garth_sessions.get(oauth_folder)
+        if session is None:
+            session = _garth_sessions[oauth_folder] = garth.Client()
+        return session
+
+
+def release_garth_session(oauth_folder):
+    """
+    Dimentica la sessione garth di un account (es. dopo il logout).
+    
+    Args:
+        oauth_folder: Cartella dei token OAuth (percorso normalizzato)
+    """
+    with _garth_sessions_lock:
+        _garth_sessions.pop(oauth_folder, None)
 
 class GarminClient:
     """Client per interagire con l'API di Garmin Connect"""
 
-    def __init__(self, oauth_folder='~/.garth'):
+    def __init__(self, oauth_folder='~/.garth', api_url=None):
         """
         Inizializza il client Garmin Connect.
         
         Args:
             oauth_folder: Cartella dove sono memorizzati i token OAuth
+            api_url: URL di un server sostitutivo di Garmin Connect (opzionale,
+                     in alternativa alla variabile d'ambiente GARMIN_TRAINER_API_URL)
         """
         # Disabilita la verifica SSL a livello globale
         import ssl
@@ -41,21 +104,108 @@ class GarminClient:
         # Crea la directory se non esiste
         os.makedirs(self.oauth_folder, exist_ok=True)
         
+        # URL del server sostitutivo di Garmin Connect, se configurato
+        self.api_url = api_url or os.environ.get(API_URL_ENV)
+        
+        # Limitatore condiviso da tutte le richieste del client
+        self.rate_limiter = RateLimiter()
+        
+        # Metriche di latenza e throughput per endpoint
+        self.metrics = MetricsRegistry()
+        
+        # Cache locale dei dettagli degli allenamenti (separata per il server sostitutivo)
+        cache_name = 'workout_cache_standin' if self.api_url else 'workout_cache'
+        self.workout_cache = WorkoutCache(os.path.join(self.oauth_folder, cache_name))
+        
+        # Cache in memoria del calendario
+        self.calendar = CalendarService(self)
+        
+        # Sessione garth dedicata all'account di questa cartella OAuth
+        self.garth = garth_session(self.oauth_folder)
+        
+        # Rinnovo automatico del token in background (vedi start_token_refresher)
+        self._refresher_stop = threading.Event()
+        self._refresher = None
+        
         # Configura garth per disabilitare la verifica SSL
         try:
-            import garth
-            garth.configure(verify_ssl=False)
+            self.garth.configure(verify_ssl=False)
         except:
             pass
         
+        # Server sostitutivo: nessuna autenticazione necessaria
+        if self.api_url:
+            logging.info(f"Utilizzo del server sostitutivo di Garmin Connect: {self.api_url}")
+            self.session = requests.Session()
+            self.logged_in = True
+            return
+        
         # Prova a riprendere la sessione esistente
         try:
-            garth.resume(self.oauth_folder)
+            self.garth.load(self.oauth_folder)
             self.logged_in = True
         except Exception as e:
             logging.warning(f"Impossibile riprendere la sessione: {str(e)}")
             self.logged_in = False
 
+    def _connectapi(self, path, **kwargs):
+        """
+        Esegue una richiesta all'API di Garmin Connect attraverso il limitatore,
+        che ritenta automaticamente le risposte di throttling ed errori temporanei,
+        registrandone durata, dimensione, esito e ritentativi in self.metrics.
+        
+        Args:
+            path: Percorso dell'endpoint
+            **kwargs: Parametri della richiesta (method, params, json, ...)
+            
+        Returns:
+            dict: Risposta dell'API, o None se vuota
+        """
+        func = self._standin_request if self.api_url else self._garth_request
+        method = kwargs.get('method', 'GET')
+        
+        with RequestTimer(self.metrics, method, path, kwargs.get('json')) as timer:
+            response = self.rate_limiter.call(
+                timer.wrap(func), (path,), kwargs,
+                idempotent=method != 'POST')
+            timer.finish(response)
+        
+        # Stessa semantica di garth.Client.connectapi: None per le risposte vuote
+        if response.status_code == 204 or not response.content:
+            return None
+        return response.json()
+
+    def _garth_request(self, path, method='GET', **kwargs):
+        """
+        Esegue una richiesta all'API di Garmin Connect con la sessione di garth.
+        
+        Args:
+            path: Percorso dell'endpoint
+            method: Metodo HTTP
+            **kwargs: Parametri della richiesta (params, json, ...)
+            
+        Returns:
+            requests.Response: Risposta HTTP (garth solleva un errore per gli esiti non validi)
+        """
+        return self.garth.request(method, "connectapi", path, api=True, **kwargs)
+
+    def _standin_request(self, path, method='GET', **kwargs):
+        """
+        Esegue una richiesta verso il server sostitutivo, con la stessa
+        semantica di garth.Client.request.
+        
+        Args:
+            path: Percorso dell'endpoint
+            method: Metodo HTTP
+            **kwargs: Parametri della richiesta (params, json, ...)
+            
+        Returns:
+            requests.Response: Risposta HTTP
+        """
+        response = self.session.request(method, self.api_url.rstrip('/') + path, **kwargs)
+        response.raise_for_status()
+        return response
+
     def login(self, email, password, save_token=True):
         """
         Effettua il login su Garmin Connect.
@@ -68,6 +218,10 @@ class GarminClient:
         Returns:
             bool: True se il login è riuscito, False altrimenti
         """
+        if self.api_url:
+            self.logged_in = True
+            return True
+        
         try:
             # Disabilita gli avvisi SSL
             import urllib3
@@ -79,14 +233,14 @@ class GarminClient:
             ssl._create_default_https_context = ssl._create_unverified_context
             
             # Effettua il login
-            garth.login(email, password)
+            self.garth.login(email, password)
             self.logged_in = True
             
             # Ripristina il contesto SSL originale
             ssl._create_default_https_context = original_context
             
             if save_token:
-                garth.save(self.oauth_folder)
+                self.garth.dump(self.oauth_folder)
                 
             return True
         except Exception as e:
@@ -94,6 +248,23 @@ class GarminClient:
             self.logged_in = False
             return False
 
+    def configure_connection_pool(self, pool_size):
+        """
+        Dimensiona il pool di connessioni keep-alive della sessione HTTP.
+        
+        Args:
+            pool_size: Numero di connessioni riutilizzabili verso Garmin Connect
+        """
+        try:
+            if self.api_url:
+                adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+                self.session.mount('http://', adapter)
+                self.session.mount('https://', adapter)
+                return
+            self.garth.configure(pool_connections=pool_size, pool_maxsize=pool_size)
+        except Exception as e:
+            logging.warning(f"Impossibile configurare il pool di connessioni: {str(e)}")
+
     def list_workouts(self, limit=999):
         """
         Ottiene la lista degli allenamenti da Garmin Connect.
@@ -107,12 +278,61 @@ class GarminClient:
         if not self.logged_in:
             raise Exception("Non sei autenticato. Effettua prima il login.")
             
-        response = garth.connectapi(
+        response = self._connectapi(
             '/workout-service/workouts',
             params={'start': 1, 'limit': limit, 'myWorkoutsOnly': True})
         
         return response
 
+    def list_workouts_page(self, start, limit=WORKOUTS_PAGE_SIZE):
+        """
+        Ottiene una singola pagina della lista degli allenamenti.
+        
+        Args:
+            start: Posizione del primo allenamento (a partire da 1)
+            limit: Numero massimo di allenamenti della pagina
+            
+        Returns:
+            list: Pagina di allenamenti
+        """
+        if not self.logged_in:
+            raise Exception("Non sei autenticato. Effettua prima il login.")
+            
+        response = self._connectapi(
+            '/workout-service/workouts',
+            params={'start': start, 'limit': limit, 'myWorkoutsOnly': True})
+        
+        return response or []
+
+    def iter_workout_pages(self, page_size=WORKOUTS_PAGE_SIZE):
+        """
+        Scorre la lista degli allenamenti di Garmin Connect una pagina alla volta.
+        
+        Ogni pagina viene richiesta solo quando il chiamante ha elaborato la
+        precedente, così le prime righe sono disponibili subito e la memoria
+        resta costante anche con librerie molto grandi.
+        
+        Args:
+            page_size: Numero di allenamenti per pagina
+            
+        Yields:
+            list: Pagina di allenamenti (riepiloghi come in list_workouts)
+        """
+        if not self.logged_in:
+            raise Exception("Non sei autenticato. Effettua prima il login.")
+        
+        start = 1
+        while True:
+            page = self.list_workouts_page(start, page_size)
+            
+            if page:
+                yield page
+            
+            if len(page) < page_size:
+                break
+            
+            start += page_size
+
     def add_workout(self, workout):
         """
         Aggiunge un nuovo allenamento a Garmin Connect.
@@ -126,7 +346,7 @@ class GarminClient:
         if not self.logged_in:
             raise Exception("Non sei autenticato. Effettua prima il login.")
             
-        response = garth.connectapi(
+        response = self._connectapi(
             '/workout-service/workout', method="POST",
             json=workout.garminconnect_json())
             
@@ -146,27 +366,40 @@ class GarminClient:
             raise Exception("Non sei autenticato. Effettua prima il login.")
             
         logging.info(f'Eliminazione allenamento {workout_id}')
-        response = garth.connectapi(
+        response = self._connectapi(
             '/workout-service/workout/' + str(workout_id), method="DELETE")
+        self.workout_cache.invalidate(workout_id)
             
         return response 
 
-    def get_workout(self, workout_id):
+    def get_workout(self, workout_id, update_date=None):
         """
         Ottiene i dettagli di un allenamento specifico.
         
+        Se viene indicata la data di ultima modifica (updateDate restituito da
+        list_workouts), i dettagli vengono letti dalla cache locale quando
+        l'allenamento non è cambiato su Garmin Connect.
+        
         Args:
             workout_id: ID dell'allenamento
+            update_date: Data di ultima modifica dell'allenamento (opzionale)
             
         Returns:
             dict: Dettagli dell'allenamento
         """
         if not self.logged_in:
             raise Exception("Non sei autenticato. Effettua prima il login.")
+        
+        cached = self.workout_cache.get(workout_id, update_date)
+        if cached is not None:
+            return cached
             
         logging.info(f'Recupero allenamento {workout_id}')
-        response = garth.connectapi(
+        response = self._connectapi(
             '/workout-service/workout/' + str(workout_id), method="GET")
+        
+        if response:
+            self.workout_cache.put(workout_id, update_date or response.get('updateDate'), response)
             
         return response 
 
@@ -188,8 +421,9 @@ class GarminClient:
         wo_json = workout.garminconnect_json()
         wo_json['workoutId'] = workout_id
         
-        response = garth.connectapi(
+        response = self._connectapi(
             '/workout-service/workout/' + str(workout_id), method="PUT", json=wo_json)
+        self.workout_cache.invalidate(workout_id)
             
         return response 
 
@@ -208,7 +442,7 @@ class GarminClient:
             raise Exception("Non sei autenticato. Effettua prima il login.")
             
         logging.info(f'Recupero calendario. Anno: {year}, mese: {month}')
-        response = garth.connectapi(
+        response = self._connectapi(
             f'/calendar-service/year/{year}/month/{month-1}')
             
         return response 
@@ -231,9 +465,10 @@ class GarminClient:
         if not isinstance(date_formatted, str):
             date_formatted = date.strftime('%Y-%m-%d')
             
-        response = garth.connectapi(
+        response = self._connectapi(
             f'/workout-service/schedule/{workout_id}', method="POST",
             json={'date': date_formatted})
+        self.calendar.invalidate(date_formatted)
             
         return response 
 
@@ -250,8 +485,9 @@ class GarminClient:
         if not self.logged_in:
             raise Exception("Non sei autenticato. Effettua prima il login.")
             
-        response = garth.connectapi(
+        response = self._connectapi(
             f'/workout-service/schedule/{schedule_id}', method="DELETE")
+        self.calendar.invalidate_item(schedule_id)
             
         return response 
 
@@ -265,9 +501,79 @@ class GarminClient:
         if not self.logged_in:
             raise Exception("Non sei autenticato. Effettua prima il login.")
             
-        response = garth.connectapi('/userprofile-service/userprofile')
+        response = self._connectapi('/userprofile-service/userprofile')
         return response
 
+    def token_expires_in(self):
+        """
+        Calcola il tempo rimanente prima della scadenza del token OAuth2.
+        
+        Returns:
+            float: Secondi alla scadenza, o None se non c'è un token
+        """
+        token = getattr(self.garth, 'oauth2_token', None)
+        expires_at = getattr(token, 'expires_at', None)
+        if expires_at is None:
+            return None
+        return expires_at - time.time()
+
+    def refresh_token_if_needed(self, margin=TOKEN_REFRESH_MARGIN):
+        """
+        Rinnova il token OAuth2 se scade entro margin secondi e lo salva su disco,
+        così le richieste successive non devono attendere il rinnovo.
+        
+        Args:
+            margin: Anticipo in secondi rispetto alla scadenza
+            
+        Returns:
+            bool: True se il token è valido (eventualmente dopo il rinnovo)
+        """
+        if self.api_url:
+            return True
+        if not self.logged_in:
+            return False
+        
+        expires_in = self.token_expires_in()
+        if expires_in is not None and expires_in > margin:
+            return True
+        
+        try:
+            logging.info("Rinnovo del token di Garmin Connect")
+            self.garth.refresh_oauth2()
+            self.garth.dump(self.oauth_folder)
+            return True
+        except Exception as e:
+            logging.warning(f"Impossibile rinnovare il token: {str(e)}")
+            return expires_in is not None and expires_in > 0
+
+    def start_token_refresher(self):
+        """Avvia il rinnovo automatico del token prima di ogni scadenza."""
+        if self.api_url or (self._refresher is not None and self._refresher.is_alive()):
+            return
+        
+        self._refresher_stop.clear()
+        self._refresher = threading.Thread(
+            target=self._token_refresher_loop, name="garmin-token-refresh", daemon=True)
+        self._refresher.start()
+
+    def stop_token_refresher(self):
+        """Ferma il rinnovo automatico del token."""
+        self._refresher_stop.set()
+
+    def _token_refresher_loop(self):
+        """Attende la scadenza del token e lo rinnova in anticipo."""
+        while not self._refresher_stop.is_set():
+            expires_in = self.token_expires_in()
+            if expires_in is None:
+                wait = TOKEN_CHECK_MAX_INTERVAL
+            else:
+                wait = expires_in - TOKEN_REFRESH_MARGIN
+            wait = max(TOKEN_CHECK_MIN_INTERVAL, min(wait, TOKEN_CHECK_MAX_INTERVAL))
+            
+            if self._refresher_stop.wait(wait):
+                break
+            self.refresh_token_if_needed()
+
     def is_logged_in(self):
         """
         Verifica se il client è attualmente loggato.
@@ -285,13 +591,23 @@ class GarminClient:
             bool: True se il logout è riuscito, False altrimenti
         """
         try:
-            garth.client.clear()
+            self.stop_token_refresher()
+            if not self.api_url:
+                # Dimentica i token in memoria e la sessione dell'account
+                self.garth.oauth1_token = None
+                self.garth.oauth2_token = None
+                release_garth_session(self.oauth_folder)
             self.logged_in = False
             
-            # Rimuovi il file del token, se esiste
-            token_file = os.path.join(self.oauth_folder, 'token.json')
-            if os.path.exists(token_file):
-                os.remove(token_file)
+            # Rimuovi i file della sessione salvata, così che non venga ripristinata
+            for name in SESSION_TOKEN_FILES:
+                token_file = os.path.join(self.oauth_folder, name)
+                if os.path.exists(token_file):
+                    os.remove(token_file)
+            
+            # Svuota la cache degli allenamenti dell'account
+            self.workout_cache.clear()
+            self.calendar.invalidate()
                 
             return True
         except Exception as e:
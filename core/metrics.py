@@ -0,0 +1,320 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Metriche delle richieste verso Garmin Connect.
+Raccoglie per ogni endpoint durata, dimensione dei dati, esito e numero di
+ritentativi, e ne calcola percentili di latenza e chiamate al secondo.
+"""
+
+import collections
+import json
+import logging
+import re
+import threading
+import time
+
+from core.rate_limiter import _error_response
+
+# Numero massimo di durate conservate per endpoint (le più recenti)
+MAX_SAMPLES = 10000
+
+# Percentili riportati nel riepilogo
+PERCENTILES = (50, 95, 99)
+
+# Esiti registrati quando il codice HTTP non è disponibile
+STATUS_ERROR = "error"
+STATUS_UNKNOWN = "unknown"
+
+
+def endpoint_name(method, path):
+    """
+    Ricava il nome dell'endpoint, sostituendo gli ID numerici con un segnaposto.
+
+    Args:
+        method: Metodo HTTP
+        path: Percorso della richiesta
+
+    Returns:
+        str: Nome dell'endpoint (es. "GET /workout-service/workout/{id}")
+    """
+    return f"{method.upper()} {re.sub(r'/[0-9]+(?=/|$)', '/{id}', path)}"
+
+
+def percentile(sorted_values, pct):
+    """
+    Calcola un percentile con il metodo nearest-rank.
+
+    Args:
+        sorted_values: Valori ordinati in modo crescente
+        pct: Percentile (0-100)
+
+    Returns:
+        float: Valore del percentile, o None se non ci sono valori
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[min(len(sorted_values), int(rank)) - 1]
+
+
+class EndpointStats:
+    """Statistiche accumulate per un singolo endpoint"""
+
+    def __init__(self):
+        """Inizializza le statistiche."""
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.statuses = collections.Counter()
+        self.durations = collections.deque(maxlen=MAX_SAMPLES)
+        self.first_start = None
+        self.last_end = None
+
+    def to_dict(self):
+        """
+        Restituisce le statistiche in formato serializzabile.
+
+        Returns:
+            dict: Statistiche dell'endpoint
+        """
+        durations = sorted(self.durations)
+        elapsed = (self.last_end - self.first_start) if self.count else 0
+        stats = {
+            "count": self.count,
+            "errors": self.errors,
+            "retries": self.retries,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "statuses": {str(k): v for k, v in self.statuses.items()},
+            "calls_per_second": round(self.count / elapsed, 2) if elapsed > 0 else None,
+        }
+        for pct in PERCENTILES:
+            value = percentile(durations, pct)
+            stats[f"p{pct}_ms"] = round(value * 1000, 1) if value is not None else None
+        return stats
+
+
+class MetricsRegistry:
+    """Registro thread-safe delle metriche delle richieste"""
+
+    def __init__(self):
+        """Inizializza il registro."""
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, method, path, started, duration, status=None, retries=0,
+               bytes_sent=0, bytes_received=0, failed=None):
+        """
+        Registra una richiesta completata.
+
+        Args:
+            method: Metodo HTTP
+            path: Percorso della richiesta
+            started: Istante di inizio (time.monotonic)
+            duration: Durata complessiva in secondi, ritentativi inclusi
+            status: Codice HTTP finale (None se sconosciuto)
+            retries: Numero di ritentativi eseguiti
+            bytes_sent: Dimensione dei dati inviati
+            bytes_received: Dimensione dei dati ricevuti
+            failed: True se la richiesta non è riuscita (None per dedurlo dal codice HTTP)
+        """
+        if failed is None:
+            failed = status is None or status >= 400
+
+        name = endpoint_name(method, path)
+        with self._lock:
+            stats = self._endpoints.get(name)
+            if stats is None:
+                stats = self._endpoints[name] = EndpointStats()
+
+            stats.count += 1
+            stats.retries += retries
+            stats.bytes_sent += bytes_sent
+            stats.bytes_received += bytes_received
+            if status is None:
+                status = STATUS_ERROR if failed else STATUS_UNKNOWN
+            stats.statuses[status] += 1
+            if failed:
+                stats.errors += 1
+            stats.durations.append(duration)
+
+            end = started + duration
+            if stats.first_start is None or started < stats.first_start:
+                stats.first_start = started
+            if stats.last_end is None or end > stats.last_end:
+                stats.last_end = end
+
+    def snapshot(self):
+        """
+        Restituisce le statistiche correnti di tutti gli endpoint.
+
+        Returns:
+            dict: Nome dell'endpoint -> statistiche
+        """
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in sorted(self._endpoints.items())}
+
+    def reset(self):
+        """Azzera tutte le metriche."""
+        with self._lock:
+            self._endpoints.clear()
+
+    def to_json(self):
+        """
+        Esporta le metriche in formato JSON.
+
+        Returns:
+            str: Metriche serializzate
+        """
+        return json.dumps(self.snapshot(), indent=2, ensure_ascii=False)
+
+    def export_json(self, path):
+        """
+        Salva le metriche in un file JSON.
+
+        Args:
+            path: Percorso del file
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_json())
+
+    def format_report(self):
+        """
+        Genera una tabella leggibile delle metriche.
+
+        Returns:
+            str: Una riga per endpoint
+        """
+        return format_metrics(self.snapshot())
+
+    def log_report(self, title, reset=True):
+        """
+        Scrive le metriche nel log (garmin_trainer.log) al termine di un'operazione.
+
+        Args:
+            title: Nome dell'operazione
+            reset: Se True, azzera le metriche dopo averle scritte
+        """
+        report = self.format_report()
+        if report:
+            logging.info(f"Metriche delle richieste a Garmin Connect ({title}):\n{report}")
+        if reset:
+            self.reset()
+
+
+def format_metrics(snapshot):
+    """
+    Genera una tabella leggibile da un'istantanea delle metriche.
+
+    Args:
+        snapshot: Dizionario restituito da MetricsRegistry.snapshot
+
+    Returns:
+        str: Una riga per endpoint
+    """
+    lines = []
+    for name, stats in snapshot.items():
+        rate = stats["calls_per_second"]
+        lines.append(
+            f"{name}: {stats['count']} chiamate, {stats['errors']} errori, "
+            f"{stats['retries']} ritentativi, "
+            f"p50 {stats['p50_ms']} ms, p95 {stats['p95_ms']} ms, p99 {stats['p99_ms']} ms, "
+            f"{rate if rate is not None else '-'} chiamate/s, "
+            f"{stats['bytes_sent']} B inviati, {stats['bytes_received']} B ricevuti"
+        )
+    return "\n".join(lines)
+
+
+class RequestTimer:
+    """Misura una singola richiesta e la registra nel registro delle metriche"""
+
+    def __init__(self, registry, method, path, payload=None):
+        """
+        Inizializza la misura.
+
+        Args:
+            registry: MetricsRegistry in cui registrare la richiesta
+            method: Metodo HTTP
+            path: Percorso della richiesta
+            payload: Dati JSON inviati (opzionale)
+        """
+        self.registry = registry
+        self.method = method
+        self.path = path
+        self.bytes_sent = _json_size(payload)
+        self.attempts = 0
+        self.started = None
+
+    def wrap(self, func):
+        """
+        Avvolge la funzione della richiesta per contare i tentativi.
+
+        Args:
+            func: Funzione che esegue la richiesta
+
+        Returns:
+            function: Funzione equivalente che conta le invocazioni
+        """
+        def counted(*args, **kwargs):
+            self.attempts += 1
+            return func(*args, **kwargs)
+        return counted
+
+    def __enter__(self):
+        self.started = time.monotonic()
+        return self
+
+    def finish(self, response=None, failed=False):
+        """
+        Registra la richiesta completata.
+
+        Codice HTTP e dimensione vengono letti dalla risposta HTTP; se non
+        disponibili la richiesta è registrata con esito sconosciuto.
+
+        Args:
+            response: Risposta HTTP (requests.Response o equivalente)
+            failed: True se la richiesta non è riuscita
+        """
+        self.registry.record(
+            self.method, self.path, self.started, time.monotonic() - self.started,
+            status=getattr(response, "status_code", None), retries=max(0, self.attempts - 1),
+            bytes_sent=self.bytes_sent, bytes_received=_response_size(response),
+            failed=failed,
+        )
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is not None:
+            self.finish(_error_response(exc), failed=True)
+        return False
+
+
+def _response_size(response):
+    """
+    Dimensione in byte del corpo di una risposta HTTP (0 se sconosciuta).
+
+    Usa l'header Content-Length, oppure la lunghezza del contenuto già letto,
+    senza serializzare di nuovo il JSON.
+    """
+    if response is None:
+        return 0
+    length = getattr(response, "headers", {}).get("Content-Length")
+    if length is not None:
+        try:
+            return int(length)
+        except ValueError:
+            pass
+    content = getattr(response, "content", None)
+    return len(content) if isinstance(content, (bytes, str)) else 0
+
+
+def _json_size(data):
+    """Dimensione in byte della serializzazione JSON di data (0 se assente)."""
+    if data is None:
+        return 0
+    try:
+        return len(json.dumps(data, separators=(",", ":")).encode("utf-8"))
+    except (TypeError, ValueError):
+        return 0
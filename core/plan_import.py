@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Conversione dei piani di allenamento (YAML o Excel) in oggetti Workout.
+Usata sia dall'interfaccia grafica sia dalla riga di comando.
+"""
+
+import os
+
+from core.workout import Workout, WorkoutStep
+from core.step_parser import parse_step
+from core.zones import compile_zones, ZONE_TARGET_TYPES
+
+# Estensioni dei file di piano supportate
+YAML_EXTENSIONS = ('.yaml', '.yml')
+EXCEL_EXTENSIONS = ('.xlsx', '.xls')
+
+
+def convert_step(step_type, step_detail, zones=None, sport_type=None):
+    """
+    Converte la descrizione testuale di un passo in un oggetto WorkoutStep.
+
+    Args:
+        step_type: Tipo di passo (es. 'interval', 'warmup')
+        step_detail: Descrizione del passo (es. '1km @ Z4 -- Ripetuta')
+        zones: ZoneTables per risolvere i target (None per i valori di riserva)
+        sport_type: Tipo di sport dell'allenamento
+
+    Returns:
+        WorkoutStep: Il passo convertito
+    """
+    spec = parse_step(step_detail)
+
+    # Risolvi il target con le zone della configurazione
+    target = None
+    if spec.target_type in ZONE_TARGET_TYPES:
+        if zones is None:
+            zones = compile_zones({})
+        target = zones.target(spec.target_type, spec.zone, sport_type)
+
+    return WorkoutStep(
+        0,  # Sarà assegnato automaticamente
+        step_type,
+        spec.description,
+        spec.end_condition,
+        spec.end_value,
+        target
+    )
+
+
+def convert_steps_to_workout(workout, steps, zones=None):
+    """
+    Converte gli step dal formato YAML/Excel in oggetti WorkoutStep.
+
+    Args:
+        workout: Oggetto Workout a cui aggiungere gli step
+        steps: Lista di step in formato YAML/Excel
+        zones: ZoneTables per risolvere i target (opzionale)
+    """
+    for step in steps:
+        if not isinstance(step, dict):
+            continue
+
+        if 'sport_type' in step or 'date' in step:
+            # Salta i metadati
+            continue
+
+        if 'repeat' in step and 'steps' in step:
+            # Passo di ripetizione
+            repeat_step = WorkoutStep(
+                0,  # Sarà assegnato automaticamente
+                "repeat",
+                "",
+                "iterations",
+                step['repeat']
+            )
+
+            # Converti e aggiungi i sottopassi
+            for substep in step['steps']:
+                if isinstance(substep, dict) and len(substep) == 1:
+                    substep_type = list(substep.keys())[0]
+                    repeat_step.add_step(convert_step(substep_type, substep[substep_type],
+                                                      zones, workout.sport_type))
+
+            # Aggiungi il passo di ripetizione all'allenamento
+            workout.add_step(repeat_step)
+
+        elif len(step) == 1:
+            # Passo normale
+            step_type = list(step.keys())[0]
+            workout.add_step(convert_step(step_type, step[step_type], zones, workout.sport_type))
+
+
+def workouts_from_plan(data, workout_config=None):
+    """
+    Converte i dati di un piano (come restituiti da load_yaml o load_excel).
+
+    Args:
+        data: Dizionario nome -> lista di step, con l'eventuale chiave 'config'
+        workout_config: Configurazione delle zone dell'applicazione; le sezioni
+                        presenti nella configurazione del piano hanno la precedenza
+
+    Returns:
+        tuple: (lista di Workout, configurazione del piano)
+    """
+    data = dict(data or {})
+    config = data.pop('config', {}) or {}
+    workouts = []
+
+    # Compila le zone una sola volta per tutto il piano
+    effective_config = dict(workout_config or {})
+    effective_config.update(config)
+    zones = compile_zones(effective_config)
+
+    for name, steps in data.items():
+        # Estrai il tipo di sport e la data dagli step
+        sport_type = "running"  # Default
+        date = None
+
+        for step in steps:
+            if isinstance(step, dict):
+                if 'sport_type' in step:
+                    sport_type = step['sport_type']
+                elif 'date' in step:
+                    date = step['date']
+
+        # Crea l'allenamento
+        workout = Workout(sport_type, name)
+
+        # Imposta la data
+        if date:
+            workout.set_scheduled_date(date)
+
+        # Converti i passi
+        convert_steps_to_workout(workout, steps, zones)
+
+        workouts.append(workout)
+
+    return workouts, config
+
+
+def load_plan(filename, workout_config=None):
+    """
+    Carica un piano di allenamento da un file YAML o Excel.
+
+    Args:
+        filename: Percorso del file
+        workout_config: Configurazione delle zone dell'applicazione (opzionale)
+
+    Returns:
+        tuple: (lista di Workout, configurazione del piano)
+
+    Raises:
+        ValueError: Se il formato del file non è supportato
+    """
+    extension = os.path.splitext(filename)[1].lower()
+
+    if extension in YAML_EXTENSIONS:
+        from core.utils import load_yaml
+        data = load_yaml(filename)
+    elif extension in EXCEL_EXTENSIONS:
+        from core.utils import load_excel
+        data = load_excel(filename)
+    else:
+        raise ValueError(f"Formato del file non supportato: {extension}")
+
+    return workouts_from_plan(data, workout_config)
@@ -0,0 +1,251 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Limitazione del traffico verso Garmin Connect.
+Combina un token bucket (richieste al secondo), una concorrenza adattiva di
+tipo AIMD (aumento additivo, riduzione moltiplicativa) e ritentativi con
+backoff esponenziale con jitter, rispettando l'header Retry-After.
+"""
+
+import email.utils
+import logging
+import random
+import threading
+import time
+
+# Richieste al secondo e dimensione del burst del token bucket
+DEFAULT_RATE = 5.0
+DEFAULT_BURST = 10
+
+# Limiti della concorrenza adattiva
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_MIN_CONCURRENCY = 1
+
+# Parametri dei ritentativi
+DEFAULT_MAX_RETRIES = 5
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+
+# Codici HTTP per cui ha senso ritentare
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+# Eccezioni di rete per cui ha senso ritentare (riconosciute per nome, per
+# non dipendere direttamente da requests/urllib3)
+RETRYABLE_ERRORS = {"ConnectionError", "Timeout", "ConnectTimeout", "ReadTimeout"}
+
+
+class TokenBucket:
+    """Token bucket thread-safe"""
+
+    def __init__(self, rate=DEFAULT_RATE, capacity=DEFAULT_BURST):
+        """
+        Inizializza il token bucket.
+
+        Args:
+            rate: Token generati al secondo
+            capacity: Numero massimo di token accumulabili (burst)
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Attende finché non è disponibile un token e lo consuma."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+
+class AdaptiveConcurrency:
+    """Limite di richieste contemporanee regolato con AIMD"""
+
+    def __init__(self, initial=4, minimum=DEFAULT_MIN_CONCURRENCY, maximum=DEFAULT_MAX_CONCURRENCY):
+        """
+        Inizializza il limite di concorrenza.
+
+        Args:
+            initial: Limite iniziale
+            minimum: Limite minimo
+            maximum: Limite massimo
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self._limit = float(max(minimum, min(initial, maximum)))
+        self._active = 0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self):
+        """Limite corrente (intero) di richieste contemporanee"""
+        return max(self.minimum, int(self._limit))
+
+    def __enter__(self):
+        with self._condition:
+            while self._active >= self.limit:
+                self._condition.wait()
+            self._active += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        with self._condition:
+            self._active -= 1
+            self._condition.notify_all()
+
+    def on_success(self):
+        """Aumento additivo: circa +1 dopo una finestra di richieste riuscite."""
+        with self._condition:
+            self._limit = min(self.maximum, self._limit + 1.0 / self._limit)
+            self._condition.notify_all()
+
+    def on_throttle(self):
+        """Riduzione moltiplicativa dopo una risposta di throttling."""
+        with self._condition:
+            self._limit = max(self.minimum, self._limit / 2)
+        logging.info(f"Garmin Connect limita le richieste: concorrenza ridotta a {self.limit}")
+
+
+def _error_response(error):
+    """
+    Trova la risposta HTTP associata a un'eccezione (requests o garth).
+
+    Args:
+        error: Eccezione sollevata dalla richiesta
+
+    Returns:
+        La risposta HTTP o None
+    """
+    for candidate in (error, getattr(error, "error", None), error.__cause__):
+        response = getattr(candidate, "response", None)
+        if response is not None:
+            return response
+    return None
+
+
+def _is_network_error(error):
+    """Verifica se l'eccezione è un errore di rete temporaneo."""
+    for candidate in (error, getattr(error, "error", None), error.__cause__):
+        if candidate is None:
+            continue
+        if any(cls.__name__ in RETRYABLE_ERRORS for cls in type(candidate).__mro__):
+            return True
+    return False
+
+
+def parse_retry_after(value):
+    """
+    Interpreta l'header Retry-After (secondi o data HTTP).
+
+    Args:
+        value: Valore dell'header
+
+    Returns:
+        float: Secondi di attesa, o None se non interpretabile
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Limita, ritenta e adatta le richieste verso Garmin Connect"""
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY, max_retries=DEFAULT_MAX_RETRIES):
+        """
+        Inizializza il limitatore.
+
+        Args:
+            rate: Richieste al secondo consentite in media
+            burst: Richieste consentite in un burst
+            max_concurrency: Limite massimo di richieste contemporanee
+            max_retries: Numero massimo di ritentativi per richiesta
+        """
+        self.bucket = TokenBucket(rate, burst)
+        self.concurrency = AdaptiveConcurrency(maximum=max_concurrency)
+        self.max_retries = max_retries
+
+    def backoff(self, attempt):
+        """
+        Calcola l'attesa prima di un ritentativo (backoff esponenziale con jitter).
+
+        Args:
+            attempt: Numero del ritentativo (da 0)
+
+        Returns:
+            float: Secondi di attesa
+        """
+        return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+
+    def call(self, func, args=(), kwargs=None, idempotent=True):
+        """
+        Esegue una richiesta rispettando i limiti e ritentando se necessario.
+
+        Le richieste non idempotenti (es. creazione di un allenamento) vengono
+        ritentate solo dopo un 429, cioè quando il server non le ha elaborate,
+        per non creare duplicati.
+
+        Args:
+            func: Funzione che esegue la richiesta
+            args: Argomenti posizionali della funzione
+            kwargs: Argomenti con nome della funzione
+            idempotent: Se False, ritenta solo le risposte 429
+
+        Returns:
+            Il valore restituito dalla funzione
+
+        Raises:
+            Exception: L'ultimo errore, se la richiesta non riesce
+        """
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            try:
+                with self.concurrency:
+                    result = func(*args, **(kwargs or {}))
+            except Exception as e:
+                response = _error_response(e)
+                status = getattr(response, "status_code", None)
+
+                if idempotent:
+                    retryable = status in RETRYABLE_STATUS or _is_network_error(e)
+                else:
+                    retryable = status == 429
+                if attempt >= self.max_retries or not retryable:
+                    raise
+
+                delay = None
+                if status in (429, 503):
+                    self.concurrency.on_throttle()
+                    delay = parse_retry_after(response.headers.get("Retry-After"))
+                if delay is None:
+                    delay = self.backoff(attempt)
+
+                logging.warning(f"Richiesta non riuscita ({status or type(e).__name__}), "
+                                f"nuovo tentativo tra {delay:.1f}s")
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            self.concurrency.on_success()
+            return result
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Parser del linguaggio testuale dei passi usato nei piani YAML/Excel,
+nell'editor e nei dialog, ad esempio:
+
+    10min @ Z2 -- Fondo lento
+    400m @pwr Z4
+    1:30 @hr Z1_HR
+    lap-button -- Fino al lap
+
+Grammatica:
+    passo       := [fine] [target] [' -- ' descrizione]
+    fine        := 'lap-button' | tempo | distanza
+    tempo       := numero 'min' | numero 's' | mm:ss | hh:mm:ss
+    distanza    := numero 'km' | numero 'm'
+    target      := ('@' | '@hr' | '@pwr' | '@spd' | '@cad') zona
+"""
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# Numero massimo di stringhe distinte conservate in cache
+STEP_CACHE_SIZE = 4096
+
+# Separatore della descrizione
+DESCRIPTION_SEPARATOR = ' -- '
+
+# Valore della condizione di fine "pulsante lap"
+LAP_BUTTON = 'lap-button'
+
+# Marcatori dei target e tipo di target corrispondente
+TARGET_MARKERS = {
+    None: 'pace.zone',
+    'hr': 'heart.rate.zone',
+    'pwr': 'power.zone',
+    'spd': 'speed.zone',
+    'cad': 'cadence.zone',
+}
+
+# Marcatore del target (" @ ", " @hr ", ...), anche a inizio stringa
+TARGET_PATTERN = re.compile(r'(?:^|\s)@(hr|pwr|spd|cad)?(?:\s+|$)')
+
+# Valori della condizione di fine
+TIME_PATTERN = re.compile(r'^(?:\d+(?:\.\d+)?(?:min|s)|\d+:\d{1,2}(?::\d{1,2})?)$')
+DISTANCE_PATTERN = re.compile(r'^\d+(?:\.\d+)?(?:km|m)$')
+
+# Passo analizzato: condizione di fine, valore originale, tipo di target,
+# nome della zona (o None) e descrizione
+StepSpec = namedtuple('StepSpec', ['end_condition', 'end_value', 'target_type', 'zone', 'description'])
+
+
+def parse_end(token):
+    """
+    Riconosce la condizione di fine di un passo.
+
+    Args:
+        token: Valore testuale (es. '10min', '1:30', '2.5km', 'lap-button')
+
+    Returns:
+        tuple: (condizione di fine, valore originale o None)
+    """
+    token = token.strip()
+    if TIME_PATTERN.match(token):
+        return 'time', token
+    if DISTANCE_PATTERN.match(token):
+        return 'distance', token
+    return 'lap.button', None
+
+
+@lru_cache(maxsize=STEP_CACHE_SIZE)
+def parse_step(detail):
+    """
+    Analizza la descrizione testuale di un passo.
+    Il risultato è immutabile e viene conservato in cache: le stringhe ripetute
+    (frequenti nei piani importati) vengono analizzate una sola volta.
+
+    Args:
+        detail: Descrizione del passo (es. '1km @ Z4 -- Ripetuta')
+
+    Returns:
+        StepSpec: Passo analizzato
+    """
+    detail = str(detail or '')
+
+    # Descrizione
+    head, _, description = detail.partition(DESCRIPTION_SEPARATOR)
+    description = description.split(DESCRIPTION_SEPARATOR)[0].strip()
+
+    # Target
+    target_type = 'no.target'
+    zone = None
+    match = TARGET_PATTERN.search(head)
+    if match:
+        target_type = TARGET_MARKERS[match.group(1)]
+        zone = head[match.end():].strip() or None
+        head = head[:match.start()]
+
+    # Condizione di fine (primo elemento rimasto)
+    tokens = head.split()
+    end_condition, end_value = parse_end(tokens[0]) if tokens else ('lap.button', None)
+
+    return StepSpec(end_condition, end_value, target_type, zone, description)
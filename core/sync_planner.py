@@ -0,0 +1,295 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Pianificazione della sincronizzazione differenziale con Garmin Connect.
+Confronta un'impronta (hash) stabile degli allenamenti locali con quella dei
+dettagli remoti, così da eseguire solo le creazioni, gli aggiornamenti e le
+eliminazioni effettivamente necessari.
+"""
+
+import hashlib
+import json
+import logging
+
+from core.async_client import fetch_workout_details
+
+# Azioni possibili per un allenamento locale
+ACTION_CREATE = "create"
+ACTION_UPDATE = "update"
+ACTION_UNCHANGED = "unchanged"
+
+
+def _normalize_number(value):
+    """
+    Rende confrontabili i valori numerici (es. 600, 600.0 e "600").
+
+    Args:
+        value: Valore da normalizzare
+
+    Returns:
+        Il valore come float arrotondato, o il valore originale se non numerico
+    """
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, (int, float)):
+        return round(float(value), 3)
+    if isinstance(value, str):
+        try:
+            return round(float(value), 3)
+        except ValueError:
+            return value
+    return value
+
+
+def _key(obj, name, field):
+    """Estrae obj[name][field] tollerando valori mancanti."""
+    return (obj.get(name) or {}).get(field)
+
+
+def _normalize_step(step):
+    """
+    Riduce un passo in formato Garmin ai soli campi che ne definiscono il contenuto.
+    L'ordine dei passi è dato dalla posizione nella lista, perché Garmin Connect
+    rinumera stepOrder in modo progressivo su tutto l'allenamento.
+
+    Args:
+        step: Passo in formato Garmin (locale o remoto)
+
+    Returns:
+        dict: Passo normalizzato
+    """
+    normalized = {
+        "type": step.get("type"),
+        "stepType": _key(step, "stepType", "stepTypeKey"),
+        "endCondition": _key(step, "endCondition", "conditionTypeKey"),
+        "endConditionValue": _normalize_number(step.get("endConditionValue")),
+    }
+
+    if step.get("type") == "RepeatGroupDTO":
+        normalized["numberOfIterations"] = _normalize_number(step.get("numberOfIterations"))
+    else:
+        normalized.update({
+            "description": step.get("description") or "",
+            "targetType": _key(step, "targetType", "workoutTargetTypeKey"),
+            "targetValueOne": _normalize_number(step.get("targetValueOne")),
+            "targetValueTwo": _normalize_number(step.get("targetValueTwo")),
+            "zoneNumber": _normalize_number(step.get("zoneNumber")),
+        })
+
+    normalized["workoutSteps"] = [_normalize_step(s) for s in step.get("workoutSteps") or []]
+    return normalized
+
+
+def normalize_workout_json(workout_json):
+    """
+    Riduce un allenamento in formato Garmin a una forma canonica, indipendente
+    dai campi aggiunti dal server (ID, date, ordini di visualizzazione, ...).
+
+    Args:
+        workout_json: Allenamento in formato Garmin (garminconnect_json o get_workout)
+
+    Returns:
+        dict: Allenamento normalizzato
+    """
+    steps = []
+    for segment in workout_json.get("workoutSegments") or []:
+        steps.extend(_normalize_step(s) for s in segment.get("workoutSteps") or [])
+
+    return {
+        "sportType": _key(workout_json, "sportType", "sportTypeKey"),
+        "workoutName": workout_json.get("workoutName"),
+        "description": workout_json.get("description") or "",
+        "workoutSteps": steps,
+    }
+
+
+def workout_fingerprint(workout_json):
+    """
+    Calcola un hash stabile del contenuto di un allenamento.
+
+    Args:
+        workout_json: Allenamento in formato Garmin
+
+    Returns:
+        str: Hash esadecimale del contenuto normalizzato
+    """
+    canonical = json.dumps(normalize_workout_json(workout_json), sort_keys=True,
+                           separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SyncOperation:
+    """Operazione pianificata per un allenamento locale"""
+
+    def __init__(self, workout, action, workout_id=None):
+        """
+        Inizializza l'operazione.
+
+        Args:
+            workout: Oggetto Workout locale
+            action: Azione da eseguire (ACTION_CREATE, ACTION_UPDATE, ACTION_UNCHANGED)
+            workout_id: ID dell'allenamento remoto corrispondente (se esiste)
+        """
+        self.workout = workout
+        self.action = action
+        self.workout_id = workout_id
+
+
+class SyncPlan:
+    """Insieme delle operazioni necessarie per allineare Garmin Connect"""
+
+    def __init__(self, operations=None, deletes=None, remote_ids=None):
+        """
+        Inizializza il piano.
+
+        Args:
+            operations: Lista di SyncOperation, una per allenamento locale
+            deletes: Lista di tuple (workout_id, nome) da eliminare su Garmin Connect
+            remote_ids: Insieme degli ID presenti su Garmin Connect al momento del
+                        piano (None se non noti)
+        """
+        self.operations = operations or []
+        self.deletes = deletes or []
+        self.remote_ids = set(remote_ids) if remote_ids is not None else None
+
+    @classmethod
+    def by_name(cls, workouts, existing_map, replace):
+        """
+        Costruisce un piano senza confronto dei contenuti: gli allenamenti già
+        presenti con lo stesso nome vengono aggiornati (se replace), gli altri creati.
+
+        Args:
+            workouts: Lista degli allenamenti locali
+            existing_map: Dizionario nome -> ID degli allenamenti remoti
+            replace: Se True, aggiorna gli allenamenti esistenti
+
+        Returns:
+            SyncPlan: Piano di sincronizzazione
+        """
+        operations = []
+        for workout in workouts:
+            if replace and workout.workout_name in existing_map:
+                operations.append(SyncOperation(workout, ACTION_UPDATE, existing_map[workout.workout_name]))
+            else:
+                operations.append(SyncOperation(workout, ACTION_CREATE))
+        return cls(operations, remote_ids=existing_map.values())
+
+    def count(self, action):
+        """
+        Conta le operazioni di un certo tipo.
+
+        Args:
+            action: Azione da contare
+
+        Returns:
+            int: Numero di operazioni
+        """
+        return sum(1 for op in self.operations if op.action == action)
+
+    def describe(self):
+        """
+        Descrive il piano in forma leggibile.
+
+        Returns:
+            str: Riepilogo delle operazioni
+        """
+        return (f"{self.count(ACTION_CREATE)} da creare, "
+                f"{self.count(ACTION_UPDATE)} da aggiornare, "
+                f"{self.count(ACTION_UNCHANGED)} invariati, "
+                f"{len(self.deletes)} da eliminare")
+
+
+class SyncPlanner:
+    """Calcola il piano di sincronizzazione differenziale"""
+
+    def __init__(self, garmin_client, max_workers=4):
+        """
+        Inizializza il pianificatore.
+
+        Args:
+            garmin_client: Istanza di GarminClient autenticata
+            max_workers: Numero di dettagli remoti scaricati in parallelo (client asincrono)
+        """
+        self.garmin_client = garmin_client
+        self.max_workers = max(1, int(max_workers))
+
+    def plan(self, workouts, remote_workouts, replace=True, delete_missing=False):
+        """
+        Confronta gli allenamenti locali con quelli presenti su Garmin Connect.
+
+        I dettagli remoti vengono letti in parallelo dal client asincrono con
+        la data di ultima modifica, quindi dalla cache locale quando non sono
+        cambiati.
+
+        Args:
+            workouts: Lista degli allenamenti locali
+            remote_workouts: Riepiloghi restituiti da list_workouts
+            replace: Se False, ogni allenamento locale viene creato come nuovo
+            delete_missing: Se True, elimina gli allenamenti remoti assenti in locale
+
+        Returns:
+            SyncPlan: Piano di sincronizzazione
+        """
+        remote_by_name = {}
+        for summary in remote_workouts:
+            remote_by_name[summary["workoutName"]] = summary
+
+        if not replace:
+            plan = SyncPlan([SyncOperation(w, ACTION_CREATE) for w in workouts])
+        else:
+            # Dettagli remoti degli allenamenti con lo stesso nome, scaricati in parallelo
+            matched = {w.workout_name: remote_by_name[w.workout_name]
+                       for w in workouts if w.workout_name in remote_by_name}
+            details = fetch_workout_details(self.garmin_client, list(matched.values()), self.max_workers)
+            remote_hashes = {
+                name: self._remote_fingerprint(summary, details.get(summary["workoutId"]))
+                for name, summary in matched.items()
+            }
+
+            operations = []
+            for workout in workouts:
+                summary = remote_by_name.get(workout.workout_name)
+                if summary is None:
+                    operations.append(SyncOperation(workout, ACTION_CREATE))
+                    continue
+
+                remote_hash = remote_hashes.get(workout.workout_name)
+                local_hash = workout_fingerprint(workout.garminconnect_json(shared=True))
+                if remote_hash is not None and remote_hash == local_hash:
+                    action = ACTION_UNCHANGED
+                else:
+                    action = ACTION_UPDATE
+                operations.append(SyncOperation(workout, action, summary["workoutId"]))
+
+            plan = SyncPlan(operations)
+
+        plan.remote_ids = {summary["workoutId"] for summary in remote_workouts}
+
+        if delete_missing:
+            local_names = {w.workout_name for w in workouts}
+            plan.deletes = [
+                (summary["workoutId"], summary["workoutName"])
+                for summary in remote_workouts
+                if summary["workoutName"] not in local_names
+            ]
+
+        logging.info(f"Piano di sincronizzazione: {plan.describe()}")
+        return plan
+
+    def _remote_fingerprint(self, summary, detail):
+        """
+        Calcola l'impronta di un allenamento remoto.
+
+        Args:
+            summary: Riepilogo dell'allenamento restituito da list_workouts
+            detail: Dettagli dell'allenamento (None se non scaricati)
+
+        Returns:
+            str: Hash del contenuto remoto, o None se non disponibile
+        """
+        try:
+            return workout_fingerprint(detail) if detail else None
+        except Exception as e:
+            logging.warning(f"Impossibile confrontare l'allenamento '{summary['workoutName']}': {str(e)}")
+            return None
@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Journal persistente dei caricamenti su Garmin Connect.
+Registra (in modalità write-ahead) le operazioni pianificate e quelle
+completate, così che un caricamento interrotto possa riprendere dall'ultimo
+passo confermato senza creare allenamenti o pianificazioni duplicate.
+"""
+
+import datetime
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from core.sync_planner import workout_fingerprint
+
+# Nome del file del journal nella cartella dei token OAuth
+UPLOAD_JOURNAL_FILE = "upload_journal.jsonl"
+
+# Tipi di record del journal
+RECORD_BEGIN = "begin"
+RECORD_PLANNED = "planned"
+RECORD_UPLOADED = "uploaded"
+RECORD_SCHEDULED = "scheduled"
+RECORD_DELETED = "deleted"
+
+
+def plan_fingerprint(plan):
+    """
+    Calcola un hash del contenuto di un piano (allenamenti, date ed eliminazioni).
+    Le azioni e gli ID remoti non sono inclusi, perché cambiano proprio per
+    effetto di un caricamento interrotto.
+
+    Args:
+        plan: SyncPlan da eseguire
+
+    Returns:
+        str: Hash esadecimale del piano
+    """
+    content = {
+        "workouts": sorted(
+            [op.workout.workout_name, workout_fingerprint(op.workout.garminconnect_json(shared=True)),
+             op.workout.get_scheduled_date() or ""]
+            for op in plan.operations
+        ),
+        "deletes": sorted(str(workout_id) for workout_id, _ in plan.deletes),
+    }
+    canonical = json.dumps(content, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class UploadJournal:
+    """Journal append-only (JSON Lines) di un caricamento"""
+
+    def __init__(self, path):
+        """
+        Inizializza il journal.
+
+        Args:
+            path: Percorso del file del journal
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+        # Hash del piano del caricamento registrato
+        self.plan_hash = None
+        # Stato ricostruito dal journal: nome -> (workout_id, hash, azione)
+        self.uploaded = {}
+        # Coppie (workout_id, data) già pianificate
+        self.scheduled = set()
+        # ID degli allenamenti già eliminati
+        self.deleted = set()
+
+        self._load()
+
+    def _load(self):
+        """Ricostruisce lo stato dell'ultimo caricamento interrotto."""
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Ultima riga troncata da un'interruzione
+                        continue
+                    self._apply(record)
+        except Exception as e:
+            logging.warning(f"Impossibile leggere il journal dei caricamenti: {str(e)}")
+
+    def _apply(self, record):
+        """
+        Applica un record allo stato in memoria.
+
+        Args:
+            record: Record del journal
+        """
+        kind = record.get("record")
+        if kind == RECORD_BEGIN:
+            self.plan_hash = record.get("plan")
+        elif kind == RECORD_UPLOADED:
+            self.uploaded[record["name"]] = (record["workout_id"], record.get("hash"), record.get("action"))
+        elif kind == RECORD_SCHEDULED:
+            self.scheduled.add((record["workout_id"], record["date"]))
+        elif kind == RECORD_DELETED:
+            self.deleted.add(record["workout_id"])
+
+    def has_pending(self):
+        """
+        Verifica se esiste un caricamento interrotto da riprendere.
+
+        Returns:
+            bool: True se il journal contiene operazioni di un caricamento non concluso
+        """
+        return bool(self.uploaded or self.scheduled or self.deleted)
+
+    def _write(self, record):
+        """
+        Aggiunge un record al journal e lo forza su disco.
+
+        Args:
+            record: Record da scrivere
+        """
+        record["time"] = datetime.datetime.now().isoformat(timespec='seconds')
+        line = json.dumps(record, ensure_ascii=False)
+
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._apply(record)
+
+    def begin(self, plan):
+        """
+        Registra l'inizio di un caricamento e le operazioni pianificate.
+        Lo stato di un caricamento interrotto viene mantenuto solo se il piano
+        è lo stesso; altrimenti il journal viene scartato.
+
+        Args:
+            plan: SyncPlan che sta per essere eseguito
+        """
+        plan_hash = plan_fingerprint(plan)
+        if self.has_pending() and self.plan_hash == plan_hash:
+            logging.info(f"Ripresa del caricamento interrotto: {len(self.uploaded)} allenamenti già caricati, "
+                         f"{len(self.scheduled)} già pianificati")
+        else:
+            if self.has_pending():
+                logging.info("Journal di un caricamento con un piano diverso: viene scartato")
+            self.finish()
+
+        self._write({"record": RECORD_BEGIN, "plan": plan_hash})
+        for op in plan.operations:
+            self._write({
+                "record": RECORD_PLANNED,
+                "name": op.workout.workout_name,
+                "action": op.action,
+                "workout_id": op.workout_id,
+                "date": op.workout.get_scheduled_date(),
+            })
+        for workout_id, name in plan.deletes:
+            self._write({"record": RECORD_PLANNED, "name": name, "action": "delete", "workout_id": workout_id})
+
+    def record_uploaded(self, name, workout_id, fingerprint, action):
+        """
+        Registra un allenamento creato o aggiornato.
+
+        Args:
+            name: Nome dell'allenamento
+            workout_id: ID dell'allenamento su Garmin Connect
+            fingerprint: Hash del contenuto caricato
+            action: Azione eseguita
+        """
+        self._write({"record": RECORD_UPLOADED, "name": name, "workout_id": workout_id,
+                     "hash": fingerprint, "action": action})
+
+    def record_scheduled(self, name, workout_id, date, schedule_id=None):
+        """
+        Registra una pianificazione completata.
+
+        Args:
+            name: Nome dell'allenamento
+            workout_id: ID dell'allenamento su Garmin Connect
+            date: Data della pianificazione (YYYY-MM-DD)
+            schedule_id: ID della pianificazione, se restituito da Garmin Connect
+        """
+        self._write({"record": RECORD_SCHEDULED, "name": name, "workout_id": workout_id,
+                     "date": date, "schedule_id": schedule_id})
+
+    def record_deleted(self, workout_id, name):
+        """
+        Registra un allenamento eliminato.
+
+        Args:
+            workout_id: ID dell'allenamento eliminato
+            name: Nome dell'allenamento
+        """
+        self._write({"record": RECORD_DELETED, "name": name, "workout_id": workout_id})
+
+    def uploaded_id(self, name):
+        """
+        Restituisce l'esito registrato per un allenamento.
+
+        Args:
+            name: Nome dell'allenamento
+
+        Returns:
+            tuple: (workout_id, hash, azione) o None se non ancora caricato
+        """
+        return self.uploaded.get(name)
+
+    def is_scheduled(self, workout_id, date):
+        """Verifica se la pianificazione (workout_id, data) è già stata completata."""
+        return (workout_id, date) in self.scheduled
+
+    def is_deleted(self, workout_id):
+        """Verifica se l'allenamento è già stato eliminato."""
+        return workout_id in self.deleted
+
+    def finish(self):
+        """Chiude un caricamento completato senza errori, eliminando il journal."""
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self.plan_hash = None
+            self.uploaded.clear()
+            self.scheduled.clear()
+            self.deleted.clear()
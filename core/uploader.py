@@ -0,0 +1,509 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Motore di caricamento concorrente degli allenamenti su Garmin Connect.
+Esegue creazione/aggiornamento e pianificazione di più allenamenti in parallelo
+con un pool di worker limitato, mantenendo l'ordine delle operazioni per ogni
+singolo allenamento. La pianificazione confronta le date desiderate con il
+calendario di Garmin Connect e invia solo le differenze. Con un UploadJournal
+ogni passo confermato viene registrato su disco, così che un caricamento
+interrotto possa essere ripreso.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from core.calendar_service import CalendarService
+
+from core.sync_planner import (SyncPlan, ACTION_CREATE, ACTION_UPDATE, ACTION_UNCHANGED,
+                               workout_fingerprint)
+
+# Numero predefinito di allenamenti caricati in parallelo
+DEFAULT_CONCURRENCY = 4
+
+# Limite massimo di worker, per non sovraccaricare Garmin Connect
+MAX_CONCURRENCY = 16
+
+# Numero di pianificazioni inviate (o rimosse) per ogni lotto
+SCHEDULE_BATCH_SIZE = 20
+
+
+class UploadResult:
+    """Esito del caricamento di un singolo allenamento"""
+
+    def __init__(self, workout):
+        """
+        Inizializza l'esito del caricamento.
+
+        Args:
+            workout: Oggetto Workout caricato
+        """
+        self.workout = workout
+        self.workout_id = None
+        self.action = None
+        self.scheduled = False
+        self.already_scheduled = False
+        self.error = None
+        self.schedule_error = None
+        self.resumed = False
+
+    @property
+    def success(self):
+        """True se l'allenamento è stato creato, aggiornato o era già allineato"""
+        return self.error is None and self.action is not None
+
+    def to_dict(self):
+        """
+        Restituisce l'esito in formato serializzabile.
+
+        Returns:
+            dict: Esito del caricamento
+        """
+        return {
+            "name": self.workout.workout_name,
+            "workout_id": self.workout_id,
+            "action": self.action,
+            "scheduled": self.scheduled,
+            "already_scheduled": self.already_scheduled,
+            "date": self.workout.get_scheduled_date(),
+            "error": self.error,
+            "schedule_error": self.schedule_error,
+            "resumed": self.resumed,
+        }
+
+
+class UploadReport:
+    """Rapporto aggregato di un caricamento"""
+
+    def __init__(self, results, deleted=None, delete_errors=None, unscheduled=None):
+        """
+        Inizializza il rapporto.
+
+        Args:
+            results: Lista di UploadResult, nell'ordine degli allenamenti
+            deleted: Nomi degli allenamenti eliminati da Garmin Connect
+            delete_errors: Nomi degli allenamenti la cui eliminazione non è riuscita
+            unscheduled: Tuple (workout_id, data) delle pianificazioni obsolete rimosse
+        """
+        self.results = results
+        self.deleted = deleted or []
+        self.delete_errors = delete_errors or []
+        self.unscheduled = unscheduled or []
+
+    @property
+    def success_count(self):
+        return sum(1 for r in self.results if r.success)
+
+    @property
+    def error_count(self):
+        return sum(1 for r in self.results if r.error is not None) + len(self.delete_errors)
+
+    def action_count(self, action):
+        return sum(1 for r in self.results if r.error is None and r.action == action)
+
+    @property
+    def resumed_count(self):
+        return sum(1 for r in self.results if r.resumed)
+
+    @property
+    def scheduled_count(self):
+        return sum(1 for r in self.results if r.scheduled and not r.already_scheduled)
+
+    @property
+    def already_scheduled_count(self):
+        return sum(1 for r in self.results if r.already_scheduled)
+
+    @property
+    def schedule_error_count(self):
+        return sum(1 for r in self.results if r.schedule_error is not None)
+
+    def summary(self):
+        """
+        Genera un messaggio riassuntivo per l'utente.
+
+        Returns:
+            str: Messaggio riassuntivo
+        """
+        message = f"Caricati {self.success_count} allenamenti su Garmin Connect."
+        unchanged = self.action_count(ACTION_UNCHANGED)
+        if unchanged > 0:
+            message += (f"\nCreati {self.action_count(ACTION_CREATE)}, "
+                        f"aggiornati {self.action_count(ACTION_UPDATE)}, "
+                        f"{unchanged} già aggiornati su Garmin Connect.")
+        if self.resumed_count > 0:
+            message += f"\n{self.resumed_count} allenamenti già caricati in un'operazione interrotta."
+        if self.deleted:
+            message += f"\nEliminati {len(self.deleted)} allenamenti da Garmin Connect."
+        if self.scheduled_count > 0:
+            message += f"\nPianificati {self.scheduled_count} allenamenti nelle date specificate."
+        if self.already_scheduled_count > 0:
+            message += f"\n{self.already_scheduled_count} allenamenti erano già pianificati."
+        if self.unscheduled:
+            message += f"\nRimosse {len(self.unscheduled)} pianificazioni non più valide."
+        if self.schedule_error_count > 0:
+            message += f"\n{self.schedule_error_count} pianificazioni non riuscite."
+        return message
+
+    def to_dict(self):
+        """
+        Restituisce il rapporto in formato serializzabile.
+
+        Returns:
+            dict: Rapporto del caricamento
+        """
+        return {
+            "success_count": self.success_count,
+            "error_count": self.error_count,
+            "scheduled_count": self.scheduled_count,
+            "already_scheduled_count": self.already_scheduled_count,
+            "unscheduled": [{"workout_id": i, "date": d} for i, d in self.unscheduled],
+            "results": [r.to_dict() for r in self.results],
+            "deleted": self.deleted,
+            "delete_errors": self.delete_errors,
+        }
+
+
+class UploadEngine:
+    """Carica più allenamenti in parallelo con un pool di worker limitato"""
+
+    def __init__(self, garmin_client, max_workers=DEFAULT_CONCURRENCY, journal=None):
+        """
+        Inizializza il motore di caricamento.
+
+        Args:
+            garmin_client: Istanza di GarminClient autenticata
+            max_workers: Numero massimo di allenamenti caricati in parallelo
+            journal: UploadJournal in cui registrare i passi completati (opzionale)
+        """
+        self.garmin_client = garmin_client
+        self.max_workers = max(1, min(int(max_workers), MAX_CONCURRENCY))
+        self.journal = journal
+
+        # Calendario condiviso con il client, se disponibile
+        self.calendar = getattr(garmin_client, 'calendar', None) or CalendarService(garmin_client)
+
+    def upload(self, workouts, replace=False, schedule=True, existing_map=None,
+               progress_callback=None):
+        """
+        Carica gli allenamenti su Garmin Connect, abbinandoli per nome a quelli esistenti.
+
+        Args:
+            workouts: Lista degli allenamenti da caricare
+            replace: Se True, sostituisce gli allenamenti esistenti con lo stesso nome
+            schedule: Se True, pianifica gli allenamenti nelle date specificate
+            existing_map: Dizionario nome -> ID degli allenamenti già presenti
+                          (se None viene letto da Garmin Connect)
+            progress_callback: Funzione chiamata come (completati, totale, nome, messaggio)
+                               al termine di ogni allenamento, dai thread di lavoro
+
+        Returns:
+            UploadReport: Rapporto aggregato del caricamento
+        """
+        if existing_map is None:
+            existing_map = {
+                wo["workoutName"]: wo["workoutId"]
+                for wo in self.garmin_client.list_workouts()
+            }
+
+        return self.execute(SyncPlan.by_name(workouts, existing_map, replace),
+                            schedule, progress_callback)
+
+    def execute(self, plan, schedule=True, progress_callback=None, prune_schedules=False):
+        """
+        Esegue un piano di sincronizzazione.
+
+        Gli allenamenti vengono prima creati o aggiornati in parallelo (quelli
+        invariati non vengono inviati di nuovo); poi le date desiderate vengono
+        confrontate con il calendario, pianificando solo le coppie
+        (allenamento, data) mancanti e, se richiesto, rimuovendo quelle non
+        più valide.
+        Se è presente un journal, i passi già confermati da un caricamento
+        interrotto vengono saltati e il journal viene eliminato solo se non
+        ci sono errori.
+
+        Args:
+            plan: SyncPlan da eseguire
+            schedule: Se True, pianifica gli allenamenti nelle date specificate
+            progress_callback: Funzione chiamata come (completati, totale, nome, messaggio)
+                               al termine di ogni operazione, dai thread di lavoro
+            prune_schedules: Se True, rimuove dal calendario le altre pianificazioni
+                             degli allenamenti caricati (date cambiate o duplicati);
+                             altrimenti quelle aggiunte a mano restano invariate
+
+        Returns:
+            UploadReport: Rapporto aggregato del caricamento
+        """
+        results = [UploadResult(op.workout) for op in plan.operations]
+        total = len(results) + len(plan.deletes)
+        completed = 0
+        deleted = []
+        delete_errors = []
+
+        if self.journal:
+            self.journal.begin(plan)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix="garmin-upload") as executor:
+            futures = {
+                executor.submit(self._upload_one, result, op, plan.remote_ids): result
+                for result, op in zip(results, plan.operations)
+            }
+            for workout_id, name in plan.deletes:
+                futures[executor.submit(self._delete_one, workout_id, name)] = name
+
+            for future in as_completed(futures):
+                completed += 1
+                outcome = future.result()
+
+                if isinstance(outcome, UploadResult):
+                    name = outcome.workout.workout_name
+                    if outcome.error:
+                        message = "Errore nel caricamento"
+                    elif outcome.action == ACTION_UNCHANGED:
+                        message = "Già aggiornato"
+                    else:
+                        message = "Caricato"
+                else:
+                    name, ok = outcome
+                    (deleted if ok else delete_errors).append(name)
+                    message = "Eliminato" if ok else "Errore nell'eliminazione"
+
+                if progress_callback:
+                    progress_callback(completed, total, name, message)
+
+            unscheduled = []
+            if schedule:
+                unscheduled = self._sync_schedule(executor, results, completed, total,
+                                                 progress_callback, prune_schedules)
+
+        report = UploadReport(results, deleted, delete_errors, unscheduled)
+
+        if self.journal and report.error_count == 0 and report.schedule_error_count == 0:
+            self.journal.finish()
+
+        return report
+
+    def _upload_one(self, result, operation, remote_ids=None):
+        """
+        Crea o aggiorna un allenamento.
+
+        Args:
+            result: UploadResult da compilare
+            operation: SyncOperation da eseguire
+            remote_ids: ID presenti su Garmin Connect al momento del piano (opzionale)
+
+        Returns:
+            UploadResult: L'esito compilato
+        """
+        workout = result.workout
+        name = workout.workout_name
+        fingerprint = workout_fingerprint(workout.garminconnect_json(shared=True)) if self.journal else None
+
+        # Esito registrato da un caricamento interrotto: vale solo per lo stesso
+        # allenamento remoto del piano (aggiornamento) o per un allenamento creato
+        # che risulta ancora presente su Garmin Connect; gli altri seguono il piano
+        journaled = self.journal.uploaded_id(name) if self.journal else None
+        if journaled and not self._journaled_still_valid(journaled[0], operation, remote_ids):
+            journaled = None
+
+        try:
+            if journaled and journaled[1] == fingerprint:
+                # Già caricato con lo stesso contenuto: nessuna richiesta
+                result.workout_id = journaled[0]
+                result.action = journaled[2] or operation.action
+                result.resumed = True
+            else:
+                action = operation.action
+                result.workout_id = operation.workout_id
+
+                if action == ACTION_UPDATE:
+                    self.garmin_client.update_workout(result.workout_id, workout)
+                elif action == ACTION_CREATE:
+                    response = self.garmin_client.add_workout(workout)
+                    if not response or "workoutId" not in response:
+                        # Senza ID l'allenamento non può essere pianificato né ripreso
+                        raise Exception("Garmin Connect non ha restituito l'ID dell'allenamento creato")
+                    result.workout_id = response["workoutId"]
+                result.action = action
+
+                if self.journal and result.workout_id:
+                    self.journal.record_uploaded(name, result.workout_id, fingerprint, action)
+        except Exception as e:
+            logging.error(f"Errore nel caricamento dell'allenamento '{name}': {str(e)}")
+            result.error = str(e)
+            return result
+
+        return result
+
+    def _journaled_still_valid(self, workout_id, operation, remote_ids):
+        """
+        Verifica se l'ID registrato nel journal corrisponde ancora all'operazione.
+
+        Args:
+            workout_id: ID registrato nel journal
+            operation: SyncOperation da eseguire
+            remote_ids: ID presenti su Garmin Connect al momento del piano (o None)
+
+        Returns:
+            bool: True se il passo registrato può essere riutilizzato
+        """
+        if operation.action == ACTION_UPDATE:
+            return workout_id == operation.workout_id
+        if operation.action == ACTION_CREATE:
+            return remote_ids is not None and workout_id in remote_ids
+        return False
+
+    def _delete_one(self, workout_id, name):
+        """
+        Elimina un allenamento da Garmin Connect.
+
+        Args:
+            workout_id: ID dell'allenamento
+            name: Nome dell'allenamento
+
+        Returns:
+            tuple: (nome, True se l'eliminazione è riuscita)
+        """
+        if self.journal and self.journal.is_deleted(workout_id):
+            return name, True
+
+        try:
+            self.garmin_client.delete_workout(workout_id)
+            if self.journal:
+                self.journal.record_deleted(workout_id, name)
+            return name, True
+        except Exception as e:
+            logging.error(f"Errore nell'eliminazione dell'allenamento '{name}': {str(e)}")
+            return name, False
+
+    def _sync_schedule(self, executor, results, completed, total, progress_callback, prune=False):
+        """
+        Allinea il calendario alle date degli allenamenti caricati.
+
+        Le pianificazioni esistenti vengono lette dal calendario per l'intervallo
+        delle date richieste: si inviano solo le coppie (allenamento, data)
+        mancanti e, con prune, si rimuovono quelle degli stessi allenamenti non
+        più previste (o duplicate), a lotti di SCHEDULE_BATCH_SIZE.
+
+        Args:
+            executor: Pool di worker del caricamento
+            results: Lista di UploadResult
+            completed: Operazioni già completate (per l'avanzamento)
+            total: Totale delle operazioni prima della pianificazione
+            progress_callback: Funzione di avanzamento (o None)
+            prune: Se True, rimuove le pianificazioni non più previste
+
+        Returns:
+            list: Tuple (workout_id, data) delle pianificazioni rimosse
+        """
+        desired = {}
+        for result in results:
+            date = result.workout.get_scheduled_date()
+            if result.success and result.workout_id and date:
+                desired.setdefault((result.workout_id, date), result)
+
+        if not desired:
+            return []
+
+        # Stato corrente del calendario nell'intervallo delle date richieste
+        dates = sorted(date for _, date in desired)
+        try:
+            self.calendar.prefetch(dates[0], dates[-1], force=True)
+            calendar = self.calendar.scheduled_workouts(dates[0], dates[-1])
+        except Exception as e:
+            logging.warning(f"Calendario non disponibile, pianificazione completa: {str(e)}")
+            calendar = None
+
+        names = {workout_id: result.workout.workout_name for (workout_id, _), result in desired.items()}
+        existing = set()
+        stale = []
+        for date, items in (calendar or {}).items():
+            for item in items:
+                pair = (item.get('workoutId'), date)
+                if pair[0] not in names:
+                    continue
+                if pair in desired and pair not in existing:
+                    existing.add(pair)
+                elif prune:
+                    stale.append((item.get('id'), pair))
+
+        # Il journal sostituisce il calendario solo se questo non è disponibile
+        missing = []
+        for pair, result in desired.items():
+            resumed = calendar is None and self.journal and self.journal.is_scheduled(*pair)
+            if pair in existing or resumed:
+                result.scheduled = True
+                result.already_scheduled = True
+            else:
+                missing.append((pair, result))
+
+        total += len(missing) + len(stale)
+        if progress_callback and (missing or stale):
+            progress_callback(completed, total, "", "Aggiornamento del calendario...")
+
+        unscheduled = []
+        for start in range(0, len(missing), SCHEDULE_BATCH_SIZE):
+            batch = missing[start:start + SCHEDULE_BATCH_SIZE]
+            for result in executor.map(lambda entry: self._schedule_one(*entry), batch):
+                completed += 1
+                if progress_callback:
+                    if result.scheduled:
+                        message = f"Pianificato per il {result.workout.get_scheduled_date()}"
+                    else:
+                        message = "Errore nella pianificazione"
+                    progress_callback(completed, total, result.workout.workout_name, message)
+
+        for start in range(0, len(stale), SCHEDULE_BATCH_SIZE):
+            batch = stale[start:start + SCHEDULE_BATCH_SIZE]
+            for (schedule_id, pair), ok in zip(batch, executor.map(lambda entry: self._unschedule_one(*entry), batch)):
+                completed += 1
+                if ok:
+                    unscheduled.append(pair)
+                if progress_callback:
+                    message = "Pianificazione rimossa" if ok else "Errore nella rimozione della pianificazione"
+                    progress_callback(completed, total, names[pair[0]], message)
+
+        return unscheduled
+
+    def _schedule_one(self, pair, result):
+        """
+        Pianifica un allenamento in una data.
+
+        Args:
+            pair: Tupla (workout_id, data)
+            result: UploadResult dell'allenamento
+
+        Returns:
+            UploadResult: L'esito aggiornato
+        """
+        workout_id, date = pair
+        name = result.workout.workout_name
+        try:
+            response = self.garmin_client.schedule_workout(workout_id, date)
+            result.scheduled = True
+            if self.journal:
+                schedule_id = response.get("workoutScheduleId") if isinstance(response, dict) else None
+                self.journal.record_scheduled(name, workout_id, date, schedule_id)
+        except Exception as e:
+            logging.error(f"Errore nella pianificazione dell'allenamento '{name}': {str(e)}")
+            result.schedule_error = str(e)
+        return result
+
+    def _unschedule_one(self, schedule_id, pair):
+        """
+        Rimuove una pianificazione non più valida.
+
+        Args:
+            schedule_id: ID della pianificazione
+            pair: Tupla (workout_id, data) della pianificazione
+
+        Returns:
+            bool: True se la rimozione è riuscita
+        """
+        try:
+            self.garmin_client.unschedule_workout(schedule_id)
+            return True
+        except Exception as e:
+            logging.error(f"Errore nella rimozione della pianificazione del {pair[1]}: {str(e)}")
+            return False
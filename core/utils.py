@@ -9,11 +9,12 @@ Basato sul file utils.py originale di garmin-planner, con estensioni.
 import re
 import datetime
 import json
-import yaml
 import os
-import pandas as pd
 import logging
 
+# pandas (con openpyxl) e yaml vengono importati solo quando servono, nelle
+# funzioni di lettura/scrittura dei file, per non rallentare l'avvio
+
 def hhmmss_to_seconds(s):
     """
     Converte una stringa di tempo in vari formati in secondi.
@@ -393,6 +394,8 @@ def load_yaml(filename):
     Returns:
         dict: Dati caricati dal file YAML
     """
+    import yaml
+    
     try:
         with open(filename, 'r', encoding='utf-8') as f:
             return yaml.safe_load(f)
@@ -408,6 +411,8 @@ def save_yaml(data, filename):
         data: Dati da salvare
         filename: Nome del file di destinazione
     """
+    import yaml
+    
     try:
         with open(filename, 'w', encoding='utf-8') as f:
             yaml.dump(data, f, default_flow_style=False, allow_unicode=True)
@@ -415,133 +420,152 @@ def save_yaml(data, filename):
         logging.error(f"Errore nel salvataggio del file YAML: {str(e)}")
         raise
 
+def _excel_pairs(df, key_column, value_column):
+    """
+    Converte un foglio chiave/valore in un dizionario, ignorando le righe incomplete.
+    
+    Args:
+        df: DataFrame del foglio
+        key_column: Nome della colonna delle chiavi
+        value_column: Nome della colonna dei valori
+        
+    Returns:
+        dict: Dizionario chiave -> valore
+    """
+    rows = df[df[key_column].notna() & df[value_column].notna()]
+    return dict(zip(rows[key_column], rows[value_column]))
+
+def _excel_text(column):
+    """
+    Converte una colonna in testo senza spazi iniziali e finali.
+    Le celle vuote (o con soli spazi) diventano NA.
+    
+    Args:
+        column: Serie pandas
+        
+    Returns:
+        Series: Colonna di stringhe (o NA)
+    """
+    text = column.where(column.isna(), column.astype(str).str.strip())
+    return text.mask(text == '')
+
+def _excel_date(value):
+    """
+    Converte il valore di una cella data nel formato YYYY-MM-DD.
+    
+    Args:
+        value: Valore della cella (stringa o data)
+        
+    Returns:
+        str: Data in formato YYYY-MM-DD o None
+    """
+    if isinstance(value, str):
+        return value.strip() or None
+    if isinstance(value, datetime.datetime):
+        return value.strftime('%Y-%m-%d')
+    return None
+
 def load_excel(filename):
     """
     Carica i dati da un file Excel.
     
+    Il file viene aperto una sola volta e il foglio degli allenamenti viene
+    elaborato per colonne: nomi propagati alle righe successive, maschere per
+    passi, ripetizioni e sottopassi.
+    
     Args:
         filename: Nome del file Excel
         
     Returns:
         dict: Dati caricati dal file Excel
     """
+    import pandas as pd
+    
     try:
-        # Legge il foglio di configurazione
-        config_df = pd.read_excel(filename, sheet_name='Config')
-        config = {}
+        # Legge tutti i fogli in una sola apertura del file
+        sheets = pd.read_excel(filename, sheet_name=None)
+        for required in ('Config', 'Workouts'):
+            if required not in sheets:
+                raise ValueError(f"Foglio '{required}' non trovato")
         
         # Processa i dati di configurazione
-        for _, row in config_df.iterrows():
-            if pd.notna(row['Chiave']) and pd.notna(row['Valore']):
-                config[row['Chiave']] = row['Valore']
+        config = _excel_pairs(sheets['Config'], 'Chiave', 'Valore')
         
         # Legge i ritmi, frequenze cardiache e valori di potenza
-        paces = {}
-        try:
-            paces_df = pd.read_excel(filename, sheet_name='Paces')
-            for _, row in paces_df.iterrows():
-                if pd.notna(row['Nome']) and pd.notna(row['Valore']):
-                    paces[row['Nome']] = row['Valore']
-        except:
-            logging.warning("Foglio 'Paces' non trovato o vuoto.")
-        
-        heart_rates = {}
-        try:
-            hr_df = pd.read_excel(filename, sheet_name='HeartRates')
-            for _, row in hr_df.iterrows():
-                if pd.notna(row['Nome']) and pd.notna(row['Valore']):
-                    heart_rates[row['Nome']] = row['Valore']
-        except:
-            logging.warning("Foglio 'HeartRates' non trovato o vuoto.")
-        
-        power_values = {}
-        try:
-            power_df = pd.read_excel(filename, sheet_name='PowerValues')
-            for _, row in power_df.iterrows():
-                if pd.notna(row['Nome']) and pd.notna(row['Valore']):
-                    power_values[row['Nome']] = row['Valore']
-        except:
-            logging.warning("Foglio 'PowerValues' non trovato o vuoto.")
+        zone_sheets = {}
+        for key, sheet in (('paces', 'Paces'), ('heart_rates', 'HeartRates'), ('power_values', 'PowerValues')):
+            try:
+                zone_sheets[key] = _excel_pairs(sheets[sheet], 'Nome', 'Valore')
+            except KeyError:
+                zone_sheets[key] = {}
+                logging.warning(f"Foglio '{sheet}' non trovato o vuoto.")
         
         # Legge gli allenamenti
-        workouts_df = pd.read_excel(filename, sheet_name='Workouts')
-        workouts = {}
+        workouts_df = sheets['Workouts']
+        names = _excel_text(workouts_df['Nome'])
+        step_types = _excel_text(workouts_df['TipoPasso'])
+        step_details = _excel_text(workouts_df['Dettagli'])
+        sub_types = _excel_text(workouts_df['SubTipoPasso'])
+        sub_details = _excel_text(workouts_df['SubDettagli'])
+        sport_types = _excel_text(workouts_df['TipoSport'])
+        
+        # Ogni riga con un nome inizia un nuovo allenamento (0 = righe prima del primo)
+        starts = names.notna()
+        workout_ids = starts.cumsum()
+        
+        # Righe di passo, di ripetizione e di sottopasso
+        steps_mask = step_types.notna() & step_details.notna()
+        repeat_rows = steps_mask & (step_types.str.lower() == 'repeat')
+        iterations = pd.to_numeric(step_details.where(repeat_rows), errors='coerce')
+        valid_repeats = repeat_rows & iterations.notna() & (iterations == iterations.round())
+        for details in step_details[repeat_rows & ~valid_repeats]:
+            logging.warning(f"Formato non valido per ripetizione: {details}")
+        plain_steps = steps_mask & ~repeat_rows
+        subs_mask = workouts_df['TipoPasso'].isna() & sub_types.notna() & sub_details.notna()
+        
+        # Ultima ripetizione valida dello stesso allenamento per ogni sottopasso
+        positions = pd.Series(range(len(workouts_df)), index=workouts_df.index)
+        owner_repeats = positions.where(valid_repeats).groupby(workout_ids).ffill()
+        
+        # Righe da elaborare (quelle prima del primo allenamento vengono ignorate)
+        relevant = (starts | plain_steps | valid_repeats | subs_mask) & (workout_ids > 0)
+        rows = workouts_df.index[relevant]
         
-        current_workout = None
-        current_steps = []
-        
-        for _, row in workouts_df.iterrows():
-            # Nuova riga di allenamento
-            if pd.notna(row['Nome']) and row['Nome'].strip():
-                # Salva l'allenamento precedente, se esiste
-                if current_workout:
-                    workouts[current_workout] = current_steps
-                
-                # Inizia un nuovo allenamento
-                current_workout = row['Nome'].strip()
+        workouts = {}
+        repeats = {}
+        current_steps = None
+        for (position, start, name, sport_type, date, is_step, is_repeat, step_type, details,
+             count, is_sub, sub_type, sub_detail, owner) in zip(
+                positions[rows], starts[rows], names[rows], sport_types[rows], workouts_df['Data'][rows],
+                plain_steps[rows], valid_repeats[rows], step_types[rows], step_details[rows],
+                iterations[rows], subs_mask[rows], sub_types[rows], sub_details[rows], owner_repeats[rows]):
+            # Nuovo allenamento (un nome ripetuto sostituisce il precedente)
+            if start:
                 current_steps = []
-                
-                # Aggiungi il tipo di sport, se presente
-                if pd.notna(row['TipoSport']):
-                    current_steps.append({"sport_type": row['TipoSport'].strip()})
-                
-                # Aggiungi la data, se presente
-                if pd.notna(row['Data']):
-                    date_str = None
-                    if isinstance(row['Data'], str):
-                        date_str = row['Data'].strip()
-                    elif isinstance(row['Data'], datetime.datetime):
-                        date_str = row['Data'].strftime('%Y-%m-%d')
-                    
-                    if date_str:
-                        current_steps.append({"date": date_str})
+                workouts[name] = current_steps
+                if pd.notna(sport_type):
+                    current_steps.append({"sport_type": sport_type})
+                date_str = _excel_date(date) if pd.notna(date) else None
+                if date_str:
+                    current_steps.append({"date": date_str})
             
-            # Riga di passo normale
-            if pd.notna(row['TipoPasso']) and pd.notna(row['Dettagli']):
-                step_type = row['TipoPasso'].strip()
-                step_details = row['Dettagli'].strip()
-                
-                # Controlla se è un passo di ripetizione
-                if step_type.lower() == 'repeat':
-                    # Formato: numero di ripetizioni
-                    try:
-                        iterations = int(step_details)
-                        repeat_step = {
-                            "repeat": iterations,
-                            "steps": []
-                        }
-                        current_steps.append(repeat_step)
-                    except:
-                        logging.warning(f"Formato non valido per ripetizione: {step_details}")
-                else:
-                    # Aggiungi un passo normale
-                    current_steps.append({step_type: step_details})
+            # Passo di ripetizione o passo normale
+            if is_repeat:
+                repeats[position] = {"repeat": int(count), "steps": []}
+                current_steps.append(repeats[position])
+            elif is_step:
+                current_steps.append({step_type: details})
             
-            # Riga di sottopasso di ripetizione
-            if pd.isna(row['TipoPasso']) and pd.notna(row['SubTipoPasso']) and pd.notna(row['SubDettagli']):
-                sub_type = row['SubTipoPasso'].strip()
-                sub_details = row['SubDettagli'].strip()
-                
-                # Trova l'ultimo passo di ripetizione
-                for i in range(len(current_steps) - 1, -1, -1):
-                    if isinstance(current_steps[i], dict) and "repeat" in current_steps[i]:
-                        current_steps[i]["steps"].append({sub_type: sub_details})
-                        break
-        
-        # Salva l'ultimo allenamento
-        if current_workout:
-            workouts[current_workout] = current_steps
+            # Sottopasso dell'ultima ripetizione dell'allenamento
+            if is_sub and pd.notna(owner):
+                repeats[int(owner)]["steps"].append({sub_type: sub_detail})
         
         # Costruisci il risultato finale
         result = {}
         result.update(workouts)
         
         # Aggiungi la configurazione
-        result['config'] = {
-            'paces': paces,
-            'heart_rates': heart_rates,
-            'power_values': power_values
-        }
+        result['config'] = dict(zone_sheets)
         
         # Aggiungi altri campi di configurazione
         for k, v in config.items():
@@ -560,6 +584,8 @@ def save_excel(data, filename):
         data: Dati da salvare
         filename: Nome del file di destinazione
     """
+    import pandas as pd
+    
     try:
         # Crea un writer Excel
         with pd.ExcelWriter(filename, engine='openpyxl') as writer:
@@ -680,6 +706,8 @@ def create_excel_template(filename):
     Args:
         filename: Nome del file di destinazione
     """
+    import pandas as pd
+    
     try:
         # Crea un writer Excel
         with pd.ExcelWriter(filename, engine='openpyxl') as writer:
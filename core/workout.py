@@ -6,6 +6,8 @@ Definizione delle classi per gli allenamenti supportati dall'applicazione.
 Estende la classe Workout originale per supportare più tipi di sport.
 """
 
+import copy
+
 # Tipi di sport supportati
 SPORT_TYPES = {
     "running": 1,
@@ -51,8 +53,197 @@ TARGET_TYPES = {
     "custom": 7
 }
 
+# Valore non convertibile: l'errore viene sollevato al momento dell'uso
+_UNPARSED = object()
+
+
+def parse_end_condition_value(end_condition, value):
+    """
+    Converte il valore di una condizione di fine nel formato richiesto da Garmin Connect.
+    
+    Args:
+        end_condition: Condizione di fine (chiave da END_CONDITIONS)
+        value: Valore testuale o numerico (es. '10min', '1:30', '2.5km')
+    
+    Returns:
+        int/float/str: Secondi per il tempo, metri per la distanza, altrimenti il valore invariato
+    """
+    # Gestione distanza
+    if end_condition == 'distance':
+        if isinstance(value, str):
+            if "km" in value:
+                return int(float(value.replace("km", "")) * 1000)
+            elif "m" in value:
+                return int(float(value.replace("m", "")))
+        return value
+    
+    # Gestione tempo
+    elif end_condition == 'time':
+        if isinstance(value, str) and ":" in value:
+            parts = value.split(":")
+            if len(parts) == 2:  # mm:ss
+                m, s = [int(x) for x in parts]
+                return m * 60 + s
+            elif len(parts) == 3:  # hh:mm:ss
+                h, m, s = [int(x) for x in parts]
+                return h * 3600 + m * 60 + s
+        elif isinstance(value, str) and "min" in value:
+            return int(float(value.replace("min", "")) * 60)
+        elif isinstance(value, str) and "s" in value:
+            return int(float(value.replace("s", "")))
+        
+    # Default
+    return value
+
+
+# Aggregato non ancora calcolato o da ricalcolare
+_STALE = object()
+
+
+def _tracked_attribute(name, doc):
+    """
+    Crea una proprietà che memorizza il valore in '_<name>' e invalida le cache dell'oggetto.
+    
+    Args:
+        name: Nome pubblico dell'attributo
+        doc: Descrizione dell'attributo
+    
+    Returns:
+        property: Proprietà con getter e setter
+    """
+    slot = '_' + name
+
+    def fget(self):
+        return getattr(self, slot)
+
+    def fset(self, value):
+        setattr(self, slot, value)
+        self._invalidate()
+
+    return property(fget, fset, doc=doc)
+
+
+def _copy_json(value):
+    """
+    Copia una rappresentazione JSON (dizionari e liste annidati).
+    
+    Args:
+        value: Valore da copiare
+    
+    Returns:
+        Copia indipendente del valore
+    """
+    if type(value) is dict:
+        return {key: _copy_json(item) for key, item in value.items()}
+    if type(value) is list:
+        return [_copy_json(item) for item in value]
+    return value
+
+
+def _slot_state(obj, transient):
+    """
+    Restituisce lo stato di un oggetto a slot per copy e pickle, escluse le cache.
+    
+    Args:
+        obj: Oggetto da copiare
+        transient: Nomi degli slot da non copiare (cache e collegamenti al contenitore)
+    
+    Returns:
+        dict: Nome dello slot -> valore
+    """
+    return {name: getattr(obj, name) for name in type(obj).__slots__
+            if name not in transient and hasattr(obj, name)}
+
+
+class StepList(list):
+    """Lista dei passi che avvisa il contenitore (allenamento o ripetizione) a ogni modifica"""
+
+    __slots__ = ('_owner',)
+
+    def __init__(self, owner, steps=()):
+        """
+        Inizializza la lista.
+        
+        Args:
+            owner: Workout o WorkoutStep che contiene i passi
+            steps: Passi iniziali
+        """
+        super().__init__(steps)
+        self._owner = owner
+        for step in self:
+            step._parent = owner
+
+    def _changed(self, added=()):
+        """Collega i passi aggiunti al contenitore e invalida gli aggregati"""
+        for step in added:
+            step._parent = self._owner
+        self._owner._steps_changed()
+
+    def append(self, step):
+        super().append(step)
+        self._changed((step,))
+
+    def insert(self, index, step):
+        super().insert(index, step)
+        self._changed((step,))
+
+    def extend(self, steps):
+        steps = list(steps)
+        super().extend(steps)
+        self._changed(steps)
+
+    def __iadd__(self, steps):
+        self.extend(steps)
+        return self
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(value)
+            super().__setitem__(index, value)
+            self._changed(value)
+        else:
+            super().__setitem__(index, value)
+            self._changed((value,))
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._changed()
+
+    def pop(self, index=-1):
+        step = super().pop(index)
+        self._changed()
+        return step
+
+    def remove(self, step):
+        super().remove(step)
+        self._changed()
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._changed()
+
+    def reverse(self):
+        super().reverse()
+        self._changed()
+
+    def __deepcopy__(self, memo):
+        # Copia solo i passi: il contenitore li ricollega quando riceve la lista
+        return [copy.deepcopy(step, memo) for step in self]
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
 class Workout:
     """Classe che rappresenta un allenamento per qualsiasi tipo di sport"""
+
+    # Attributi dichiarati (niente __dict__ per istanza: librerie grandi occupano meno memoria)
+    __slots__ = ('sport_type', 'workout_name', 'description', '_workout_steps', 'scheduled_date',
+                 '_total_distance', '_total_duration', '_step_count')
     
     def __init__(self, sport_type, name, description=None):
         """
@@ -69,6 +260,34 @@ class Workout:
         self.workout_steps = []
         self.scheduled_date = None
 
+    @property
+    def workout_steps(self):
+        """Passi dell'allenamento"""
+        return self._workout_steps
+
+    @workout_steps.setter
+    def workout_steps(self, steps):
+        self._workout_steps = StepList(self, steps)
+        self._steps_changed()
+
+    def _steps_changed(self):
+        """Invalida gli aggregati dopo una modifica dei passi (anche annidati)"""
+        self._total_distance = _STALE
+        self._total_duration = _STALE
+        self._step_count = _STALE
+
+    def __getstate__(self):
+        # Gli aggregati non vengono copiati: sono ricalcolati sulla copia
+        state = _slot_state(self, ('_workout_steps', '_total_distance', '_total_duration', '_step_count'))
+        state['workout_steps'] = list(self._workout_steps)
+        return state
+
+    def __setstate__(self, state):
+        steps = state.pop('workout_steps')
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.workout_steps = steps
+
     def add_step(self, step):
         """
         Aggiunge un passo all'allenamento.
@@ -88,16 +307,24 @@ class Workout:
         for ws in self.workout_steps:
             ws.dist_to_time()
 
-    def garminconnect_json(self):
+    def garminconnect_json(self, shared=False):
         """
         Genera la rappresentazione JSON per l'API di Garmin Connect.
         
+        Args:
+            shared: Se True, i passi sono le rappresentazioni condivise della cache
+                    (più veloce, solo per la lettura, es. il calcolo dell'impronta)
+        
         Returns:
             dict: Rappresentazione JSON dell'allenamento
         """
         # Verifica che il tipo di sport sia supportato
         if self.sport_type not in SPORT_TYPES:
             raise ValueError(f"Tipo di sport non supportato: {self.sport_type}")
+        
+        steps = [step._cached_json() for step in self.workout_steps]
+        if not shared:
+            steps = _copy_json(steps)
             
         return {
             "sportType": {
@@ -113,7 +340,7 @@ class Workout:
                         "sportTypeId": SPORT_TYPES[self.sport_type],
                         "sportTypeKey": self.sport_type,
                     },
-                    "workoutSteps": [step.garminconnect_json() for step in self.workout_steps],
+                    "workoutSteps": steps,
                 }
             ],
         }
@@ -146,6 +373,12 @@ class Workout:
         Returns:
             float: Distanza totale in metri o None se non calcolabile
         """
+        if self._total_distance is _STALE:
+            self._total_distance = self._compute_total_distance()
+        return self._total_distance
+
+    def _compute_total_distance(self):
+        """Percorre i passi e calcola la distanza totale"""
         total = 0
         has_distance = False
         
@@ -164,6 +397,12 @@ class Workout:
         Returns:
             int: Durata totale in secondi o None se non calcolabile
         """
+        if self._total_duration is _STALE:
+            self._total_duration = self._compute_total_duration()
+        return self._total_duration
+
+    def _compute_total_duration(self):
+        """Percorre i passi e calcola la durata totale"""
         total = 0
         has_duration = False
         
@@ -182,6 +421,12 @@ class Workout:
         Returns:
             int: Numero di passi
         """
+        if self._step_count is _STALE:
+            self._step_count = self._compute_step_count()
+        return self._step_count
+
+    def _compute_step_count(self):
+        """Percorre i passi e conta quelli eseguiti (ripetizioni comprese)"""
         count = 0
         for step in self.workout_steps:
             if step.step_type == 'repeat':
@@ -192,6 +437,12 @@ class Workout:
 
 class WorkoutStep:
     """Classe che rappresenta un passo di un allenamento"""
+
+    # Attributi dichiarati del passo
+    # (_version cambia a ogni modifica; _json contiene la serializzazione della versione indicata)
+    __slots__ = ('_order', '_step_type', '_description', '_end_condition', '_end_condition_value',
+                 '_parsed_value', 'target', '_child_step_id', '_workout_steps', '_parent',
+                 '_version', '_json')
     
     def __init__(
         self,
@@ -213,15 +464,60 @@ class WorkoutStep:
             end_condition_value: Valore per la condizione di fine
             target: Oggetto Target o None se nessun target
         """
-        self.order = order
-        self.step_type = step_type
-        self.description = description
-        self.end_condition = end_condition
-        self.end_condition_value = end_condition_value
+        self._parent = None
+        self._version = 0
+        self._json = None
+        self._order = order
+        self._step_type = step_type
+        self._description = description
+        self._end_condition = end_condition
+        self._end_condition_value = end_condition_value
+        self._update_parsed_value()
         self.target = target or Target()
         self.child_step_id = 1 if self.step_type == 'repeat' else None
         self.workout_steps = []
 
+    order = _tracked_attribute('order', "Ordine del passo nell'allenamento")
+    step_type = _tracked_attribute('step_type', "Tipo di passo (chiave da STEP_TYPES)")
+    description = _tracked_attribute('description', "Descrizione del passo")
+    child_step_id = _tracked_attribute('child_step_id', "Identificativo del gruppo di ripetizione")
+
+    @property
+    def workout_steps(self):
+        """Sotto-passi (per passi di tipo repeat)"""
+        return self._workout_steps
+
+    @workout_steps.setter
+    def workout_steps(self, steps):
+        self._workout_steps = StepList(self, steps)
+        self._invalidate()
+
+    def _steps_changed(self):
+        """Chiamato dalla lista dei sotto-passi a ogni modifica"""
+        self._invalidate()
+
+    def _invalidate(self):
+        """Invalida la serializzazione e segnala la modifica al contenitore, fino all'allenamento"""
+        self._version += 1
+        if self._parent is not None:
+            self._parent._steps_changed()
+
+    def __getstate__(self):
+        # Cache e contenitore non vengono copiati: la copia è un passo a sé
+        state = _slot_state(self, ('_workout_steps', '_parsed_value', '_parent', '_version', '_json'))
+        state['workout_steps'] = list(self._workout_steps)
+        return state
+
+    def __setstate__(self, state):
+        steps = state.pop('workout_steps')
+        self._parent = None
+        self._version = 0
+        self._json = None
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.workout_steps = steps
+        self._update_parsed_value()
+
     def add_step(self, step):
         """
         Aggiunge un sotto-passo (per passi di tipo repeat).
@@ -251,39 +547,47 @@ class WorkoutStep:
         else:
             return None
 
+    @property
+    def end_condition(self):
+        """Condizione di fine (chiave da END_CONDITIONS)"""
+        return self._end_condition
+
+    @end_condition.setter
+    def end_condition(self, value):
+        self._end_condition = value
+        self._update_parsed_value()
+
+    @property
+    def end_condition_value(self):
+        """Valore originale della condizione di fine, usato per la visualizzazione"""
+        return self._end_condition_value
+
+    @end_condition_value.setter
+    def end_condition_value(self, value):
+        self._end_condition_value = value
+        self._update_parsed_value()
+
+    def _update_parsed_value(self):
+        """
+        Converte una sola volta il valore della condizione di fine in secondi o metri.
+        Se il valore non è valido l'errore viene sollevato al primo utilizzo, come in precedenza.
+        """
+        try:
+            self._parsed_value = parse_end_condition_value(self._end_condition, self._end_condition_value)
+        except (ValueError, TypeError):
+            self._parsed_value = _UNPARSED
+        self._invalidate()
+
     def parsed_end_condition_value(self):
         """
-        Analizza e converte il valore della condizione di fine nel formato richiesto.
+        Restituisce il valore della condizione di fine nel formato richiesto.
         
         Returns:
-            int/float/str: Valore convertito
+            int/float/str: Valore convertito (secondi per il tempo, metri per la distanza)
         """
-        # Gestione distanza
-        if self.end_condition == 'distance':
-            if isinstance(self.end_condition_value, str):
-                if "km" in self.end_condition_value:
-                    return int(float(self.end_condition_value.replace("km", "")) * 1000)
-                elif "m" in self.end_condition_value:
-                    return int(float(self.end_condition_value.replace("m", "")))
-            return self.end_condition_value
-        
-        # Gestione tempo
-        elif self.end_condition == 'time':
-            if isinstance(self.end_condition_value, str) and ":" in self.end_condition_value:
-                parts = self.end_condition_value.split(":")
-                if len(parts) == 2:  # mm:ss
-                    m, s = [int(x) for x in parts]
-                    return m * 60 + s
-                elif len(parts) == 3:  # hh:mm:ss
-                    h, m, s = [int(x) for x in parts]
-                    return h * 3600 + m * 60 + s
-            elif isinstance(self.end_condition_value, str) and "min" in self.end_condition_value:
-                return int(float(self.end_condition_value.replace("min", "")) * 60)
-            elif isinstance(self.end_condition_value, str) and "s" in self.end_condition_value:
-                return int(float(self.end_condition_value.replace("s", "")))
-            
-        # Default
-        return self.end_condition_value
+        if self._parsed_value is _UNPARSED:
+            return parse_end_condition_value(self._end_condition, self._end_condition_value)
+        return self._parsed_value
 
     def dist_to_time(self):
         """
@@ -309,9 +613,30 @@ class WorkoutStep:
         """
         Genera la rappresentazione JSON per l'API di Garmin Connect.
         
+        Returns:
+            dict: Rappresentazione JSON del passo (copia modificabile)
+        """
+        return _copy_json(self._cached_json())
+
+    def _cached_json(self):
+        """
+        Restituisce la rappresentazione JSON condivisa, riutilizzata finché il passo,
+        il suo target e i sotto-passi non cambiano: non va modificata.
+        
         Returns:
             dict: Rappresentazione JSON del passo
         """
+        # La versione va letta prima dello stato: una modifica concorrente rende la cache obsoleta
+        version = self._version
+        target_json = self.target._cached_json() if self.step_type != 'repeat' else None
+        children = [step._cached_json() for step in self.workout_steps]
+
+        cached = self._json
+        if (cached is not None and cached[0] == version and cached[1] is target_json
+                and len(cached[2]) == len(children)
+                and all(old is new for old, new in zip(cached[2], children))):
+            return cached[3]
+
         base_json = {
             "type": 'RepeatGroupDTO' if self.step_type == 'repeat' else 'ExecutableStepDTO',
             "stepId": None,
@@ -329,8 +654,8 @@ class WorkoutStep:
         }
 
         # Aggiungi i sotto-passi per le ripetizioni
-        if len(self.workout_steps) > 0:
-            base_json["workoutSteps"] = [step.garminconnect_json() for step in self.workout_steps]
+        if len(children) > 0:
+            base_json["workoutSteps"] = children
 
         # Gestione specifica per i passi di tipo repeat
         if self.step_type == 'repeat':
@@ -343,9 +668,10 @@ class WorkoutStep:
                 "preferredEndConditionUnit": self.end_condition_unit(),
                 "endConditionCompare": None,
                 "endConditionZone": None,
-                **self.target.garminconnect_json(),
+                **target_json,
             })
-            
+
+        self._json = (version, target_json, children, base_json)
         return base_json
     
     def get_distance(self):
@@ -422,6 +748,9 @@ class WorkoutStep:
 
 class Target:
     """Classe che rappresenta un target per un passo di allenamento"""
+
+    # Attributi dichiarati del target (zone_name è il nome della zona scelta nell'editor)
+    __slots__ = ('_target', '_to_value', '_from_value', '_zone', 'zone_name', '_version', '_json')
     
     def __init__(self, target="no.target", to_value=None, from_value=None, zone=None):
         """
@@ -433,20 +762,55 @@ class Target:
             from_value: Valore inferiore del target
             zone: Numero di zona (se applicabile)
         """
-        self.target = target
-        self.to_value = to_value
-        self.from_value = from_value
-        self.zone = zone
+        self._version = 0
+        self._json = None
+        self._target = target
+        self._to_value = to_value
+        self._from_value = from_value
+        self._zone = zone
         self.zone_name = None
 
+    target = _tracked_attribute('target', "Tipo di target (chiave da TARGET_TYPES)")
+    to_value = _tracked_attribute('to_value', "Valore superiore del target")
+    from_value = _tracked_attribute('from_value', "Valore inferiore del target")
+    zone = _tracked_attribute('zone', "Numero di zona (se applicabile)")
+
+    def _invalidate(self):
+        """Invalida la serializzazione del target"""
+        self._version += 1
+
+    def __getstate__(self):
+        return _slot_state(self, ('_version', '_json'))
+
+    def __setstate__(self, state):
+        self._version = 0
+        self._json = None
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def garminconnect_json(self):
         """
         Genera la rappresentazione JSON per l'API di Garmin Connect.
         
+        Returns:
+            dict: Rappresentazione JSON del target (copia modificabile)
+        """
+        return _copy_json(self._cached_json())
+
+    def _cached_json(self):
+        """
+        Restituisce la rappresentazione JSON condivisa, riutilizzata finché il target
+        non cambia: non va modificata.
+        
         Returns:
             dict: Rappresentazione JSON del target
         """
-        return {
+        version = self._version
+        cached = self._json
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        target_json = {
             "targetType": {
                 "workoutTargetTypeId": TARGET_TYPES[self.target],
                 "workoutTargetTypeKey": self.target,
@@ -455,6 +819,8 @@ class Target:
             "targetValueTwo": self.from_value,
             "zoneNumber": self.zone,
         }
+        self._json = (version, target_json)
+        return target_json
     
     def format_target(self):
         """
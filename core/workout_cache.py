@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Cache su disco dei dettagli degli allenamenti scaricati da Garmin Connect.
+Ogni allenamento è salvato in un file JSON insieme alla sua data di ultima
+modifica (updateDate), così da riscaricarlo solo quando cambia su Garmin Connect.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+
+
+class WorkoutCache:
+    """Archivio JSON dei dettagli degli allenamenti, indicizzato per workoutId"""
+
+    def __init__(self, cache_folder):
+        """
+        Inizializza la cache.
+
+        Args:
+            cache_folder: Cartella in cui memorizzare i file della cache
+        """
+        self.cache_folder = cache_folder
+        os.makedirs(self.cache_folder, exist_ok=True)
+
+    def _path(self, workout_id):
+        return os.path.join(self.cache_folder, f"{workout_id}.json")
+
+    def get(self, workout_id, update_date):
+        """
+        Restituisce i dettagli di un allenamento se sono ancora aggiornati.
+
+        Args:
+            workout_id: ID dell'allenamento
+            update_date: Data di ultima modifica riportata da list_workouts
+
+        Returns:
+            dict: Dettagli dell'allenamento o None se assenti o non aggiornati
+        """
+        if update_date is None:
+            return None
+
+        try:
+            with open(self._path(workout_id), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f"Voce di cache non valida per l'allenamento {workout_id}: {str(e)}")
+            return None
+
+        if entry.get("updateDate") != update_date:
+            return None
+
+        return entry.get("workout")
+
+    def put(self, workout_id, update_date, workout):
+        """
+        Memorizza i dettagli di un allenamento.
+
+        Args:
+            workout_id: ID dell'allenamento
+            update_date: Data di ultima modifica dell'allenamento
+            workout: Dettagli dell'allenamento restituiti da get_workout
+        """
+        if update_date is None:
+            return
+
+        path = self._path(workout_id)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"updateDate": update_date, "workout": workout}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logging.warning(f"Impossibile salvare l'allenamento {workout_id} nella cache: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def invalidate(self, workout_id):
+        """
+        Rimuove un allenamento dalla cache.
+
+        Args:
+            workout_id: ID dell'allenamento
+        """
+        try:
+            os.remove(self._path(workout_id))
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        """Svuota completamente la cache."""
+        shutil.rmtree(self.cache_folder, ignore_errors=True)
+        os.makedirs(self.cache_folder, exist_ok=True)
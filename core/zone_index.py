@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Indice inverso dalle zone di allenamento ai passi che le usano.
+Dopo una modifica delle zone permette di aggiornare e ricaricare solo gli
+allenamenti interessati, invece dell'intero piano.
+"""
+
+from core.zones import ZONE_TARGET_TYPES
+
+
+def changed_zones(old_zones, new_zones):
+    """
+    Confronta due configurazioni compilate e restituisce le zone con valori diversi.
+
+    Args:
+        old_zones: ZoneTables della configurazione precedente
+        new_zones: ZoneTables della nuova configurazione
+
+    Returns:
+        set: Coppie (tipo di target, nome della zona) modificate, aggiunte o rimosse
+    """
+    changed = set()
+    if old_zones.config_hash == new_zones.config_hash:
+        return changed
+
+    for target_type in ZONE_TARGET_TYPES:
+        old_table = old_zones.tables.get(target_type, {})
+        new_table = new_zones.tables.get(target_type, {})
+        for name in set(old_table) | set(new_table):
+            if old_table.get(name) != new_table.get(name):
+                changed.add((target_type, name))
+
+    # I ritmi del nuoto usano il target di ritmo
+    for name in set(old_zones.swim_paces) | set(new_zones.swim_paces):
+        if old_zones.swim_paces.get(name) != new_zones.swim_paces.get(name):
+            changed.add(('pace.zone', name))
+
+    return changed
+
+
+def _iter_steps(steps):
+    """Restituisce tutti i passi, compresi i sotto-passi delle ripetizioni"""
+    for step in steps:
+        yield step
+        if step.workout_steps:
+            yield from _iter_steps(step.workout_steps)
+
+
+class ZoneIndex:
+    """Indice (tipo di target, zona) -> passi degli allenamenti che la usano"""
+
+    def __init__(self, workouts=()):
+        """
+        Costruisce l'indice.
+
+        Args:
+            workouts: Allenamenti da indicizzare
+        """
+        self._steps = {}
+        for workout in workouts:
+            self.add_workout(workout)
+
+    def add_workout(self, workout):
+        """
+        Aggiunge all'indice i passi di un allenamento con un target a zona.
+
+        Args:
+            workout: Oggetto Workout
+        """
+        for step in _iter_steps(workout.workout_steps):
+            target = step.target
+            if target.zone_name and target.target in ZONE_TARGET_TYPES:
+                self._steps.setdefault((target.target, target.zone_name), []).append((workout, step))
+
+    def zones(self):
+        """
+        Restituisce le zone usate dagli allenamenti indicizzati.
+
+        Returns:
+            list: Coppie (tipo di target, nome della zona)
+        """
+        return list(self._steps)
+
+    def steps_for(self, target_type, zone):
+        """
+        Restituisce i passi che usano una zona.
+
+        Args:
+            target_type: Tipo di target (pace.zone, heart.rate.zone, power.zone)
+            zone: Nome della zona
+
+        Returns:
+            list: Coppie (allenamento, passo)
+        """
+        return list(self._steps.get((target_type, zone), ()))
+
+    def workouts_for(self, zones):
+        """
+        Restituisce gli allenamenti che usano almeno una delle zone indicate.
+
+        Args:
+            zones: Coppie (tipo di target, nome della zona)
+
+        Returns:
+            list: Allenamenti, senza duplicati
+        """
+        workouts = {}
+        for key in zones:
+            for workout, _ in self._steps.get(key, ()):
+                workouts[workout] = True
+        return list(workouts)
+
+    def retarget(self, zones, tables):
+        """
+        Ricalcola i target dei passi che usano le zone indicate.
+
+        Args:
+            zones: Coppie (tipo di target, nome della zona) da aggiornare
+            tables: ZoneTables della nuova configurazione
+
+        Returns:
+            list: Allenamenti i cui target sono effettivamente cambiati
+        """
+        updated = {}
+        for key in zones:
+            for workout, step in self._steps.get(key, ()):
+                target = step.target
+                values = tables.resolve(target.target, target.zone_name, workout.sport_type)
+                if values is None:
+                    # Zona rimossa: mantieni i valori attuali
+                    continue
+                if (target.to_value, target.from_value) != values:
+                    target.to_value, target.from_value = values
+                    updated[workout] = True
+        return list(updated)
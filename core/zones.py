@@ -0,0 +1,303 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Compilazione delle zone di allenamento (workout_config) in tabelle numeriche.
+Le tabelle vengono costruite una sola volta per ogni configurazione e
+permettono di risolvere il target di un passo ('@ Z2', '@hr Z1_HR',
+'@pwr sweet_spot') con una semplice ricerca.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+
+from core.workout import Target
+
+# Tipi di target risolti con le zone della configurazione
+ZONE_TARGET_TYPES = ('pace.zone', 'heart.rate.zone', 'power.zone')
+
+# Margini predefiniti (come nella scheda Zone)
+DEFAULT_MARGINS = {
+    'faster': '0:03',
+    'slower': '0:03',
+    'hr_up': 5,
+    'hr_down': 5,
+    'power_up': 10,
+    'power_down': 10,
+}
+
+# Valori (to_value, from_value) usati quando la zona non è definita
+FALLBACK_RANGES = {
+    'pace.zone': (4.2, 3.8),
+    'heart.rate.zone': (160, 140),
+    'power.zone': (250, 200),
+}
+
+# Limite superiore delle zone di potenza aperte (es. "375+")
+OPEN_POWER_LIMIT = 2000
+
+# Tipo di sport che usa i ritmi per 100 m (swim_paces), se configurati
+SWIM_SPORT = 'swimming'
+
+# Numero massimo di configurazioni compilate conservate
+ZONE_CACHE_SIZE = 8
+
+# Formati delle zone
+RANGE_PATTERN = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*-\s*(\d+(?:\.\d+)?)\s*$')
+PERCENT_PATTERN = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*%?\s*-\s*(\d+(?:\.\d+)?)\s*%\s*(\w+)\s*$')
+OPEN_UPPER_PATTERN = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*\+\s*$')
+OPEN_LOWER_PATTERN = re.compile(r'^\s*<\s*(\d+(?:\.\d+)?)\s*$')
+PACE_PATTERN = re.compile(r'^\s*(\d{1,2}:\d{1,2}(?::\d{1,2})?)\s*(?:-\s*(\d{1,2}:\d{1,2}(?::\d{1,2})?))?\s*$')
+
+# Configurazioni compilate, indicizzate per hash
+_compiled = {}
+_compiled_lock = threading.Lock()
+
+
+def config_hash(workout_config):
+    """
+    Calcola un hash stabile delle sezioni di workout_config che definiscono le zone.
+
+    Args:
+        workout_config: Configurazione degli allenamenti
+
+    Returns:
+        str: Hash esadecimale
+    """
+    workout_config = workout_config or {}
+    relevant = {key: workout_config.get(key) for key in
+                ('paces', 'swim_paces', 'heart_rates', 'power_values', 'margins')}
+    canonical = json.dumps(relevant, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _number(value):
+    """Converte un valore numerico testuale in int (se intero) o float"""
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+def _seconds(value):
+    """Converte 'mm:ss' o 'hh:mm:ss' (o un numero di secondi) in secondi"""
+    if isinstance(value, (int, float)):
+        return value
+    total = 0
+    for part in str(value).strip().split(':'):
+        total = total * 60 + int(part)
+    return total
+
+
+def _margin(margins, name, converter):
+    """
+    Legge un margine della configurazione, con il valore predefinito se assente o non valido.
+
+    Args:
+        margins: Sezione 'margins' di workout_config
+        name: Nome del margine
+        converter: Funzione di conversione (int o _seconds)
+
+    Returns:
+        int: Valore del margine
+    """
+    try:
+        return converter(margins.get(name, DEFAULT_MARGINS[name]))
+    except (TypeError, ValueError):
+        return converter(DEFAULT_MARGINS[name])
+
+
+def _range_values(value, references, up, down):
+    """
+    Converte un valore di FC o potenza nell'intervallo (to_value, from_value).
+
+    Args:
+        value: Valore della zona ("130-150", "62-76% max_hr", "250", "375+", "<125")
+        references: Valori di riferimento per le percentuali (es. max_hr, ftp)
+        up: Margine superiore per i valori singoli
+        down: Margine inferiore per i valori singoli
+
+    Returns:
+        tuple: (to_value, from_value)
+
+    Raises:
+        ValueError: Se il valore non è in un formato riconosciuto
+    """
+    text = str(value)
+
+    match = RANGE_PATTERN.match(text)
+    if match:
+        return _number(match.group(2)), _number(match.group(1))
+
+    match = PERCENT_PATTERN.match(text)
+    if match:
+        reference = int(float(references[match.group(3)]))
+        return (reference * int(float(match.group(2))) // 100,
+                reference * int(float(match.group(1))) // 100)
+
+    match = OPEN_UPPER_PATTERN.match(text)
+    if match:
+        return OPEN_POWER_LIMIT, _number(match.group(1))
+
+    match = OPEN_LOWER_PATTERN.match(text)
+    if match:
+        return _number(match.group(1)), 0
+
+    single = _number(text)
+    return single + up, single - down
+
+
+def _pace_values(value, distance, faster, slower):
+    """
+    Converte un ritmo nell'intervallo di velocità (to_value, from_value) in m/s.
+
+    Args:
+        value: Ritmo ("5:00") o intervallo di ritmi ("5:10-4:50")
+        distance: Distanza a cui si riferisce il ritmo in metri (1000 o 100)
+        faster: Secondi da togliere al ritmo singolo per il limite veloce
+        slower: Secondi da aggiungere al ritmo singolo per il limite lento
+
+    Returns:
+        tuple: (to_value, from_value)
+
+    Raises:
+        ValueError: Se il ritmo non è in un formato riconosciuto
+    """
+    match = PACE_PATTERN.match(str(value))
+    if not match:
+        raise ValueError(f"Formato ritmo non valido: {value}")
+
+    if match.group(2):
+        paces = sorted((_seconds(match.group(1)), _seconds(match.group(2))))
+        fast_s, slow_s = paces
+    else:
+        base_s = _seconds(match.group(1))
+        fast_s, slow_s = base_s - faster, base_s + slower
+        if fast_s <= 0:
+            fast_s = base_s / 1.1
+        if slow_s <= 0:
+            slow_s = base_s / 0.9
+
+    return distance / fast_s, distance / slow_s
+
+
+class ZoneTables:
+    """Tabelle numeriche delle zone, compilate da workout_config"""
+
+    def __init__(self, workout_config, key=None):
+        """
+        Compila le zone della configurazione.
+
+        Args:
+            workout_config: Configurazione degli allenamenti (paces, heart_rates, power_values, margins)
+            key: Hash della configurazione, se già calcolato
+        """
+        workout_config = workout_config or {}
+        self.config_hash = key or config_hash(workout_config)
+
+        margins = workout_config.get('margins') or {}
+        faster = _margin(margins, 'faster', _seconds)
+        slower = _margin(margins, 'slower', _seconds)
+
+        heart_rates = workout_config.get('heart_rates') or {}
+        power_values = workout_config.get('power_values') or {}
+        references = {}
+        for name, value in list(heart_rates.items()) + list(power_values.items()):
+            try:
+                references[name] = _number(value)
+            except (TypeError, ValueError):
+                pass
+
+        self.tables = {
+            'pace.zone': self._compile(workout_config.get('paces'), _pace_values, 1000, faster, slower),
+            'heart.rate.zone': self._compile(heart_rates, _range_values, references,
+                                             _margin(margins, 'hr_up', int), _margin(margins, 'hr_down', int)),
+            'power.zone': self._compile(power_values, _range_values, references,
+                                        _margin(margins, 'power_up', int), _margin(margins, 'power_down', int)),
+        }
+        self.swim_paces = self._compile(workout_config.get('swim_paces'), _pace_values, 100, faster, slower)
+
+    @staticmethod
+    def _compile(zones, converter, *args):
+        """
+        Converte ogni zona di una sezione, ignorando quelle non valide.
+
+        Args:
+            zones: Dizionario nome -> valore
+            converter: Funzione di conversione (valore, *args) -> (to_value, from_value)
+            *args: Argomenti aggiuntivi per la conversione
+
+        Returns:
+            dict: Nome della zona -> (to_value, from_value)
+        """
+        table = {}
+        for name, value in (zones or {}).items():
+            try:
+                table[name] = converter(value, *args)
+            except (TypeError, ValueError, KeyError, ZeroDivisionError) as e:
+                logging.debug(f"Zona '{name}' non convertibile ({value}): {str(e)}")
+        return table
+
+    def resolve(self, target_type, zone, sport_type=None):
+        """
+        Restituisce i valori numerici di una zona.
+
+        Args:
+            target_type: Tipo di target (pace.zone, heart.rate.zone, power.zone)
+            zone: Nome della zona (es. 'Z2', 'Z1_HR', 'sweet_spot')
+            sport_type: Tipo di sport (per il nuoto vengono usati i ritmi per 100 m)
+
+        Returns:
+            tuple: (to_value, from_value) o None se la zona non è definita
+        """
+        if target_type == 'pace.zone' and sport_type == SWIM_SPORT and zone in self.swim_paces:
+            return self.swim_paces[zone]
+        return self.tables.get(target_type, {}).get(zone)
+
+    def has_zone(self, target_type, zone, sport_type=None):
+        """True se la zona è definita nella configurazione"""
+        return self.resolve(target_type, zone, sport_type) is not None
+
+    def target(self, target_type, zone, sport_type=None):
+        """
+        Crea il Target di un passo, con i valori di riserva se la zona non è definita.
+
+        Args:
+            target_type: Tipo di target
+            zone: Nome della zona
+            sport_type: Tipo di sport
+
+        Returns:
+            Target: Target con i valori della zona e zone_name impostato
+        """
+        values = self.resolve(target_type, zone, sport_type)
+        if values is None:
+            values = FALLBACK_RANGES.get(target_type)
+        if values is None:
+            target = Target(target_type)
+        else:
+            target = Target(target_type, values[0], values[1])
+        target.zone_name = zone
+        return target
+
+
+def compile_zones(workout_config):
+    """
+    Restituisce le tabelle compilate di una configurazione, riusandole se già calcolate.
+
+    Args:
+        workout_config: Configurazione degli allenamenti
+
+    Returns:
+        ZoneTables: Tabelle delle zone
+    """
+    key = config_hash(workout_config)
+    with _compiled_lock:
+        tables = _compiled.get(key)
+        if tables is None:
+            tables = ZoneTables(workout_config, key)
+            if len(_compiled) >= ZONE_CACHE_SIZE:
+                _compiled.pop(next(iter(_compiled)))
+            _compiled[key] = tables
+    return tables
@@ -14,10 +14,12 @@ import os
 from gui.styles import setup_styles
 from gui.login_frame import LoginFrame
 from gui.workouts_frame import WorkoutsFrame
-from gui.import_export_frame import ImportExportFrame
-from gui.zones_frame import ZonesFrame  # Importa la nuova classe
 from core.utils import load_config, save_config
 
+# Indici delle tab costruite solo alla prima selezione
+ZONES_TAB = 2
+IMPORT_EXPORT_TAB = 3
+
 class GarminTrainerApp:
     """Classe principale dell'applicazione Garmin Trainer."""
     
@@ -72,13 +74,14 @@ class GarminTrainerApp:
         self.workouts_frame = WorkoutsFrame(self.notebook, self)
         self.notebook.add(self.workouts_frame, text="Allenamenti")
         
-        # Tab Zone - Aggiungi questa nuova tab
-        self.zones_frame = ZonesFrame(self.notebook, self)
-        self.notebook.add(self.zones_frame, text="Zone")
-        
-        # Tab Import/Export
-        self.import_export_frame = ImportExportFrame(self.notebook, self)
-        self.notebook.add(self.import_export_frame, text="Import/Export")
+        # Tab Zone e Import/Export: contenitori vuoti, riempiti alla prima
+        # selezione (zones_frame e import_export_frame esistono solo da allora)
+        self.lazy_tabs = {
+            ZONES_TAB: ttk.Frame(self.notebook),
+            IMPORT_EXPORT_TAB: ttk.Frame(self.notebook),
+        }
+        self.notebook.add(self.lazy_tabs[ZONES_TAB], text="Zone")
+        self.notebook.add(self.lazy_tabs[IMPORT_EXPORT_TAB], text="Import/Export")
         
         # Disabilita le tab che richiedono il login
         self.update_tab_state()
@@ -99,6 +102,35 @@ class GarminTrainerApp:
         # Binding per gli eventi
         self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
     
+    def build_tab(self, tab_index):
+        """
+        Costruisce il contenuto di una tab alla prima selezione.
+        
+        Args:
+            tab_index: Indice della tab (ZONES_TAB o IMPORT_EXPORT_TAB)
+            
+        Returns:
+            bool: True se la tab è stata costruita ora
+        """
+        container = self.lazy_tabs.pop(tab_index, None)
+        if container is None:
+            return False
+        
+        if tab_index == ZONES_TAB:
+            from gui.zones_frame import ZonesFrame
+            self.zones_frame = ZonesFrame(container, self)
+            self.zones_frame.pack(fill=tk.BOTH, expand=True)
+        elif tab_index == IMPORT_EXPORT_TAB:
+            from gui.import_export_frame import ImportExportFrame
+            self.import_export_frame = ImportExportFrame(container, self)
+            self.import_export_frame.pack(fill=tk.BOTH, expand=True)
+            
+            # Passa il client se il login è già stato effettuato
+            if self.garmin_client and self.garmin_client.is_logged_in():
+                self.import_export_frame.on_login(self.garmin_client)
+        
+        return True
+    
     def on_tab_changed(self, event):
         """
         Gestisce il cambio di tab.
@@ -113,10 +145,12 @@ class GarminTrainerApp:
         if tab_index == 1:  # Tab Allenamenti
             if self.garmin_client and self.garmin_client.is_logged_in():
                 self.workouts_frame.refresh_data()
-        elif tab_index == 2:  # Tab Zone
-            self.zones_frame.refresh_data()
-        elif tab_index == 3:  # Tab Import/Export
-            self.import_export_frame.refresh_data()
+        elif tab_index == ZONES_TAB:
+            if not self.build_tab(tab_index):
+                self.zones_frame.refresh_data()
+        elif tab_index == IMPORT_EXPORT_TAB:
+            if not self.build_tab(tab_index):
+                self.import_export_frame.refresh_data()
     
     def update_tab_state(self):
         """Aggiorna lo stato delle tab in base allo stato del login."""
@@ -149,7 +183,8 @@ class GarminTrainerApp:
         
         # Passa il client alle altre frame
         self.workouts_frame.on_login(client)
-        self.import_export_frame.on_login(client)
+        if hasattr(self, 'import_export_frame'):
+            self.import_export_frame.on_login(client)
     
     def set_status(self, message):
         """
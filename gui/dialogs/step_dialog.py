@@ -7,9 +7,8 @@ Dialog per la creazione e modifica di passi dell'allenamento.
 
 import tkinter as tk
 from tkinter import ttk
-import re
 
-from core.workout import STEP_TYPES
+from core.step_parser import parse_step
 
 
 class StepDialog:
@@ -233,13 +232,7 @@ class StepDialog:
         Returns:
             str: Descrizione
         """
-        if not self.step_detail:
-            return ""
-                
-        if ' -- ' in self.step_detail:
-            return self.step_detail.split(' -- ')[1].strip()
-                
-        return ""
+        return parse_step(self.step_detail).description
 
     def on_save(self):
         """Salva le modifiche al passo."""
@@ -427,23 +420,7 @@ class StepDialog:
         Returns:
             str: Tipo di target
         """
-        if not self.step_detail:
-            return "no.target"
-            
-        detail = self.step_detail
-        
-        if ' @ ' in detail:
-            return "pace.zone"
-        elif ' @spd ' in detail:
-            return "speed.zone"
-        elif ' @hr ' in detail:
-            return "heart.rate.zone"
-        elif ' @pwr ' in detail:
-            return "power.zone"
-        elif ' @cad ' in detail:
-            return "cadence.zone"
-        
-        return "no.target"
+        return parse_step(self.step_detail).target_type
 
     def on_step_type_change(self, event=None):
         """
@@ -550,36 +527,8 @@ class StepDialog:
         Returns:
             str: Condizione di fine
         """
-        if not self.step_detail:
-            return "lap.button"
-            
-        # Rimuovi eventuali parti dopo " -- " (descrizione)
-        detail = self.step_detail
-        if ' -- ' in detail:
-            detail = detail.split(' -- ')[0]
-        
-        # Rimuovi le parti di target
-        if ' @ ' in detail:
-            detail = detail.split(' @ ')[0]
-        elif ' @spd ' in detail:
-            detail = detail.split(' @spd ')[0]
-        elif ' @hr ' in detail:
-            detail = detail.split(' @hr ')[0]
-        elif ' @pwr ' in detail:
-            detail = detail.split(' @pwr ')[0]
-        
-        # Estrai la condizione di fine
-        detail = detail.strip()
-        
-        if detail == "lap-button":
-            return "lap.button"
-        elif 'min' in detail or ':' in detail:
-            return "time"
-        elif 'km' in detail or 'm' in detail and 'min' not in detail:
-            return "distance"
-        
-        return "lap.button"
-    
+        return parse_step(self.step_detail).end_condition
+
     def get_end_value(self):
         """
         Estrae il valore della condizione di fine dal dettaglio del passo.
@@ -587,38 +536,8 @@ class StepDialog:
         Returns:
             str: Valore della condizione di fine
         """
-        if not self.step_detail:
-            return ""
-            
-        # Rimuovi eventuali parti dopo " -- " (descrizione)
-        detail = self.step_detail
-        if ' -- ' in detail:
-            detail = detail.split(' -- ')[0]
-        
-        # Rimuovi le parti di target
-        if ' @ ' in detail:
-            detail = detail.split(' @ ')[0]
-        elif ' @spd ' in detail:
-            detail = detail.split(' @spd ')[0]
-        elif ' @hr ' in detail:
-            detail = detail.split(' @hr ')[0]
-        elif ' @pwr ' in detail:
-            detail = detail.split(' @pwr ')[0]
-        
-        # Estrai il valore
-        detail = detail.strip()
-        
-        # Per distanza
-        if 'km' in detail or 'm' in detail and 'min' not in detail:
-            return detail
-        # Per tempo
-        elif 'min' in detail:
-            return detail
-        elif ':' in detail:
-            return detail
-        
-        return ""
-        
+        return parse_step(self.step_detail).end_value or ""
+
     def get_target_value(self):
         """
         Estrae il valore del target dal dettaglio del passo.
@@ -626,58 +545,8 @@ class StepDialog:
         Returns:
             str: Valore del target
         """
-        if not self.step_detail:
-            return ""
-            
-        detail = self.step_detail
-        
-        if ' @ ' in detail:
-            parts = detail.split(' @ ')
-            if len(parts) >= 2:
-                # Rimuovi la descrizione, se presente
-                target_value = parts[1]
-                if ' -- ' in target_value:
-                    target_value = target_value.split(' -- ')[0]
-                return target_value.strip()
-        
-        elif ' @spd ' in detail:
-            parts = detail.split(' @spd ')
-            if len(parts) >= 2:
-                # Rimuovi la descrizione, se presente
-                target_value = parts[1]
-                if ' -- ' in target_value:
-                    target_value = target_value.split(' -- ')[0]
-                return target_value.strip()
-        
-        elif ' @hr ' in detail:
-            parts = detail.split(' @hr ')
-            if len(parts) >= 2:
-                # Rimuovi la descrizione, se presente
-                target_value = parts[1]
-                if ' -- ' in target_value:
-                    target_value = target_value.split(' -- ')[0]
-                return target_value.strip()
-        
-        elif ' @pwr ' in detail:
-            parts = detail.split(' @pwr ')
-            if len(parts) >= 2:
-                # Rimuovi la descrizione, se presente
-                target_value = parts[1]
-                if ' -- ' in target_value:
-                    target_value = target_value.split(' -- ')[0]
-                return target_value.strip()
-        
-        elif ' @cad ' in detail:
-            parts = detail.split(' @cad ')
-            if len(parts) >= 2:
-                # Rimuovi la descrizione, se presente
-                target_value = parts[1]
-                if ' -- ' in target_value:
-                    target_value = target_value.split(' -- ')[0]
-                return target_value.strip()
-        
-        return ""
-        
+        return parse_step(self.step_detail).zone or ""
+
     def update_preview(self):
         """Aggiorna l'anteprima del passo."""
         try:
@@ -14,7 +14,7 @@ import json
 import datetime
 
 from core.utils import load_yaml, save_yaml, load_excel, save_excel, create_excel_template
-from core.workout import Workout, WorkoutStep, Target
+from core.plan_import import workouts_from_plan
 
 class ImportExportFrame(ttk.Frame):
     """Frame per l'importazione e l'esportazione degli allenamenti."""
@@ -457,35 +457,8 @@ class ImportExportFrame(ttk.Frame):
             # Carica il file YAML
             data = load_yaml(yaml_path)
             
-            # Estrai gli allenamenti e la configurazione
-            config = data.pop('config', {})
-            workouts = []
-            
-            # Converti in oggetti Workout
-            for name, steps in data.items():
-                # Estrai il tipo di sport dagli step
-                sport_type = "running"  # Default
-                date = None
-                
-                for step in steps:
-                    if isinstance(step, dict):
-                        if 'sport_type' in step:
-                            sport_type = step['sport_type']
-                        elif 'date' in step:
-                            date = step['date']
-                
-                # Crea l'allenamento
-                workout = Workout(sport_type, name)
-                
-                # Imposta la data
-                if date:
-                    workout.set_scheduled_date(date)
-                
-                # Converti i passi
-                self._convert_steps_to_workout(workout, steps)
-                
-                # Aggiungi l'allenamento alla lista
-                workouts.append(workout)
+            # Converti in oggetti Workout, separando la configurazione
+            workouts, config = workouts_from_plan(data, self.controller.config.get('workout_config'))
             
             # Salva la configurazione
             if config:
@@ -602,35 +575,8 @@ class ImportExportFrame(ttk.Frame):
             # Carica il file Excel
             data = load_excel(excel_path)
             
-            # Estrai gli allenamenti e la configurazione
-            config = data.pop('config', {})
-            workouts = []
-            
-            # Converti in oggetti Workout
-            for name, steps in data.items():
-                # Estrai il tipo di sport dagli step
-                sport_type = "running"  # Default
-                date = None
-                
-                for step in steps:
-                    if isinstance(step, dict):
-                        if 'sport_type' in step:
-                            sport_type = step['sport_type']
-                        elif 'date' in step:
-                            date = step['date']
-                
-                # Crea l'allenamento
-                workout = Workout(sport_type, name)
-                
-                # Imposta la data
-                if date:
-                    workout.set_scheduled_date(date)
-                
-                # Converti i passi
-                self._convert_steps_to_workout(workout, steps)
-                
-                # Aggiungi l'allenamento alla lista
-                workouts.append(workout)
+            # Converti in oggetti Workout, separando la configurazione
+            workouts, config = workouts_from_plan(data, self.controller.config.get('workout_config'))
             
             # Salva la configurazione
             if config:
@@ -694,152 +640,6 @@ class ImportExportFrame(ttk.Frame):
                 parent=self
             ))
     
-    def _convert_steps_to_workout(self, workout, steps):
-        """
-        Converte gli step dal formato YAML/Excel in oggetti WorkoutStep.
-        
-        Args:
-            workout: Oggetto Workout a cui aggiungere gli step
-            steps: Lista di step in formato YAML/Excel
-        """
-        for step in steps:
-            if not isinstance(step, dict):
-                continue
-                
-            if 'sport_type' in step or 'date' in step:
-                # Salta i metadati
-                continue
-                
-            if 'repeat' in step and 'steps' in step:
-                # Passo di ripetizione
-                iterations = step['repeat']
-                substeps = step['steps']
-                
-                # Crea il passo di ripetizione
-                repeat_step = WorkoutStep(
-                    0,  # Sarà assegnato automaticamente
-                    "repeat",
-                    "",
-                    "iterations",
-                    iterations
-                )
-                
-                # Converti e aggiungi i sottopassi
-                for substep in substeps:
-                    if isinstance(substep, dict) and len(substep) == 1:
-                        substep_type = list(substep.keys())[0]
-                        substep_detail = substep[substep_type]
-                        
-                        # Estrai condizione di fine e valore (semplificato)
-                        end_condition = "lap.button"
-                        end_value = None
-                        description = ""
-                        target = None
-                        
-                        # Estrai la condizione di fine
-                        if substep_detail.startswith("lap-button"):
-                            end_condition = "lap.button"
-                            end_value = None
-                        elif "min" in substep_detail or ":" in substep_detail and " @ " not in substep_detail:
-                            end_condition = "time"
-                            end_value = substep_detail.split(" ")[0]
-                        elif "km" in substep_detail or "m" in substep_detail and "min" not in substep_detail:
-                            end_condition = "distance"
-                            end_value = substep_detail.split(" ")[0]
-                        
-                        # Estrai il target
-                        if " @ " in substep_detail:
-                            target_type = "pace.zone"
-                            target_value = substep_detail.split(" @ ")[1].split(" -- ")[0] if " -- " in substep_detail else substep_detail.split(" @ ")[1]
-                            # Crea un target appropriato (semplificato)
-                            target = Target(target_type, 3.8, 4.2)  # Valori di esempio
-                        elif " @hr " in substep_detail:
-                            target_type = "heart.rate.zone"
-                            target_value = substep_detail.split(" @hr ")[1].split(" -- ")[0] if " -- " in substep_detail else substep_detail.split(" @hr ")[1]
-                            # Crea un target appropriato (semplificato)
-                            target = Target(target_type, 140, 160)  # Valori di esempio
-                        elif " @pwr " in substep_detail:
-                            target_type = "power.zone"
-                            target_value = substep_detail.split(" @pwr ")[1].split(" -- ")[0] if " -- " in substep_detail else substep_detail.split(" @pwr ")[1]
-                            # Crea un target appropriato (semplificato)
-                            target = Target(target_type, 200, 250)  # Valori di esempio
-                        
-                        # Estrai la descrizione
-                        if " -- " in substep_detail:
-                            description = substep_detail.split(" -- ")[1]
-                        
-                        # Crea il passo
-                        substep_obj = WorkoutStep(
-                            0,  # Sarà assegnato automaticamente
-                            substep_type,
-                            description,
-                            end_condition,
-                            end_value,
-                            target
-                        )
-                        
-                        # Aggiungi il sottopasso alla ripetizione
-                        repeat_step.add_step(substep_obj)
-                
-                # Aggiungi il passo di ripetizione all'allenamento
-                workout.add_step(repeat_step)
-            
-            elif len(step) == 1:
-                # Passo normale
-                step_type = list(step.keys())[0]
-                step_detail = step[step_type]
-                
-                # Estrai condizione di fine e valore
-                end_condition = "lap.button"
-                end_value = None
-                description = ""
-                target = None
-                
-                # Estrai la condizione di fine
-                if step_detail.startswith("lap-button"):
-                    end_condition = "lap.button"
-                    end_value = None
-                elif "min" in step_detail or ":" in step_detail and " @ " not in step_detail:
-                    end_condition = "time"
-                    end_value = step_detail.split(" ")[0]
-                elif "km" in step_detail or "m" in step_detail and "min" not in step_detail:
-                    end_condition = "distance"
-                    end_value = step_detail.split(" ")[0]
-                
-                # Estrai il target
-                if " @ " in step_detail:
-                    target_type = "pace.zone"
-                    target_value = step_detail.split(" @ ")[1].split(" -- ")[0] if " -- " in step_detail else step_detail.split(" @ ")[1]
-                    # Crea un target appropriato (semplificato)
-                    target = Target(target_type, 3.8, 4.2)  # Valori di esempio
-                elif " @hr " in step_detail:
-                    target_type = "heart.rate.zone"
-                    target_value = step_detail.split(" @hr ")[1].split(" -- ")[0] if " -- " in step_detail else step_detail.split(" @hr ")[1]
-                    # Crea un target appropriato (semplificato)
-                    target = Target(target_type, 140, 160)  # Valori di esempio
-                elif " @pwr " in step_detail:
-                    target_type = "power.zone"
-                    target_value = step_detail.split(" @pwr ")[1].split(" -- ")[0] if " -- " in step_detail else step_detail.split(" @pwr ")[1]
-                    # Crea un target appropriato (semplificato)
-                    target = Target(target_type, 200, 250)  # Valori di esempio
-                
-                # Estrai la descrizione
-                if " -- " in step_detail:
-                    description = step_detail.split(" -- ")[1]
-                
-                # Crea il passo
-                step_obj = WorkoutStep(
-                    0,  # Sarà assegnato automaticamente
-                    step_type,
-                    description,
-                    end_condition,
-                    end_value,
-                    target
-                )
-                
-                # Aggiungi il passo all'allenamento
-                workout.add_step(step_obj)
-    
     def export_yaml(self):
         """Esporta allenamenti in un file YAML."""
         # Verifica che ci sia un percorso valido
@@ -894,6 +694,9 @@ class ImportExportFrame(ttk.Frame):
                 if not filter_text or filter_text.lower() in w.workout_name.lower()
             ]
             
+            # Scarica i dettagli degli allenamenti noti solo come riepilogo
+            self.controller.workouts_frame.ensure_workouts_loaded(filtered_workouts)
+            
             # Converti gli allenamenti in formato YAML
             for workout in filtered_workouts:
                 # Crea la lista di step
@@ -1087,6 +890,9 @@ class ImportExportFrame(ttk.Frame):
                 if not filter_text or filter_text.lower() in w.workout_name.lower()
             ]
             
+            # Scarica i dettagli degli allenamenti noti solo come riepilogo
+            self.controller.workouts_frame.ensure_workouts_loaded(filtered_workouts)
+            
             # Converti gli allenamenti in formato Excel
             for workout in filtered_workouts:
                 # Crea la lista di step
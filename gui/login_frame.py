@@ -13,6 +13,9 @@ import os
 
 from core.garmin_client import GarminClient
 
+# File che indicano una sessione salvata nella cartella OAuth
+SAVED_TOKEN_FILES = ('oauth2_token.json', 'token.json')
+
 
 class LoginFrame(ttk.Frame):
     """Frame per il login a Garmin Connect."""
@@ -150,23 +153,49 @@ class LoginFrame(ttk.Frame):
         instructions_label.pack(padx=10, pady=10)
     
     def check_saved_token(self):
-        """Verifica se esiste un token salvato per il login automatico."""
+        """
+        Verifica se esiste un token salvato per il login automatico.
+        
+        Il ripristino (ed eventuale rinnovo) del token avviene in un thread
+        separato, così la finestra resta utilizzabile durante l'avvio.
+        """
         oauth_folder = os.path.expanduser(self.oauth_folder_var.get())
-        token_path = os.path.join(oauth_folder, 'token.json')
-        
-        if os.path.exists(token_path):
-            try:
-                # Crea un client e verifica se il token è valido
-                client = GarminClient(oauth_folder)
-                if client.is_logged_in():
-                    self.on_login_success(client)
-                    logging.info("Login automatico effettuato con token esistente.")
-                    return
-            except Exception as e:
-                logging.warning(f"Token esistente non valido: {str(e)}")
+        
+        if not any(os.path.exists(os.path.join(oauth_folder, name)) for name in SAVED_TOKEN_FILES):
+            logging.info("Nessun token valido trovato, login manuale richiesto.")
+            return
+        
+        # Mostra lo stato di ripristino
+        self.login_button['state'] = tk.DISABLED
+        self.status_label['text'] = "Ripristino della sessione..."
+        
+        threading.Thread(
+            target=self._resume_session_thread,
+            args=(oauth_folder,),
+            daemon=True
+        ).start()
+    
+    def _resume_session_thread(self, oauth_folder):
+        """
+        Thread separato per ripristinare e validare la sessione salvata.
+        
+        Args:
+            oauth_folder: Cartella dei token OAuth
+        """
+        try:
+            # Crea un client e verifica se il token è valido, rinnovandolo
+            # subito se sta per scadere
+            client = GarminClient(oauth_folder)
+            if client.is_logged_in() and client.refresh_token_if_needed():
+                logging.info("Login automatico effettuato con token esistente.")
+                self.after(0, lambda: self.on_login_success(client))
+                return
+        except Exception as e:
+            logging.warning(f"Token esistente non valido: {str(e)}")
         
         # Se arriviamo qui, non c'è un token valido
         logging.info("Nessun token valido trovato, login manuale richiesto.")
+        self.after(0, self._update_ui_after_login_failure)
     
     def login(self):
         """Esegue il login a Garmin Connect."""
@@ -255,6 +284,9 @@ class LoginFrame(ttk.Frame):
         # Aggiorna l'etichetta di stato
         self.status_label['text'] = "Connesso a Garmin Connect"
         
+        # Rinnova il token in anticipo, prima che scada
+        client.start_token_refresher()
+        
         # Passa il client al controller
         self.controller.set_garmin_client(client)
         
@@ -13,6 +13,8 @@ import logging
 
 from core.utils import format_workout_name, parse_workout_name
 from core.workout import Workout, WorkoutStep, Target
+from core.step_parser import parse_step
+from core.zones import compile_zones
 from gui.dialogs.step_dialog import StepDialog
 from gui.dialogs.repeat_dialog import RepeatDialog
 from gui.styles import COLORS, STEP_ICONS, SPORT_ICONS
@@ -598,53 +600,8 @@ class WorkoutEditor(ttk.Frame):
         if dialog.result:
             step_type, step_detail = dialog.result
             
-            # Estrai condizione di fine e valore
-            end_condition = "lap.button"
-            end_value = None
-            description = ""
-            target = None
-            
-            # Estrai la condizione di fine
-            if step_detail.startswith("lap-button"):
-                end_condition = "lap.button"
-                end_value = None
-            elif "min" in step_detail or ":" in step_detail and " @ " not in step_detail and " @hr " not in step_detail and " @pwr " not in step_detail:
-                end_condition = "time"
-                end_value = step_detail.split(" ")[0]
-            elif "km" in step_detail or "m" in step_detail and "min" not in step_detail:
-                end_condition = "distance"
-                end_value = step_detail.split(" ")[0]
-            
-            # Estrai il target
-            if " @ " in step_detail:
-                target_type = "pace.zone"
-                target_value = step_detail.split(" @ ")[1].split(" -- ")[0] if " -- " in step_detail else step_detail.split(" @ ")[1]
-                # Crea un target appropriato (semplificato)
-                target = Target(target_type, 3.8, 4.2)  # Valori di esempio
-            elif " @hr " in step_detail:
-                target_type = "heart.rate.zone"
-                target_value = step_detail.split(" @hr ")[1].split(" -- ")[0] if " -- " in step_detail else step_detail.split(" @hr ")[1]
-                # Crea un target appropriato (semplificato)
-                target = Target(target_type, 140, 160)  # Valori di esempio
-            elif " @pwr " in step_detail:
-                target_type = "power.zone"
-                target_value = step_detail.split(" @pwr ")[1].split(" -- ")[0] if " -- " in step_detail else step_detail.split(" @pwr ")[1]
-                # Crea un target appropriato (semplificato)
-                target = Target(target_type, 200, 250)  # Valori di esempio
-            
-            # Estrai la descrizione
-            if " -- " in step_detail:
-                description = step_detail.split(" -- ")[1]
-            
-            # Crea il passo
-            step = WorkoutStep(
-                0,  # Sarà assegnato automaticamente
-                step_type,
-                description,
-                end_condition,
-                end_value,
-                target
-            )
+            # Crea il passo con i dettagli forniti
+            step = self._create_step_from_details(step_type, step_detail)
             
             # Aggiungi il passo all'allenamento
             self.current_workout.add_step(step)
@@ -685,53 +642,8 @@ class WorkoutEditor(ttk.Frame):
                     step_type = list(step.keys())[0]
                     step_detail = step[step_type]
                     
-                    # Estrai condizione di fine e valore (semplificato)
-                    end_condition = "lap.button"
-                    end_value = None
-                    description = ""
-                    target = None
-                    
-                    # Estrai la condizione di fine
-                    if step_detail.startswith("lap-button"):
-                        end_condition = "lap.button"
-                        end_value = None
-                    elif "min" in step_detail or ":" in step_detail and " @ " not in step_detail:
-                        end_condition = "time"
-                        end_value = step_detail.split(" ")[0]
-                    elif "km" in step_detail or "m" in step_detail and "min" not in step_detail:
-                        end_condition = "distance"
-                        end_value = step_detail.split(" ")[0]
-                    
-                    # Estrai il target
-                    if " @ " in step_detail:
-                        target_type = "pace.zone"
-                        target_value = step_detail.split(" @ ")[1].split(" -- ")[0] if " -- " in step_detail else step_detail.split(" @ ")[1]
-                        # Crea un target appropriato (semplificato)
-                        target = Target(target_type, 3.8, 4.2)  # Valori di esempio
-                    elif " @hr " in step_detail:
-                        target_type = "heart.rate.zone"
-                        target_value = step_detail.split(" @hr ")[1].split(" -- ")[0] if " -- " in step_detail else step_detail.split(" @hr ")[1]
-                        # Crea un target appropriato (semplificato)
-                        target = Target(target_type, 140, 160)  # Valori di esempio
-                    elif " @pwr " in step_detail:
-                        target_type = "power.zone"
-                        target_value = step_detail.split(" @pwr ")[1].split(" -- ")[0] if " -- " in step_detail else step_detail.split(" @pwr ")[1]
-                        # Crea un target appropriato (semplificato)
-                        target = Target(target_type, 200, 250)  # Valori di esempio
-                    
-                    # Estrai la descrizione
-                    if " -- " in step_detail:
-                        description = step_detail.split(" -- ")[1]
-                    
-                    # Crea il passo
-                    substep = WorkoutStep(
-                        0,  # Sarà assegnato automaticamente
-                        step_type,
-                        description,
-                        end_condition,
-                        end_value,
-                        target
-                    )
+                    # Crea il sottopasso con i dettagli forniti
+                    substep = self._create_step_from_details(step_type, step_detail)
                     
                     # Aggiungi il sottopasso alla ripetizione
                     repeat_step.add_step(substep)
@@ -914,177 +826,34 @@ class WorkoutEditor(ttk.Frame):
         Returns:
             WorkoutStep: Nuovo passo configurato
         """
-        # Estrai condizione di fine e valore
-        end_condition = "lap.button"
-        end_value = None
-        description = ""
+        # Analizza condizione di fine, target e descrizione
+        spec = parse_step(step_detail)
+        end_condition = spec.end_condition
+        end_value = spec.end_value
+        description = spec.description
         target = None
+        zone_name = spec.zone or ""
         
-        # Estrai la condizione di fine
-        if step_detail.startswith("lap-button"):
-            end_condition = "lap.button"
-            end_value = None
-        elif "min" in step_detail or ":" in step_detail and " @ " not in step_detail and " @hr " not in step_detail and " @pwr " not in step_detail:
-            end_condition = "time"
-            end_value = step_detail.split(" ")[0]
-        elif "km" in step_detail or "m" in step_detail and "min" not in step_detail:
-            end_condition = "distance"
-            end_value = step_detail.split(" ")[0]
-        
-        # Estrai la descrizione
-        if " -- " in step_detail:
-            description = step_detail.split(" -- ")[1]
-        
-        # Estrai il target e crea l'oggetto Target appropriato
+        # Risolvi il target con le zone compilate della configurazione
         config = self.controller.controller.config if hasattr(self.controller, 'controller') else {}
-        workout_config = config.get('workout_config', {})
+        zones = compile_zones(config.get('workout_config', {}))
+        sport_type = self.current_workout.sport_type if self.current_workout else None
         
-        if " @ " in step_detail:
-            target_type = "pace.zone"
-            target_value = step_detail.split(" @ ")[1].split(" -- ")[0] if " -- " in step_detail else step_detail.split(" @ ")[1]
-            
-            # Ottieni i valori di ritmo dalla configurazione
-            paces = workout_config.get('paces', {})
-            
+        if spec.target_type == "pace.zone":
             # Salva il nome della zona originale nella descrizione se non c'è già una descrizione
-            zone_name = target_value.strip()
-            if not description and zone_name in paces:
+            if not description and zones.has_zone(spec.target_type, zone_name, sport_type):
                 description = f"Zona {zone_name}"
-            
-            if zone_name in paces:
-                pace_str = paces[zone_name]
-                # Converti il ritmo in m/s per i valori target
-                from core.utils import pace_to_ms
-                try:
-                    pace_ms = pace_to_ms(pace_str)
-                    # Aggiungi o sottrai i margini per il range
-                    margins = workout_config.get('margins', {})
-                    faster_sec = int(margins.get('faster', '0:03').split(':')[1]) if ':' in margins.get('faster', '0:03') else 0
-                    slower_sec = int(margins.get('slower', '0:03').split(':')[1]) if ':' in margins.get('slower', '0:03') else 0
-                    
-                    # Converti i secondi in variazione di m/s per il ritmo
-                    base_pace_s = 1000 / pace_ms  # secondi per km
-                    faster_pace_s = base_pace_s - faster_sec
-                    slower_pace_s = base_pace_s + slower_sec
-                    
-                    to_value = 1000 / faster_pace_s if faster_pace_s > 0 else pace_ms * 1.1
-                    from_value = 1000 / slower_pace_s if slower_pace_s > 0 else pace_ms * 0.9
-                    
-                    # Crea un target con il nome della zona salvato come attributo extra
-                    target = Target(target_type, to_value, from_value)
-                    target.zone_name = zone_name  # Aggiungi un attributo personalizzato
-                except:
-                    # Fallback in caso di errore
-                    target = Target(target_type, 3.8, 4.2)
-                    target.zone_name = zone_name
-            else:
-                # Valori di default se la zona non è trovata
-                target = Target(target_type, 3.8, 4.2)
-                target.zone_name = zone_name
+            target = zones.target(spec.target_type, zone_name, sport_type)
                 
-        elif " @hr " in step_detail:
-            target_type = "heart.rate.zone"
-            target_value = step_detail.split(" @hr ")[1].split(" -- ")[0] if " -- " in step_detail else step_detail.split(" @hr ")[1]
-            
-            # Salva il nome della zona originale
-            zone_name = target_value.strip()
+        elif spec.target_type == "heart.rate.zone":
             if not description:
                 description = f"FC {zone_name}"
-            
-            # Ottieni i valori HR dalla configurazione
-            heart_rates = workout_config.get('heart_rates', {})
-            if zone_name in heart_rates:
-                hr_str = heart_rates[zone_name]
-                if '-' in hr_str:
-                    try:
-                        # Formato "min-max"
-                        hr_parts = hr_str.split('-')
-                        from_value = int(hr_parts[0])
-                        to_value = int(hr_parts[1])
-                        target = Target(target_type, to_value, from_value)
-                        target.zone_name = zone_name
-                    except:
-                        # Gestisci il formato percentuale, e.g., "70-80% max_hr"
-                        try:
-                            if "% max_hr" in hr_str:
-                                max_hr = int(heart_rates.get('max_hr', 180))
-                                hr_parts = hr_str.split('-')
-                                from_pct = int(hr_parts[0].replace('%', '').strip())
-                                to_pct = int(hr_parts[1].split('%')[0].strip())
-                                from_value = max_hr * from_pct // 100
-                                to_value = max_hr * to_pct // 100
-                                target = Target(target_type, to_value, from_value)
-                                target.zone_name = zone_name
-                            else:
-                                # Fallback
-                                target = Target(target_type, 160, 140)
-                                target.zone_name = zone_name
-                        except:
-                            # Fallback
-                            target = Target(target_type, 160, 140)
-                            target.zone_name = zone_name
-                else:
-                    # Valore singolo
-                    try:
-                        hr_value = int(hr_str)
-                        # Aggiungi o sottrai i margini per il range
-                        margins = workout_config.get('margins', {})
-                        hr_up = int(margins.get('hr_up', 5))
-                        hr_down = int(margins.get('hr_down', 5))
-                        target = Target(target_type, hr_value + hr_up, hr_value - hr_down)
-                        target.zone_name = zone_name
-                    except:
-                        # Fallback
-                        target = Target(target_type, 160, 140)
-                        target.zone_name = zone_name
-            else:
-                # Valori di default se la zona non è trovata
-                target = Target(target_type, 160, 140)
-                target.zone_name = zone_name
+            target = zones.target(spec.target_type, zone_name, sport_type)
                 
-        elif " @pwr " in step_detail:
-            target_type = "power.zone"
-            target_value = step_detail.split(" @pwr ")[1].split(" -- ")[0] if " -- " in step_detail else step_detail.split(" @pwr ")[1]
-            
-            # Salva il nome della zona originale
-            zone_name = target_value.strip()
+        elif spec.target_type == "power.zone":
             if not description:
                 description = f"Potenza {zone_name}"
-            
-            # Ottieni i valori di potenza dalla configurazione
-            power_values = workout_config.get('power_values', {})
-            if zone_name in power_values:
-                pwr_str = str(power_values[zone_name])
-                if '-' in pwr_str:
-                    try:
-                        # Formato "min-max"
-                        pwr_parts = pwr_str.split('-')
-                        from_value = int(pwr_parts[0])
-                        to_value = int(pwr_parts[1])
-                        target = Target(target_type, to_value, from_value)
-                        target.zone_name = zone_name
-                    except:
-                        # Fallback
-                        target = Target(target_type, 250, 200)
-                        target.zone_name = zone_name
-                else:
-                    # Valore singolo
-                    try:
-                        pwr_value = int(pwr_str)
-                        # Aggiungi o sottrai i margini per il range
-                        margins = workout_config.get('margins', {})
-                        pwr_up = int(margins.get('power_up', 10))
-                        pwr_down = int(margins.get('power_down', 10))
-                        target = Target(target_type, pwr_value + pwr_up, pwr_value - pwr_down)
-                        target.zone_name = zone_name
-                    except:
-                        # Fallback
-                        target = Target(target_type, 250, 200)
-                        target.zone_name = zone_name
-            else:
-                # Valori di default se la zona non è trovata
-                target = Target(target_type, 250, 200)
-                target.zone_name = zone_name
+            target = zones.target(spec.target_type, zone_name, sport_type)
         
         # Se non è stato creato un target, crea un target vuoto
         if target is None:
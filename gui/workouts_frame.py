@@ -12,12 +12,20 @@ import threading
 import datetime
 import re
 import os
+from concurrent.futures import ThreadPoolExecutor, Future
 
 from core.utils import format_workout_name, parse_workout_name
 from core.workout import Workout, WorkoutStep, Target
+from core.uploader import UploadEngine, DEFAULT_CONCURRENCY
+from core.sync_planner import SyncPlanner, workout_fingerprint
+from core.upload_journal import UploadJournal, UPLOAD_JOURNAL_FILE
+from core.async_client import fetch_workout_details
 from .workout_editor import WorkoutEditor
 from gui.styles import SPORT_ICONS, STEP_ICONS, COLORS
 
+# Numero di righe prima e dopo la selezione i cui dettagli vengono precaricati
+PREFETCH_RADIUS = 3
+
 class WorkoutsFrame(ttk.Frame):
     """Frame per la gestione degli allenamenti."""
     
@@ -42,6 +50,18 @@ class WorkoutsFrame(ttk.Frame):
         # Dizionario per memorizzare gli ID degli allenamenti in Garmin Connect
         self.workout_ids = {}
         
+        # Allenamenti remoti di cui è noto solo il riepilogo (Workout -> riepilogo Garmin)
+        self.pending_details = {}
+        
+        # Stato dei riepiloghi al caricamento dei dettagli (Workout -> (hash, data)),
+        # per riconoscere quelli non modificati in locale
+        self.summary_states = {}
+        
+        # Caricamenti dei dettagli in corso (Workout -> Future)
+        self._details_futures = {}
+        self._details_lock = threading.Lock()
+        self._details_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="garmin-details")
+        
         # Filtri
         self.sport_filter_var = tk.StringVar(value="Tutti")
         self.search_var = tk.StringVar()
@@ -252,12 +272,24 @@ class WorkoutsFrame(ttk.Frame):
         if index < len(filtered_workouts):
             workout = filtered_workouts[index]
             
-            # Carica l'allenamento nell'editor
-            self.workout_editor.load_workout(workout)
-            
             # Memorizza l'allenamento corrente
             self.current_workout = workout
             
+            # Precarica i dettagli degli allenamenti vicini
+            self._prefetch_details(filtered_workouts, index)
+            
+            # Se sono noti solo i dati di riepilogo, carica i dettagli in background
+            future = self.load_workout_details_async(workout)
+            if future is not None:
+                self.controller.set_status(f"Caricamento dei dettagli di '{workout.workout_name}'...")
+                future.add_done_callback(
+                    lambda f, workout=workout: self.after(0, lambda: self._on_details_loaded(workout, f))
+                )
+                return
+            
+            # Carica l'allenamento nell'editor
+            self.workout_editor.load_workout(workout)
+            
             # Forza l'aggiornamento dei valori delle zone
             if hasattr(self.controller, 'zones_frame'):
                 self.controller.zones_frame.refresh_data()
@@ -345,8 +377,8 @@ class WorkoutsFrame(ttk.Frame):
             # Ottieni la data, se disponibile
             date_display = workout.get_scheduled_date() or ""
             
-            # Conta il numero di passi
-            step_count = workout.get_step_count()
+            # Conta il numero di passi (non noto finché i dettagli non sono caricati)
+            step_count = workout.get_step_count() if self.is_workout_loaded(workout) else ""
             
             # Inserisci l'allenamento nella lista
             item_id = self.workout_tree.insert(
@@ -430,69 +462,111 @@ class WorkoutsFrame(ttk.Frame):
         if index < len(filtered_workouts):
             original = filtered_workouts[index]
             
-            # Estrai settimana, sessione e descrizione dal nome
-            week, session, description = parse_workout_name(original.workout_name)
-            
-            # Crea un nuovo nome
-            if week is not None and session is not None:
-                # Usa lo stesso formato ma incrementa la sessione
-                new_name = format_workout_name(week, session + 1, f"Copia di {description}")
-            else:
-                # Aggiungi semplicemente un prefisso
-                new_name = f"Copia di {original.workout_name}"
-            
-            # Crea un nuovo allenamento come copia
-            workout = Workout(original.sport_type, new_name, original.description)
-            
-            # Copia i passi
-            for step in original.workout_steps:
-                # Crea una copia del passo (questa è una semplificazione, in realtà 
-                # servirebbe una copia più profonda con tutti i substep)
-                new_step = WorkoutStep(
-                    step.order,
-                    step.step_type,
-                    step.description,
-                    step.end_condition,
-                    step.end_condition_value,
-                    step.target
+            # Servono i passi completi dell'allenamento: se mancano vengono
+            # scaricati in background e la copia viene creata al termine
+            future = self.load_workout_details_async(original)
+            if future is not None:
+                self.controller.set_status(f"Caricamento dei dettagli di '{original.workout_name}'...")
+                future.add_done_callback(
+                    lambda f, original=original: self.after(0, lambda: self._on_copy_details_loaded(original, f))
                 )
-                
-                # Copia i substep per i passi di tipo repeat
-                for substep in step.workout_steps:
-                    new_substep = WorkoutStep(
-                        substep.order,
-                        substep.step_type,
-                        substep.description,
-                        substep.end_condition,
-                        substep.end_condition_value,
-                        substep.target
-                    )
-                    new_step.add_step(new_substep)
-                
-                # Aggiungi il passo al nuovo allenamento
-                workout.add_step(new_step)
-            
-            # Aggiungi il nuovo allenamento alla lista
-            self.workouts.append(workout)
-            
-            # Aggiorna la lista
-            self.update_workouts_list()
-            
-            # Seleziona il nuovo allenamento
-            for i, w in enumerate(self.get_filtered_workouts()):
-                if w.workout_name == new_name:
-                    item_id = self.workout_tree.get_children()[i]
-                    self.workout_tree.selection_set(item_id)
-                    self.workout_tree.see(item_id)
-                    self.on_workout_select()
-                    break
+                return
             
-            # Mostra un messaggio di conferma
-            messagebox.showinfo(
-                "Allenamento duplicato", 
-                f"L'allenamento '{original.workout_name}' è stato duplicato.",
+            self._copy_loaded_workout(original)
+    
+    def _on_copy_details_loaded(self, original, future):
+        """
+        Crea la copia di un allenamento al termine del caricamento dei dettagli.
+        
+        Args:
+            original: Allenamento da duplicare
+            future: Caricamento completato
+        """
+        try:
+            future.result()
+        except Exception as e:
+            logging.error(f"Errore nel caricamento dei dettagli di '{original.workout_name}': {str(e)}")
+            self.controller.set_status(f"Impossibile caricare i dettagli di '{original.workout_name}'")
+            messagebox.showerror(
+                "Errore", 
+                f"Impossibile caricare i dettagli dell'allenamento '{original.workout_name}'.",
                 parent=self
             )
+            return
+        
+        self.controller.set_status(f"Dettagli di '{original.workout_name}' caricati")
+        self._copy_loaded_workout(original)
+    
+    def _copy_loaded_workout(self, original):
+        """
+        Duplica un allenamento di cui sono disponibili i passi.
+        
+        Args:
+            original: Allenamento da duplicare
+        """
+        # Estrai settimana, sessione e descrizione dal nome
+        week, session, description = parse_workout_name(original.workout_name)
+        
+        # Crea un nuovo nome
+        if week is not None and session is not None:
+            # Usa lo stesso formato ma incrementa la sessione
+            new_name = format_workout_name(week, session + 1, f"Copia di {description}")
+        else:
+            # Aggiungi semplicemente un prefisso
+            new_name = f"Copia di {original.workout_name}"
+        
+        # Crea un nuovo allenamento come copia
+        workout = Workout(original.sport_type, new_name, original.description)
+        
+        # Copia i passi
+        for step in original.workout_steps:
+            # Crea una copia del passo (questa è una semplificazione, in realtà 
+            # servirebbe una copia più profonda con tutti i substep)
+            new_step = WorkoutStep(
+                step.order,
+                step.step_type,
+                step.description,
+                step.end_condition,
+                step.end_condition_value,
+                step.target
+            )
+            
+            # Copia i substep per i passi di tipo repeat
+            for substep in step.workout_steps:
+                new_substep = WorkoutStep(
+                    substep.order,
+                    substep.step_type,
+                    substep.description,
+                    substep.end_condition,
+                    substep.end_condition_value,
+                    substep.target
+                )
+                new_step.add_step(new_substep)
+            
+            # Aggiungi il passo al nuovo allenamento
+            workout.add_step(new_step)
+        
+        # Aggiungi il nuovo allenamento alla lista
+        self.workouts.append(workout)
+        
+        # Aggiorna la lista
+        self.update_workouts_list()
+        
+        # Seleziona il nuovo allenamento
+        for i, w in enumerate(self.get_filtered_workouts()):
+            if w.workout_name == new_name:
+                item_id = self.workout_tree.get_children()[i]
+                self.workout_tree.selection_set(item_id)
+                self.workout_tree.see(item_id)
+                self.on_workout_select()
+                break
+        
+        # Mostra un messaggio di conferma
+        messagebox.showinfo(
+            "Allenamento duplicato", 
+            f"L'allenamento '{original.workout_name}' è stato duplicato.",
+            parent=self
+        )
     
     def delete_workout(self):
         """Elimina l'allenamento selezionato."""
@@ -524,6 +598,8 @@ class WorkoutsFrame(ttk.Frame):
             
             # Rimuovi l'allenamento dalla lista
             self.workouts.remove(workout)
+            self.pending_details.pop(workout, None)
+            self.summary_states.pop(workout, None)
             
             # Aggiorna la lista
             self.update_workouts_list()
@@ -552,7 +628,7 @@ class WorkoutsFrame(ttk.Frame):
         # Crea un dialog personalizzato
         sync_dialog = tk.Toplevel(self)
         sync_dialog.title("Sincronizza con Garmin Connect")
-        sync_dialog.geometry("400x300")
+        sync_dialog.geometry("450x330")
         sync_dialog.transient(self)
         sync_dialog.grab_set()
         
@@ -605,17 +681,26 @@ class WorkoutsFrame(ttk.Frame):
             variable=schedule_var
         ).pack(anchor=tk.W, padx=20, pady=5)
         
+        # Flag per eliminare gli allenamenti remoti non più presenti
+        delete_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            sync_dialog, 
+            text="Elimina da Garmin Connect gli allenamenti non presenti nella lista", 
+            variable=delete_var
+        ).pack(anchor=tk.W, padx=20, pady=5)
+        
         # Pulsanti
         button_frame = ttk.Frame(sync_dialog)
         button_frame.pack(fill=tk.X, padx=20, pady=20)
         
         # Variabile per il risultato
-        result = {"action": None, "replace": False, "schedule": False}
+        result = {"action": None, "replace": False, "schedule": False, "delete": False}
         
         def on_ok():
             result["action"] = sync_var.get()
             result["replace"] = replace_var.get()
             result["schedule"] = schedule_var.get()
+            result["delete"] = delete_var.get()
             sync_dialog.destroy()
         
         def on_cancel():
@@ -645,7 +730,7 @@ class WorkoutsFrame(ttk.Frame):
         # Esegui l'azione richiesta
         if result["action"] == 1:
             # Carica tutti gli allenamenti
-            self.upload_all_workouts(result["replace"], result["schedule"])
+            self.upload_all_workouts(result["replace"], result["schedule"], result["delete"])
         elif result["action"] == 2:
             # Carica solo l'allenamento selezionato
             self.upload_selected_workout(result["replace"], result["schedule"])
@@ -653,26 +738,40 @@ class WorkoutsFrame(ttk.Frame):
             # Scarica allenamenti
             self.download_workouts()
     
-    def upload_all_workouts(self, replace=False, schedule=True):
+    def upload_all_workouts(self, replace=False, schedule=True, delete_missing=False):
         """
         Carica tutti gli allenamenti su Garmin Connect.
         
         Args:
             replace: Se True, sostituisce gli allenamenti esistenti
             schedule: Se True, pianifica gli allenamenti nelle date specificate
+            delete_missing: Se True, elimina da Garmin Connect gli allenamenti non presenti nella lista
         """
-        if not self.workouts:
+        # Le righe remote non modificate sono già su Garmin Connect: caricarle
+        # scaricherebbe l'intera libreria (e senza replace la duplicherebbe)
+        workouts = []
+        untouched_names = set()
+        for workout in self.workouts:
+            if self.is_untouched_summary(workout):
+                untouched_names.add(workout.workout_name)
+            else:
+                workouts.append(workout)
+        
+        if not workouts and not delete_missing:
             messagebox.showinfo(
                 "Informazione", 
-                "Nessun allenamento da caricare.",
+                "Nessun allenamento nuovo o modificato da caricare.",
                 parent=self
             )
             return
         
         # Conferma
+        message = f"Stai per caricare {len(workouts)} allenamenti su Garmin Connect."
+        if delete_missing:
+            message += "\nGli allenamenti su Garmin Connect non presenti nella lista saranno eliminati."
         if not messagebox.askyesno(
             "Conferma", 
-            f"Stai per caricare {len(self.workouts)} allenamenti su Garmin Connect. Continuare?", 
+            f"{message} Continuare?", 
             parent=self
         ):
             return
@@ -680,7 +779,7 @@ class WorkoutsFrame(ttk.Frame):
         # Crea un thread separato per il caricamento
         threading.Thread(
             target=self._upload_workouts_thread,
-            args=(self.workouts, replace, schedule),
+            args=(workouts, replace, schedule, delete_missing, untouched_names),
             daemon=True
         ).start()
     
@@ -725,94 +824,99 @@ class WorkoutsFrame(ttk.Frame):
                 daemon=True
             ).start()
     
-    def _upload_workouts_thread(self, workouts, replace, schedule):
+    def upload_workouts(self, workouts, replace=True, schedule=False):
+        """
+        Carica su Garmin Connect un gruppo di allenamenti, senza chiedere conferma.
+        
+        Args:
+            workouts: Lista degli allenamenti da caricare
+            replace: Se True, sostituisce gli allenamenti esistenti
+            schedule: Se True, pianifica gli allenamenti nelle date specificate
+        """
+        if not workouts:
+            return
+        
+        # Crea un thread separato per il caricamento
+        threading.Thread(
+            target=self._upload_workouts_thread,
+            args=(list(workouts), replace, schedule),
+            daemon=True
+        ).start()
+    
+    def _upload_workouts_thread(self, workouts, replace, schedule, delete_missing=False, keep_names=()):
         """
         Thread separato per il caricamento degli allenamenti su Garmin Connect.
         
+        Solo gli allenamenti nuovi o modificati rispetto a Garmin Connect vengono
+        inviati: quelli identici (stesso hash del contenuto) vengono saltati.
+        
         Args:
             workouts: Lista degli allenamenti da caricare
             replace: Se True, sostituisce gli allenamenti esistenti
             schedule: Se True, pianifica gli allenamenti nelle date specificate
+            delete_missing: Se True, elimina da Garmin Connect gli allenamenti non presenti
+            keep_names: Nomi degli allenamenti della lista non caricati ma da non eliminare
         """
         try:
+            # Carica i dettagli degli allenamenti di cui è noto solo il riepilogo
+            self.ensure_workouts_loaded(workouts)
+            
+            # Non caricare mai allenamenti senza dettagli (verrebbero svuotati)
+            skipped_count = sum(1 for w in workouts if not self.is_workout_loaded(w))
+            workouts = [w for w in workouts if self.is_workout_loaded(w)]
+            
+            # Senza tutti i dettagli non è possibile stabilire cosa eliminare
+            if skipped_count and delete_missing:
+                logging.warning("Eliminazione degli allenamenti remoti annullata: dettagli incompleti.")
+                delete_missing = False
+            
             # Ottieni la lista degli allenamenti esistenti su Garmin Connect
             existing_workouts = self.garmin_client.list_workouts()
             
-            # Crea un dizionario nome -> id per gli allenamenti esistenti
-            existing_map = {}
-            for workout in existing_workouts:
-                existing_map[workout["workoutName"]] = workout["workoutId"]
-            
             # Mostra una finestra di progresso
             self.after(0, lambda: self._show_progress_dialog(workouts))
+            self.after(0, lambda: self._update_progress(
+                0, len(workouts), "", "Confronto con Garmin Connect..."
+            ))
             
-            # Conta successi/errori
-            self.success_count = 0
-            self.error_count = 0
-            self.scheduled_count = 0
+            # Calcola solo le operazioni necessarie
+            concurrency = self.controller.config.get('upload_concurrency', DEFAULT_CONCURRENCY)
+            plan = SyncPlanner(self.garmin_client, concurrency).plan(
+                workouts, 
+                existing_workouts, 
+                replace=replace, 
+                delete_missing=delete_missing
+            )
+            if keep_names:
+                plan.deletes = [(workout_id, name) for workout_id, name in plan.deletes
+                                if name not in keep_names]
             
-            # Per ogni allenamento
-            for i, workout in enumerate(workouts):
-                try:
-                    # Aggiorna lo stato
-                    self.after(0, lambda: self._update_progress(
-                        i + 1, 
-                        len(workouts), 
-                        workout.workout_name, 
-                        "Caricamento in corso..."
-                    ))
-                    
-                    # ID dell'allenamento su Garmin (sarà impostato dopo il caricamento)
-                    workout_id = None
-                    
-                    # Carica o aggiorna l'allenamento
-                    if workout.workout_name in existing_map and replace:
-                        # Aggiorna l'allenamento esistente
-                        workout_id = existing_map[workout.workout_name]
-                        self.garmin_client.update_workout(workout_id, workout)
-                        
-                        # Salva l'ID
-                        self.workout_ids[workout.workout_name] = workout_id
-                    else:
-                        # Crea un nuovo allenamento
-                        response = self.garmin_client.add_workout(workout)
-                        
-                        # Estrai l'ID dal nuovo allenamento creato
-                        if response and "workoutId" in response:
-                            workout_id = response["workoutId"]
-                            
-                            # Salva l'ID
-                            self.workout_ids[workout.workout_name] = workout_id
-                    
-                    # Pianifica l'allenamento se è stata specificata una data
-                    if schedule and workout.get_scheduled_date() and workout_id:
-                        try:
-                            self.after(0, lambda: self._update_progress(
-                                i + 1, 
-                                len(workouts), 
-                                workout.workout_name, 
-                                f"Pianificazione per il {workout.get_scheduled_date()}..."
-                            ))
-                            
-                            # Pianifica l'allenamento
-                            self.garmin_client.schedule_workout(workout_id, workout.get_scheduled_date())
-                            self.scheduled_count += 1
-                        except Exception as sch_err:
-                            logging.error(f"Errore nella pianificazione dell'allenamento '{workout.workout_name}': {str(sch_err)}")
-                    
-                    self.success_count += 1
-                    
-                except Exception as e:
-                    logging.error(f"Errore nel caricamento dell'allenamento '{workout.workout_name}': {str(e)}")
-                    self.error_count += 1
+            # Aggiorna la finestra di progresso dai thread di lavoro
+            def on_progress(done, total, name, message):
+                self.after(0, lambda: self._update_progress(done, total, name, message))
+            
+            # Registra i passi completati, per riprendere un caricamento interrotto
+            journal = UploadJournal(os.path.join(self.garmin_client.oauth_folder, UPLOAD_JOURNAL_FILE))
+            
+            # Carica gli allenamenti in parallelo
+            engine = UploadEngine(self.garmin_client, concurrency, journal=journal)
+            report = engine.execute(plan, schedule=schedule, progress_callback=on_progress)
+            
+            # Memorizza gli ID degli allenamenti caricati
+            for result in report.results:
+                if result.workout_id:
+                    self.workout_ids[result.workout.workout_name] = result.workout_id
+            
+            # Conta successi/errori
+            self.success_count = report.success_count
+            self.error_count = report.error_count + report.schedule_error_count + skipped_count
+            self.scheduled_count = report.scheduled_count
             
             # Chiudi la finestra di progresso
             self.after(0, self._close_progress)
             
             # Mostra il risultato
-            result_msg = f"Caricati {self.success_count} allenamenti su Garmin Connect."
-            if self.scheduled_count > 0:
-                result_msg += f"\nPianificati {self.scheduled_count} allenamenti nelle date specificate."
+            result_msg = report.summary()
             
             if self.error_count == 0:
                 self.after(0, lambda: messagebox.showinfo(
@@ -832,11 +936,16 @@ class WorkoutsFrame(ttk.Frame):
             self.after(0, self._close_progress)
             
             # Mostra errore
+            error_msg = str(e)
             self.after(0, lambda: messagebox.showerror(
                 "Errore", 
-                f"Si è verificato un errore durante il caricamento degli allenamenti: {str(e)}", 
+                f"Si è verificato un errore durante il caricamento degli allenamenti: {error_msg}", 
                 parent=self
             ))
+        
+        finally:
+            # Registra nel log le metriche delle richieste dell'operazione
+            self.garmin_client.metrics.log_report("caricamento")
     
     def _show_progress_dialog(self, workouts):
         """
@@ -888,6 +997,7 @@ class WorkoutsFrame(ttk.Frame):
         if hasattr(self, 'progress_window') and self.progress_window.winfo_exists():
             self.status_var.set(f"Caricamento {current}/{total}: {name}")
             self.substatus_var.set(substatus)
+            self.progress['maximum'] = max(total, 1)
             self.progress['value'] = current
     
     def _close_progress(self):
@@ -906,17 +1016,8 @@ class WorkoutsFrame(ttk.Frame):
             return
         
         try:
-            # Ottieni la lista degli allenamenti
-            remote_workouts = self.garmin_client.list_workouts()
-            
-            # Verifica se ci sono allenamenti
-            if not remote_workouts:
-                messagebox.showinfo(
-                    "Informazione", 
-                    "Nessun allenamento trovato su Garmin Connect.", 
-                    parent=self
-                )
-                return
+            # Allenamenti remoti, riempita pagina per pagina
+            remote_workouts = []
             
             # Dialog per selezionare gli allenamenti da scaricare
             select_dialog = tk.Toplevel(self)
@@ -925,10 +1026,11 @@ class WorkoutsFrame(ttk.Frame):
             select_dialog.transient(self)
             select_dialog.grab_set()
             
-            # Label informativa
+            # Label informativa, aggiornata durante il caricamento
+            count_var = tk.StringVar(value="Ricerca degli allenamenti su Garmin Connect...")
             ttk.Label(
                 select_dialog, 
-                text=f"Trovati {len(remote_workouts)} allenamenti su Garmin Connect",
+                textvariable=count_var,
                 style="Heading.TLabel"
             ).pack(pady=(10, 0))
             
@@ -984,29 +1086,66 @@ class WorkoutsFrame(ttk.Frame):
             # Associa l'evento di click
             tree.bind("<ButtonRelease-1>", toggle_selection)
             
-            # Aggiungi gli allenamenti
-            for wo in remote_workouts:
-                workout_id = wo["workoutId"]
-                name = wo["workoutName"]
-                sport = wo.get("sportType", {}).get("sportTypeKey", "unknown")
-                
-                # Formatta il tipo di sport
-                sport_display = sport.capitalize()
+            # Segnala al thread di caricamento che il dialog è stato chiuso
+            dialog_closed = threading.Event()
+            
+            # Aggiunge una pagina di allenamenti alla lista
+            def add_page(page):
+                if dialog_closed.is_set():
+                    return
                 
-                # Data di creazione
-                created_date = wo.get("createdDate", "")
-                if created_date:
-                    try:
-                        # Convert timestamp to date
-                        created_date = datetime.datetime.fromtimestamp(created_date / 1000.0).strftime('%Y-%m-%d')
-                    except:
-                        pass
+                for wo in page:
+                    workout_id = wo["workoutId"]
+                    name = wo["workoutName"]
+                    sport = wo.get("sportType", {}).get("sportTypeKey", "unknown")
+                    
+                    # Formatta il tipo di sport
+                    sport_display = sport.capitalize()
+                    
+                    # Data di creazione
+                    created_date = wo.get("createdDate", "")
+                    if created_date:
+                        try:
+                            # Convert timestamp to date
+                            created_date = datetime.datetime.fromtimestamp(created_date / 1000.0).strftime('%Y-%m-%d')
+                        except:
+                            pass
+                    
+                    # Inizialmente non selezionato
+                    selected[workout_id] = False
+                    
+                    # Aggiungi alla lista
+                    tree.insert("", "end", values=("", name, sport_display, created_date), tags=(workout_id,))
                 
-                # Inizialmente non selezionato
-                selected[workout_id] = False
+                remote_workouts.extend(page)
+                count_var.set(f"Trovati {len(remote_workouts)} allenamenti su Garmin Connect...")
+            
+            def on_pages_loaded():
+                if dialog_closed.is_set():
+                    return
                 
-                # Aggiungi alla lista
-                tree.insert("", "end", values=("", name, sport_display, created_date), tags=(workout_id,))
+                if remote_workouts:
+                    count_var.set(f"Trovati {len(remote_workouts)} allenamenti su Garmin Connect")
+                else:
+                    count_var.set("Nessun allenamento trovato su Garmin Connect.")
+            
+            def on_pages_error(error_msg):
+                if not dialog_closed.is_set():
+                    count_var.set(f"Errore nel caricamento degli allenamenti: {error_msg}")
+            
+            # Scarica la lista una pagina alla volta, senza bloccare l'interfaccia
+            def load_pages():
+                try:
+                    for page in self.garmin_client.iter_workout_pages():
+                        if dialog_closed.is_set():
+                            return
+                        self.after(0, lambda page=page: add_page(page))
+                    self.after(0, on_pages_loaded)
+                except Exception as e:
+                    logging.error(f"Errore nel caricamento della lista degli allenamenti: {str(e)}")
+                    self.after(0, lambda error_msg=str(e): on_pages_error(error_msg))
+            
+            threading.Thread(target=load_pages, daemon=True).start()
             
             # Pulsanti per selezionare/deselezionare tutti
             select_buttons = ttk.Frame(select_dialog)
@@ -1043,13 +1182,17 @@ class WorkoutsFrame(ttk.Frame):
             result = {"confirmed": False, "selected": {}}
             
             def on_ok():
+                dialog_closed.set()
                 result["confirmed"] = True
                 result["selected"] = selected.copy()
                 select_dialog.destroy()
             
             def on_cancel():
+                dialog_closed.set()
                 select_dialog.destroy()
             
+            select_dialog.protocol("WM_DELETE_WINDOW", on_cancel)
+            
             ttk.Button(
                 button_frame, 
                 text="Scarica selezionati", 
@@ -1092,7 +1235,7 @@ class WorkoutsFrame(ttk.Frame):
             # Crea un thread separato per il download
             threading.Thread(
                 target=self._download_workouts_thread,
-                args=(selected_workouts, remote_workouts),
+                args=(selected_workouts, list(remote_workouts)),
                 daemon=True
             ).start()
         
@@ -1108,6 +1251,10 @@ class WorkoutsFrame(ttk.Frame):
         """
         Thread separato per il download degli allenamenti da Garmin Connect.
         
+        I dettagli vengono scaricati in parallelo dal client asincrono e poi
+        convertiti; gli allenamenti ottenuti vengono aggiunti alla lista in
+        un'unica operazione sul thread dell'interfaccia.
+        
         Args:
             selected_workouts: Lista degli ID degli allenamenti da scaricare
             remote_workouts: Lista completa degli allenamenti remoti
@@ -1121,45 +1268,46 @@ class WorkoutsFrame(ttk.Frame):
             # Mostra una finestra di progresso
             self.after(0, lambda: self._show_progress_dialog(selected_workouts))
             
-            # Conta successi/errori
-            self.success_count = 0
-            self.error_count = 0
+            total = len(selected_workouts)
+            downloaded = {}
+            error_count = 0
             
-            # Per ogni allenamento selezionato
-            for i, workout_id in enumerate(selected_workouts):
-                # Nome dell'allenamento
-                name = remote_map.get(workout_id, {}).get("workoutName", f"Allenamento {workout_id}")
-                
+            # Aggiorna lo stato al termine di ogni allenamento
+            def on_progress(done, total, summary, detail):
+                name = summary.get("workoutName", f"Allenamento {summary['workoutId']}")
+                self.after(0, lambda: self._update_progress(done, total, name))
+            
+            # Scarica i dettagli con il client asincrono (dalla cache se non sono cambiati)
+            concurrency = self.controller.config.get('download_concurrency', DEFAULT_CONCURRENCY)
+            summaries = [remote_map.get(workout_id, {"workoutId": workout_id}) for workout_id in selected_workouts]
+            details = fetch_workout_details(self.garmin_client, summaries, concurrency, on_progress)
+            
+            # Converti i dettagli nel formato interno
+            for summary in summaries:
+                workout_id = summary["workoutId"]
+                name = summary.get("workoutName", f"Allenamento {workout_id}")
                 try:
-                    # Aggiorna lo stato
-                    self.after(0, lambda: self._update_progress(i + 1, len(selected_workouts), name))
-                    
-                    # Ottieni i dettagli dell'allenamento
-                    workout_detail = self.garmin_client.get_workout(workout_id)
-                    
-                    # Converti in formato interno
-                    workout = self._convert_garmin_to_internal(workout_detail)
-                    
-                    # Aggiungi alla lista degli allenamenti
+                    detail = details.get(workout_id)
+                    if detail is None:
+                        raise Exception("dettagli non disponibili")
+                    workout = self._convert_garmin_to_internal(detail)
                     if workout:
-                        # Aggiungi l'allenamento alla lista
-                        self.workouts.append(workout)
-                        
-                        # Memorizza l'ID dell'allenamento
-                        self.workout_ids[workout.workout_name] = workout_id
-                        
-                        self.success_count += 1
-                
+                        downloaded[workout_id] = workout
                 except Exception as e:
                     logging.error(f"Errore nel download dell'allenamento '{name}': {str(e)}")
-                    self.error_count += 1
+                    error_count += 1
+            
+            # Conta successi/errori
+            self.success_count = len(downloaded)
+            self.error_count = error_count
+            
+            # Unisci i risultati nell'ordine di selezione, in un'unica operazione
+            results = [(wid, downloaded[wid]) for wid in selected_workouts if wid in downloaded]
+            self.after(0, lambda: self._merge_downloaded_workouts(results))
             
             # Chiudi la finestra di progresso
             self.after(0, self._close_progress)
             
-            # Aggiorna la lista degli allenamenti
-            self.after(0, self.update_workouts_list)
-            
             # Mostra il risultato
             if self.error_count == 0:
                 self.after(0, lambda: messagebox.showinfo(
@@ -1180,11 +1328,38 @@ class WorkoutsFrame(ttk.Frame):
             self.after(0, self._close_progress)
             
             # Mostra errore
+            error_msg = str(e)
             self.after(0, lambda: messagebox.showerror(
                 "Errore", 
-                f"Si è verificato un errore durante il download degli allenamenti: {str(e)}", 
+                f"Si è verificato un errore durante il download degli allenamenti: {error_msg}", 
                 parent=self
             ))
+        
+        finally:
+            # Registra nel log le metriche delle richieste dell'operazione
+            self.garmin_client.metrics.log_report("download")
+    
+    def _merge_downloaded_workouts(self, results):
+        """
+        Aggiunge alla lista gli allenamenti scaricati, aggiornando la vista una sola volta.
+        
+        Args:
+            results: Lista di tuple (workout_id, Workout) nell'ordine di selezione
+        """
+        new_workouts = []
+        for workout_id, workout in results:
+            placeholder = self._find_pending_workout(workout_id)
+            if placeholder is not None:
+                # Completa la riga di riepilogo già presente
+                self._apply_details(placeholder, workout)
+            else:
+                new_workouts.append(workout)
+            
+            # Memorizza l'ID dell'allenamento
+            self.workout_ids[workout.workout_name] = workout_id
+        
+        self.workouts.extend(new_workouts)
+        self.update_workouts_list()
     
     def _convert_garmin_to_internal(self, garmin_workout):
         """
@@ -1342,72 +1517,323 @@ class WorkoutsFrame(ttk.Frame):
     
 
     def _load_initial_workouts(self):
-            """Carica automaticamente gli allenamenti iniziali da Garmin Connect."""
-            try:
-                # Ottieni la lista degli allenamenti
-                remote_workouts = self.garmin_client.list_workouts()
-                
-                # Verifica se ci sono allenamenti
-                if not remote_workouts:
-                    self.after(0, lambda: self.controller.set_status("Nessun allenamento trovato su Garmin Connect."))
-                    return
-                
-                # Allenamenti a cui siamo interessati (limita a massimo 10 per velocizzare il caricamento iniziale)
-                selected_workouts = remote_workouts[:10]
-                
-                # Conta successi/errori
-                success_count = 0
-                error_count = 0
-                
-                # Imposta lo stato
-                self.after(0, lambda: self.controller.set_status("Caricamento iniziale degli allenamenti da Garmin Connect..."))
+        """
+        Carica automaticamente gli allenamenti iniziali da Garmin Connect.
+        
+        Tutti gli allenamenti vengono mostrati subito come righe di riepilogo
+        costruite dai dati di list_workouts; i dettagli completi vengono
+        scaricati solo quando un allenamento viene selezionato, modificato,
+        caricato o esportato.
+        """
+        try:
+            found_count = 0
+            
+            # Imposta lo stato
+            self.after(0, lambda: self.controller.set_status("Caricamento iniziale degli allenamenti da Garmin Connect..."))
+            
+            # Scorri la lista una pagina alla volta
+            for page in self.garmin_client.iter_workout_pages():
+                page_workouts = []
                 
-                # Per ogni allenamento
-                for workout in selected_workouts:
-                    try:
-                        # Ottieni l'ID dell'allenamento
-                        workout_id = workout.get("workoutId")
-                        
-                        if not workout_id:
-                            continue
-                        
-                        # Ottieni i dettagli dell'allenamento
-                        workout_detail = self.garmin_client.get_workout(workout_id)
-                        
-                        # Converti in formato interno
-                        internal_workout = self._convert_garmin_to_internal(workout_detail)
-                        
-                        if internal_workout:
-                            # Aggiungi l'allenamento alla lista
-                            self.workouts.append(internal_workout)
-                            
-                            # Memorizza l'ID dell'allenamento
-                            self.workout_ids[internal_workout.workout_name] = workout_id
-                            
-                            success_count += 1
+                for summary in page:
+                    if not summary.get("workoutId"):
+                        continue
                     
+                    try:
+                        page_workouts.append(self._workout_from_summary(summary))
                     except Exception as e:
-                        logging.error(f"Errore nel caricamento dell'allenamento {workout.get('workoutName', 'sconosciuto')}: {str(e)}")
-                        error_count += 1
+                        logging.error(f"Errore nel caricamento dell'allenamento {summary.get('workoutName', 'sconosciuto')}: {str(e)}")
                 
-                # Aggiorna la lista degli allenamenti
-                self.after(0, self.update_workouts_list)
+                found_count += len(page_workouts)
                 
-                # Aggiorna lo stato
-                if success_count > 0:
-                    self.after(0, lambda: self.controller.set_status(
-                        f"Caricati {success_count} allenamenti da Garmin Connect"
-                    ))
-                else:
-                    self.after(0, lambda: self.controller.set_status(
-                        "Nessun allenamento caricato da Garmin Connect"
-                    ))
+                # Mostra subito le righe della pagina
+                self.after(0, lambda page_workouts=page_workouts: self._add_workouts(page_workouts))
             
-            except Exception as e:
-                logging.error(f"Errore nel caricamento degli allenamenti iniziali: {str(e)}")
+            # Aggiorna lo stato
+            if found_count > 0:
                 self.after(0, lambda: self.controller.set_status(
-                    f"Errore nel caricamento degli allenamenti: {str(e)}"
+                    f"Trovati {found_count} allenamenti su Garmin Connect"
                 ))
+            else:
+                self.after(0, lambda: self.controller.set_status("Nessun allenamento trovato su Garmin Connect."))
+        
+        except Exception as e:
+            logging.error(f"Errore nel caricamento degli allenamenti iniziali: {str(e)}")
+            error_msg = str(e)
+            self.after(0, lambda: self.controller.set_status(
+                f"Errore nel caricamento degli allenamenti: {error_msg}"
+            ))
+    
+    def _add_workouts(self, workouts):
+        """
+        Aggiunge degli allenamenti alla lista e aggiorna la treeview.
+        
+        Args:
+            workouts: Lista di allenamenti da aggiungere
+        """
+        self.workouts.extend(workouts)
+        self.update_workouts_list()
+    
+    def _workout_from_summary(self, summary):
+        """
+        Crea una riga di riepilogo per un allenamento remoto, senza passi.
+        
+        Args:
+            summary: Riepilogo dell'allenamento restituito da list_workouts
+            
+        Returns:
+            Workout: Allenamento in attesa dei dettagli
+        """
+        workout = Workout(
+            summary.get("sportType", {}).get("sportTypeKey", "running"),
+            summary.get("workoutName", "Allenamento sconosciuto"),
+            summary.get("description")
+        )
+        
+        with self._details_lock:
+            self.pending_details[workout] = summary
+        
+        self.workout_ids[workout.workout_name] = summary["workoutId"]
+        return workout
+    
+    def _find_pending_workout(self, workout_id):
+        """
+        Cerca la riga di riepilogo di un allenamento remoto.
+        
+        Args:
+            workout_id: ID dell'allenamento su Garmin Connect
+            
+        Returns:
+            Workout: Allenamento in attesa dei dettagli o None
+        """
+        with self._details_lock:
+            for workout, summary in self.pending_details.items():
+                if summary.get("workoutId") == workout_id:
+                    return workout
+        return None
+    
+    def _apply_details(self, workout, loaded):
+        """
+        Copia i dettagli scaricati nella riga di riepilogo, mantenendone l'identità.
+        Da chiamare dal thread dell'interfaccia.
+        
+        Args:
+            workout: Allenamento in attesa dei dettagli
+            loaded: Allenamento completo convertito da Garmin Connect
+        """
+        workout.sport_type = loaded.sport_type
+        workout.description = loaded.description
+        workout.workout_steps = loaded.workout_steps
+        
+        with self._details_lock:
+            self.pending_details.pop(workout, None)
+            self.summary_states[workout] = self._summary_state(workout)
+    
+    def _summary_state(self, workout):
+        """
+        Restituisce lo stato di un allenamento usato per riconoscere le modifiche locali.
+        
+        Args:
+            workout: Allenamento
+            
+        Returns:
+            tuple: (hash del contenuto, data pianificata)
+        """
+        return workout_fingerprint(workout.garminconnect_json(shared=True)), workout.get_scheduled_date()
+    
+    def is_untouched_summary(self, workout):
+        """
+        Verifica se un allenamento remoto è ancora identico a Garmin Connect.
+        
+        Args:
+            workout: Allenamento da verificare
+            
+        Returns:
+            bool: True per le righe di riepilogo mai caricate o non modificate in locale
+        """
+        with self._details_lock:
+            if workout in self.pending_details:
+                return True
+            state = self.summary_states.get(workout)
+        
+        if state is None:
+            return False
+        try:
+            return self._summary_state(workout) == state
+        except ValueError:
+            return False
+    
+    def is_workout_loaded(self, workout):
+        """
+        Verifica se i dettagli di un allenamento sono disponibili.
+        
+        Args:
+            workout: Allenamento da verificare
+            
+        Returns:
+            bool: True se l'allenamento contiene già i suoi passi
+        """
+        return workout not in self.pending_details
+    
+    def _load_workout_details(self, workout):
+        """
+        Scarica e converte i dettagli di un allenamento di riepilogo (thread di lavoro).
+        
+        L'allenamento mostrato nell'interfaccia non viene modificato qui: i
+        dettagli vengono copiati dal thread dell'interfaccia in _finish_details.
+        
+        Args:
+            workout: Allenamento in attesa dei dettagli
+            
+        Returns:
+            Workout: Allenamento completo convertito da Garmin Connect, o None se
+                     i dettagli non sono più in attesa
+        """
+        with self._details_lock:
+            summary = self.pending_details.get(workout)
+        if summary is None:
+            return None
+        
+        workout_detail = self.garmin_client.get_workout(summary["workoutId"], summary.get("updateDate"))
+        loaded = self._convert_garmin_to_internal(workout_detail)
+        if loaded is None:
+            raise Exception(f"Conversione dell'allenamento '{workout.workout_name}' non riuscita")
+        
+        return loaded
+    
+    def load_workout_details_async(self, workout):
+        """
+        Avvia in background il caricamento dei dettagli di un allenamento.
+        
+        Il Future restituito viene completato dal thread dell'interfaccia dopo
+        che i dettagli sono stati copiati nell'allenamento: chi lo attende non
+        va quindi bloccato sul thread dell'interfaccia.
+        
+        Args:
+            workout: Allenamento da completare
+            
+        Returns:
+            Future: Caricamento in corso, o None se i dettagli sono già disponibili
+        """
+        with self._details_lock:
+            if workout not in self.pending_details:
+                return None
+            
+            future = self._details_futures.get(workout)
+            if future is None:
+                future = Future()
+                self._details_futures[workout] = future
+                loading = self._details_executor.submit(self._load_workout_details, workout)
+                loading.add_done_callback(
+                    lambda f, workout=workout, future=future:
+                        self.after(0, lambda: self._finish_details(workout, f, future))
+                )
+            
+            return future
+    
+    def _finish_details(self, workout, loading, future):
+        """
+        Applica i dettagli scaricati sul thread dell'interfaccia e completa il caricamento.
+        
+        Args:
+            workout: Allenamento in attesa dei dettagli
+            loading: Future del thread di lavoro con l'allenamento convertito
+            future: Future restituito da load_workout_details_async
+        """
+        with self._details_lock:
+            self._details_futures.pop(workout, None)
+            still_pending = workout in self.pending_details
+        
+        try:
+            loaded = loading.result()
+        except Exception as e:
+            future.set_exception(e)
+            return
+        
+        # L'allenamento potrebbe essere stato eliminato nel frattempo
+        if loaded is not None and still_pending:
+            self._apply_details(workout, loaded)
+            self._refresh_workout_row(workout)
+        
+        future.set_result(workout)
+    
+    def _refresh_workout_row(self, workout):
+        """
+        Aggiorna il numero di passi mostrato nella riga di un allenamento.
+        
+        Args:
+            workout: Allenamento da aggiornare
+        """
+        filtered_workouts = self.get_filtered_workouts()
+        if workout in filtered_workouts:
+            items = self.workout_tree.get_children()
+            index = filtered_workouts.index(workout)
+            if index < len(items):
+                self.workout_tree.set(items[index], "steps", workout.get_step_count())
+    
+    def ensure_workouts_loaded(self, workouts):
+        """
+        Carica (in parallelo) i dettagli mancanti e attende il completamento.
+        Da non chiamare dal thread dell'interfaccia, che deve applicare i dettagli.
+        
+        Args:
+            workouts: Lista di allenamenti da completare
+            
+        Returns:
+            int: Numero di allenamenti i cui dettagli non sono stati caricati
+        """
+        futures = [
+            (workout, self.load_workout_details_async(workout))
+            for workout in workouts
+        ]
+        
+        error_count = 0
+        for workout, future in futures:
+            if future is None:
+                continue
+            try:
+                future.result()
+            except Exception as e:
+                logging.error(f"Errore nel caricamento dei dettagli di '{workout.workout_name}': {str(e)}")
+                error_count += 1
+        
+        return error_count
+    
+    def _prefetch_details(self, filtered_workouts, index):
+        """
+        Precarica in background i dettagli delle righe vicine alla selezione.
+        
+        Args:
+            filtered_workouts: Allenamenti visualizzati nella lista
+            index: Indice della riga selezionata
+        """
+        first = max(0, index - PREFETCH_RADIUS)
+        last = min(len(filtered_workouts), index + PREFETCH_RADIUS + 1)
+        for workout in filtered_workouts[first:last]:
+            self.load_workout_details_async(workout)
+    
+    def _on_details_loaded(self, workout, future):
+        """
+        Aggiorna l'interfaccia al termine del caricamento dei dettagli selezionati.
+        
+        Args:
+            workout: Allenamento di cui sono stati caricati i dettagli
+            future: Caricamento completato
+        """
+        try:
+            future.result()
+        except Exception as e:
+            logging.error(f"Errore nel caricamento dei dettagli di '{workout.workout_name}': {str(e)}")
+            self.controller.set_status(f"Impossibile caricare i dettagli di '{workout.workout_name}'")
+            return
+        
+        self.controller.set_status(f"Dettagli di '{workout.workout_name}' caricati")
+        
+        # Mostra l'allenamento nell'editor se è ancora quello selezionato
+        if self.current_workout is workout:
+            self.workout_editor.load_workout(workout)
+            if hasattr(self.controller, 'zones_frame'):
+                self.controller.zones_frame.refresh_data()
 
     def _configure_treeview_tags(self):
         """Configura i tag per la formattazione della treeview."""
@@ -10,6 +10,9 @@ from tkinter import ttk, messagebox
 import logging
 import json
 
+from core.zones import compile_zones
+from core.zone_index import ZoneIndex, changed_zones
+
 class ZonesFrame(ttk.Frame):
     """Frame per la gestione delle zone di allenamento."""
     
@@ -1128,6 +1131,9 @@ class ZonesFrame(ttk.Frame):
     def save_zones(self):
         """Salva i valori delle zone nella configurazione."""
         try:
+            # Configurazione precedente, per individuare le zone modificate
+            old_config = dict(self.controller.config.get('workout_config', {}))
+            
             # Raccogli i valori attuali
             paces = {}
             pace_descriptions = {}
@@ -1173,15 +1179,29 @@ class ZonesFrame(ttk.Frame):
             # Salva la configurazione
             self.controller.save_config()
             
+            # Aggiorna i target degli allenamenti che usano le zone modificate
+            affected = self._update_affected_workouts(old_config)
+            
             # Aggiorna lo stato
             self.status_var.set("Zone salvate con successo")
             
             # Notifica all'utente
-            messagebox.showinfo(
-                "Salvataggio completato", 
-                "I valori delle zone e i margini sono stati salvati con successo.",
-                parent=self
-            )
+            message = "I valori delle zone e i margini sono stati salvati con successo."
+            if not affected:
+                messagebox.showinfo("Salvataggio completato", message, parent=self)
+                return
+            
+            message += f"\n\nLa modifica interessa {len(affected)} allenamenti."
+            client = self.controller.garmin_client
+            if client and client.is_logged_in():
+                if messagebox.askyesno(
+                    "Salvataggio completato",
+                    f"{message} Caricarli ora su Garmin Connect?",
+                    parent=self
+                ):
+                    self.controller.workouts_frame.upload_workouts(affected)
+            else:
+                messagebox.showinfo("Salvataggio completato", message, parent=self)
         
         except Exception as e:
             logging.error(f"Errore nel salvataggio delle zone: {str(e)}")
@@ -1194,6 +1214,33 @@ class ZonesFrame(ttk.Frame):
                 parent=self
             )
     
+    def _update_affected_workouts(self, old_config):
+        """
+        Ricalcola i target degli allenamenti che usano zone modificate.
+        
+        Args:
+            old_config: workout_config precedente al salvataggio
+            
+        Returns:
+            list: Allenamenti i cui target sono cambiati
+        """
+        workouts_frame = getattr(self.controller, 'workouts_frame', None)
+        if workouts_frame is None:
+            return []
+        
+        new_zones = compile_zones(self.controller.config.get('workout_config', {}))
+        changed = changed_zones(compile_zones(old_config), new_zones)
+        if not changed:
+            return []
+        
+        # Solo i passi che usano le zone modificate vengono aggiornati
+        affected = ZoneIndex(workouts_frame.workouts).retarget(changed, new_zones)
+        logging.info(f"Zone modificate: {len(changed)}, allenamenti interessati: {len(affected)}")
+        
+        if affected:
+            workouts_frame.update_workouts_list()
+        return affected
+    
     def setup_margins_tab(self, parent):
         """
         Configura la tab dei margini.
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Fixture comuni dei test: un client Garmin Connect in memoria e una
+libreria di allenamenti di esempio.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.workout import Workout, WorkoutStep, Target
+
+# Configurazione delle zone usata dai test (ritmi, frequenze cardiache e potenze)
+WORKOUT_CONFIG = {
+    "margins": {"faster": "0:03", "slower": "0:03", "hr_up": 5, "hr_down": 5,
+                "power_up": 10, "power_down": 10},
+    "paces": {"Z2": "6:00", "Z4": "5:00", "tempo": "5:10-4:50"},
+    "swim_paces": {"Z2": "2:00"},
+    "heart_rates": {"max_hr": 180, "Z1_HR": "62-76% max_hr", "Z2_HR": "130-150", "easy": "140"},
+    "power_values": {"ftp": 250, "Z5": "375+", "Z1": "<125", "threshold": "235-265"},
+    "name_prefix": "non influisce sulle zone",
+}
+
+
+class FakeCalendar:
+    """Calendario in memoria: data -> lista di pianificazioni"""
+
+    def __init__(self):
+        self.items = {}
+        self.available = True
+
+    def prefetch(self, start, end, force=False):
+        if not self.available:
+            raise RuntimeError("calendario non disponibile")
+
+    def scheduled_workouts(self, start, end):
+        return {date: list(items) for date, items in self.items.items() if start <= date <= end}
+
+
+class FakeGarminClient:
+    """Client Garmin Connect in memoria che registra le richieste ricevute"""
+
+    def __init__(self):
+        self.remote = {}
+        self.next_id = 100
+        self.next_schedule_id = 1000
+        self.requests = []
+        self.fail_schedule = False
+        self.calendar = FakeCalendar()
+
+    def list_workouts(self):
+        return [{"workoutId": workout_id, "workoutName": detail["workoutName"]}
+                for workout_id, detail in self.remote.items()]
+
+    def get_workout(self, workout_id, update_date=None):
+        return self.remote.get(workout_id)
+
+    def add_workout(self, workout):
+        self.next_id += 1
+        self.remote[self.next_id] = workout.garminconnect_json()
+        self.requests.append(("POST", workout.workout_name))
+        return {"workoutId": self.next_id}
+
+    def update_workout(self, workout_id, workout):
+        if workout_id not in self.remote:
+            raise RuntimeError(f"allenamento {workout_id} inesistente")
+        self.remote[workout_id] = workout.garminconnect_json()
+        self.requests.append(("PUT", workout.workout_name))
+
+    def delete_workout(self, workout_id):
+        del self.remote[workout_id]
+        self.requests.append(("DELETE", workout_id))
+
+    def schedule_workout(self, workout_id, date):
+        self.requests.append(("SCHEDULE", workout_id, date))
+        if self.fail_schedule:
+            raise RuntimeError("pianificazione non riuscita")
+        self.next_schedule_id += 1
+        self.calendar.items.setdefault(date, []).append({"id": self.next_schedule_id, "workoutId": workout_id})
+        return {"workoutScheduleId": self.next_schedule_id}
+
+    def unschedule_workout(self, schedule_id):
+        self.requests.append(("UNSCHEDULE", schedule_id))
+        for items in self.calendar.items.values():
+            items[:] = [item for item in items if item["id"] != schedule_id]
+
+    def count(self, method):
+        return sum(1 for request in self.requests if request[0] == method)
+
+
+def make_workout(name, minutes=10, date=None, zone="Z2"):
+    """
+    Crea un allenamento di corsa con riscaldamento e una ripetizione.
+
+    Args:
+        name: Nome dell'allenamento
+        minutes: Durata del riscaldamento in minuti
+        date: Data pianificata (opzionale)
+        zone: Zona di ritmo delle ripetute
+
+    Returns:
+        Workout: Allenamento di esempio
+    """
+    workout = Workout("running", name)
+    workout.add_step(WorkoutStep(0, "warmup", "Riscaldamento", "time", f"{minutes}min"))
+    repeat = WorkoutStep(0, "repeat", "", "iterations", 4)
+    target = Target("pace.zone", 3.8, 3.5)
+    target.zone_name = zone
+    repeat.add_step(WorkoutStep(0, "interval", "Ripetuta", "distance", "1km", target))
+    repeat.add_step(WorkoutStep(0, "recovery", "Recupero", "time", "2:00"))
+    workout.add_step(repeat)
+    if date:
+        workout.set_scheduled_date(date)
+    return workout
+
+
+def make_library(count=3, minutes=10):
+    """
+    Crea una libreria di allenamenti pianificati in giorni consecutivi.
+
+    Args:
+        count: Numero di allenamenti
+        minutes: Durata del riscaldamento in minuti
+
+    Returns:
+        list: Allenamenti W0, W1, ... dal 2026-11-01
+    """
+    return [make_workout(f"W{i}", minutes=minutes, date=f"2026-11-{i + 1:02d}") for i in range(count)]
+
+
+def run_upload(client, workouts, journal_path=None, schedule=True, replace=True, **options):
+    """
+    Pianifica ed esegue un caricamento completo sul client in memoria.
+
+    Returns:
+        tuple: (SyncPlan, UploadReport)
+    """
+    from core.sync_planner import SyncPlanner
+    from core.upload_journal import UploadJournal
+    from core.uploader import UploadEngine
+
+    journal = UploadJournal(journal_path) if journal_path else None
+    plan = SyncPlanner(client).plan(workouts, client.list_workouts(), replace=replace)
+    engine = UploadEngine(client, 2, journal=journal)
+    return plan, engine.execute(plan, schedule=schedule, **options)
+
+
+@pytest.fixture
+def client():
+    return FakeGarminClient()
+
+
+@pytest.fixture
+def journal_path(tmp_path):
+    return str(tmp_path / "upload_journal.jsonl")
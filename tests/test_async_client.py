@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from core.async_client import fetch_workout_details
+
+from conftest import make_workout
+
+
+def test_fetch_workout_details_passes_update_date(client):
+    client.remote[1] = make_workout("A").garminconnect_json()
+    client.remote[2] = make_workout("B").garminconnect_json()
+    calls = []
+    get_workout = client.get_workout
+    client.get_workout = lambda workout_id, update_date=None: calls.append((workout_id, update_date)) or get_workout(workout_id)
+
+    summaries = [{"workoutId": 1, "updateDate": "2026-10-01"}, {"workoutId": 2, "updateDate": "2026-10-02"}]
+    progress = []
+    details = fetch_workout_details(client, summaries, 2, lambda done, total, summary, detail: progress.append(done))
+
+    assert sorted(calls) == [(1, "2026-10-01"), (2, "2026-10-02")]
+    assert details == {1: client.remote[1], 2: client.remote[2]}
+    assert sorted(progress) == [1, 2]
+
+
+def test_fetch_workout_details_errors_become_none(client):
+    client.remote[1] = make_workout("A").garminconnect_json()
+
+    def get_workout(workout_id, update_date=None):
+        if workout_id == 2:
+            raise RuntimeError("errore di rete")
+        return client.remote[workout_id]
+
+    client.get_workout = get_workout
+    details = fetch_workout_details(client, [{"workoutId": 1}, {"workoutId": 2}])
+    assert details == {1: client.remote[1], 2: None}
+
+
+def test_fetch_workout_details_without_summaries(client):
+    assert fetch_workout_details(client, []) == {}
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import threading
+
+from core.calendar_service import CalendarService, months_between
+
+
+class CalendarClient:
+    """Client che restituisce un calendario modificabile e conta i mesi scaricati"""
+
+    def __init__(self):
+        self.items = []
+        self.fetched = []
+        self._lock = threading.Lock()
+
+    def get_calendar(self, year, month):
+        with self._lock:
+            self.fetched.append((year, month))
+        prefix = f"{year:04d}-{month:02d}-"
+        return {"calendarItems": [dict(item) for item in self.items if item["date"].startswith(prefix)]}
+
+
+def _workout(schedule_id, date, workout_id=1):
+    return {"id": schedule_id, "date": date, "itemType": "workout", "workoutId": workout_id}
+
+
+def test_months_between():
+    assert months_between("2026-11-20", "2027-02-01") == [(2026, 11), (2026, 12), (2027, 1), (2027, 2)]
+    assert months_between("2026-12-01", "2026-11-01") == [(2026, 11), (2026, 12)]
+
+
+def test_prefetch_downloads_each_month_once():
+    client = CalendarClient()
+    calendar = CalendarService(client)
+    calendar.prefetch("2026-11-01", "2027-01-31")
+    calendar.prefetch("2026-12-01", "2026-12-31")
+    assert sorted(client.fetched) == [(2026, 11), (2026, 12), (2027, 1)]
+
+
+def test_scheduled_workouts_uses_the_index():
+    client = CalendarClient()
+    client.items = [_workout(1, "2026-11-02"), _workout(2, "2026-12-05"),
+                    {"id": 3, "date": "2026-11-03", "itemType": "note"}]
+    calendar = CalendarService(client)
+    assert calendar.scheduled_workouts("2026-11-01", "2026-11-30") == {"2026-11-02": [_workout(1, "2026-11-02")]}
+    assert calendar.items_on("2026-11-03") == [{"id": 3, "date": "2026-11-03", "itemType": "note"}]
+
+
+def test_invalidate_date_clears_the_month_index():
+    client = CalendarClient()
+    client.items = [_workout(1, "2026-11-02"), _workout(2, "2026-12-05")]
+    calendar = CalendarService(client)
+    calendar.prefetch("2026-11-01", "2026-12-31")
+
+    # La pianificazione viene rimossa su Garmin Connect
+    client.items = [_workout(2, "2026-12-05")]
+    calendar.invalidate("2026-11-15")
+
+    assert "2026-11-02" not in calendar._index
+    assert "2026-12-05" in calendar._index
+    assert calendar.scheduled_workouts("2026-11-01", "2026-12-31") == {"2026-12-05": [_workout(2, "2026-12-05")]}
+    assert client.fetched.count((2026, 11)) == 2
+    assert client.fetched.count((2026, 12)) == 1
+
+
+def test_invalidate_item_refetches_its_month():
+    client = CalendarClient()
+    client.items = [_workout(1, "2026-11-02")]
+    calendar = CalendarService(client)
+    calendar.prefetch("2026-11-01", "2026-11-30")
+
+    client.items = []
+    calendar.invalidate_item(1)
+    assert calendar.items_on("2026-11-02") == []
+    assert client.fetched == [(2026, 11), (2026, 11)]
@@ -0,0 +1,19 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import cli
+
+
+def test_delete_missing_requires_confirmation(capsys):
+    args = cli.parse_args(["piano-inesistente.yaml", "--delete-missing"])
+    assert cli.run(args) == cli.EXIT_FAILURE
+    assert "--yes" in capsys.readouterr().err
+
+
+def test_delete_missing_confirmed_goes_on(tmp_path):
+    # Con --yes la richiesta prosegue fino alla lettura del piano
+    report = tmp_path / "report.json"
+    args = cli.parse_args([str(tmp_path / "mancante.yaml"), "--delete-missing", "--yes",
+                           "--config", str(tmp_path / "config.json"), "--report", str(report)])
+    assert cli.run(args) == cli.EXIT_FAILURE
+    assert "mancante.yaml" in report.read_text(encoding="utf-8")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from core.metrics import MetricsRegistry
+from gui import workouts_frame
+from gui.workouts_frame import WorkoutsFrame
+
+from conftest import make_workout
+
+
+class DownloadFrame:
+    """Parte di WorkoutsFrame usata dal thread di download, senza widget Tk"""
+
+    _download_workouts_thread = WorkoutsFrame._download_workouts_thread
+    _convert_garmin_to_internal = WorkoutsFrame._convert_garmin_to_internal
+    _convert_garmin_step = WorkoutsFrame._convert_garmin_step
+
+    def __init__(self, client):
+        self.garmin_client = client
+        self.controller = type("Controller", (), {"config": {"download_concurrency": 3}})()
+        self.merged = None
+        self.progress = []
+
+    def after(self, delay, callback):
+        callback()
+
+    def _show_progress_dialog(self, selected):
+        pass
+
+    def _update_progress(self, done, total, name):
+        self.progress.append(done)
+
+    def _close_progress(self):
+        pass
+
+    def _merge_downloaded_workouts(self, results):
+        self.merged = results
+
+
+class FakeMessagebox:
+    def __init__(self):
+        self.shown = []
+
+    def __getattr__(self, name):
+        return lambda title, message, parent=None: self.shown.append((name, title))
+
+
+def test_download_keeps_selection_order_and_counts_errors(client, monkeypatch):
+    messages = FakeMessagebox()
+    monkeypatch.setattr(workouts_frame, "messagebox", messages)
+    client.metrics = MetricsRegistry()
+    for workout_id in (1, 2, 3, 4):
+        client.remote[workout_id] = make_workout(f"W{workout_id}").garminconnect_json()
+    get_workout = client.get_workout
+
+    def flaky_get_workout(workout_id, update_date=None):
+        if workout_id == 3:
+            raise RuntimeError("errore di rete")
+        return get_workout(workout_id)
+
+    client.get_workout = flaky_get_workout
+    frame = DownloadFrame(client)
+    frame._download_workouts_thread([4, 1, 3, 2], client.list_workouts())
+
+    assert [workout_id for workout_id, _ in frame.merged] == [4, 1, 2]
+    assert [workout.workout_name for _, workout in frame.merged] == ["W4", "W1", "W2"]
+    assert (frame.success_count, frame.error_count) == (3, 1)
+    assert sorted(frame.progress) == [1, 2, 3, 4]
+    assert messages.shown == [("showwarning", "Completato con errori")]
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from gui.workouts_frame import WorkoutsFrame
+
+from conftest import make_workout
+
+
+class DetailsFrame:
+    """Parte di WorkoutsFrame che gestisce i dettagli caricati in background, senza widget Tk"""
+
+    _workout_from_summary = WorkoutsFrame._workout_from_summary
+    _load_workout_details = WorkoutsFrame._load_workout_details
+    load_workout_details_async = WorkoutsFrame.load_workout_details_async
+    _finish_details = WorkoutsFrame._finish_details
+    _apply_details = WorkoutsFrame._apply_details
+    _summary_state = WorkoutsFrame._summary_state
+    is_workout_loaded = WorkoutsFrame.is_workout_loaded
+    ensure_workouts_loaded = WorkoutsFrame.ensure_workouts_loaded
+    _convert_garmin_to_internal = WorkoutsFrame._convert_garmin_to_internal
+    _convert_garmin_step = WorkoutsFrame._convert_garmin_step
+
+    def __init__(self, client):
+        self.garmin_client = client
+        self.pending_details = {}
+        self.summary_states = {}
+        self.workout_ids = {}
+        self._details_futures = {}
+        self._details_lock = threading.Lock()
+        self._details_executor = ThreadPoolExecutor(max_workers=2)
+        self.ui_thread = threading.current_thread()
+        self.scheduled = []
+        self.applied_on = []
+
+    def after(self, delay, callback):
+        # Coda degli eventi del thread dell'interfaccia
+        self.scheduled.append(callback)
+
+    def run_events(self):
+        while self.scheduled:
+            self.scheduled.pop(0)()
+
+    def _refresh_workout_row(self, workout):
+        self.applied_on.append(threading.current_thread())
+
+
+def test_details_are_applied_on_the_ui_thread(client):
+    client.remote[1] = make_workout("W01S01").garminconnect_json()
+    frame = DetailsFrame(client)
+    workout = frame._workout_from_summary({"workoutId": 1, "workoutName": "W01S01"})
+
+    future = frame.load_workout_details_async(workout)
+    assert frame.load_workout_details_async(workout) is future
+    frame._details_executor.shutdown(wait=True)
+
+    # Il thread di lavoro ha solo scaricato e convertito i dettagli
+    assert not future.done()
+    assert workout.get_step_count() == 0
+    assert not frame.is_workout_loaded(workout)
+
+    frame.run_events()
+    assert future.result() is workout
+    assert workout.get_step_count() == make_workout("W01S01").get_step_count()
+    assert frame.is_workout_loaded(workout)
+    assert frame.applied_on == [frame.ui_thread]
+
+
+def test_ensure_loaded_waits_for_the_ui_thread(client):
+    client.remote[1] = make_workout("A").garminconnect_json()
+    frame = DetailsFrame(client)
+    workouts = [frame._workout_from_summary({"workoutId": i, "workoutName": n}) for i, n in ((1, "A"), (2, "B"))]
+
+    errors = []
+    waiter = threading.Thread(target=lambda: errors.append(frame.ensure_workouts_loaded(workouts)))
+    waiter.start()
+    while waiter.is_alive():
+        frame.run_events()
+        waiter.join(0.01)
+
+    assert errors == [1]
+    assert frame.is_workout_loaded(workouts[0])
+    assert not frame.is_workout_loaded(workouts[1])
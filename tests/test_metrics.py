@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from core.metrics import MetricsRegistry, RequestTimer, endpoint_name, format_metrics, percentile
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+
+class HTTPError(Exception):
+    def __init__(self, response):
+        super().__init__(f"HTTP {response.status_code}")
+        self.response = response
+
+
+def _stats(registry, name="GET /workout-service/workout/{id}"):
+    return registry.snapshot()[name]
+
+
+def test_endpoint_name_replaces_ids():
+    assert endpoint_name("get", "/workout-service/workout/123") == "GET /workout-service/workout/{id}"
+    assert endpoint_name("POST", "/workout-service/schedule/9/x") == "POST /workout-service/schedule/{id}/x"
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([], 50) is None
+
+
+def test_status_and_size_come_from_the_response():
+    registry = MetricsRegistry()
+    with RequestTimer(registry, "GET", "/workout-service/workout/1") as timer:
+        timer.finish(FakeResponse(201, b'{"a": 1}'))
+    with RequestTimer(registry, "GET", "/workout-service/workout/2") as timer:
+        timer.finish(FakeResponse(200, b"", {"Content-Length": "1234"}))
+
+    stats = _stats(registry)
+    assert stats["statuses"] == {"201": 1, "200": 1}
+    assert stats["bytes_received"] == len(b'{"a": 1}') + 1234
+    assert stats["errors"] == 0
+
+
+def test_success_without_status_is_unknown():
+    registry = MetricsRegistry()
+    with RequestTimer(registry, "GET", "/workout-service/workout/1") as timer:
+        timer.finish({"workoutId": 1})
+    stats = _stats(registry)
+    assert stats["statuses"] == {"unknown": 1}
+    assert stats["errors"] == 0
+    assert stats["bytes_received"] == 0
+
+
+def test_failures_are_recorded_with_their_status():
+    registry = MetricsRegistry()
+    with pytest.raises(HTTPError):
+        with RequestTimer(registry, "GET", "/workout-service/workout/1"):
+            raise HTTPError(FakeResponse(404))
+    with pytest.raises(RuntimeError):
+        with RequestTimer(registry, "GET", "/workout-service/workout/2"):
+            raise RuntimeError("rete")
+
+    stats = _stats(registry)
+    assert stats["statuses"] == {"404": 1, "error": 1}
+    assert stats["errors"] == 2
+
+
+def test_retries_and_report():
+    registry = MetricsRegistry()
+    with RequestTimer(registry, "PUT", "/workout-service/workout/1", {"workoutName": "W"}) as timer:
+        counted = timer.wrap(lambda: FakeResponse(204))
+        counted()
+        timer.finish(counted())
+
+    stats = _stats(registry, "PUT /workout-service/workout/{id}")
+    assert stats["retries"] == 1
+    assert stats["bytes_sent"] == len('{"workoutName":"W"}')
+    assert format_metrics(registry.snapshot()) == registry.format_report()
+    assert registry.format_report().startswith("PUT /workout-service/workout/{id}: 1 chiamate, 0 errori")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from core import rate_limiter
+from core.rate_limiter import AdaptiveConcurrency, RateLimiter, parse_retry_after
+
+
+class FakeResponse:
+    def __init__(self, status_code, retry_after=None):
+        self.status_code = status_code
+        self.headers = {"Retry-After": retry_after} if retry_after else {}
+
+
+class HTTPError(Exception):
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"HTTP {status_code}")
+        self.response = FakeResponse(status_code, retry_after)
+
+
+class ConnectionError(Exception):
+    pass
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    calls = []
+    monkeypatch.setattr(rate_limiter.time, "sleep", calls.append)
+    return calls
+
+
+def _failing(*errors, result="ok"):
+    errors = list(errors)
+
+    def func():
+        if errors:
+            raise errors.pop(0)
+        return result
+    return func
+
+
+def test_retries_transient_errors(sleeps):
+    limiter = RateLimiter(rate=1000, burst=1000)
+    assert limiter.call(_failing(HTTPError(502), ConnectionError())) == "ok"
+    assert len(sleeps) == 2
+
+
+def test_retry_after_is_respected_and_throttles(sleeps):
+    limiter = RateLimiter(rate=1000, burst=1000, max_concurrency=8)
+    limiter.concurrency = AdaptiveConcurrency(initial=8, maximum=8)
+    assert limiter.call(_failing(HTTPError(429, "7"))) == "ok"
+    assert sleeps == [7.0]
+    assert limiter.concurrency.limit == 4
+
+
+def test_non_idempotent_only_retries_429(sleeps):
+    limiter = RateLimiter(rate=1000, burst=1000)
+    with pytest.raises(HTTPError):
+        limiter.call(_failing(HTTPError(502)), idempotent=False)
+    assert limiter.call(_failing(HTTPError(429)), idempotent=False) == "ok"
+
+
+def test_gives_up_after_max_retries(sleeps):
+    limiter = RateLimiter(rate=1000, burst=1000, max_retries=2)
+    with pytest.raises(HTTPError):
+        limiter.call(_failing(*[HTTPError(503)] * 3))
+    assert len(sleeps) == 2
+
+
+def test_client_errors_are_not_retried(sleeps):
+    with pytest.raises(HTTPError):
+        RateLimiter(rate=1000, burst=1000).call(_failing(HTTPError(404)))
+    assert sleeps == []
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("12") == 12.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("") is None
+    assert parse_retry_after("mai") is None
+
+
+def test_adaptive_concurrency_aimd():
+    concurrency = AdaptiveConcurrency(initial=4, minimum=1, maximum=6)
+    concurrency.on_throttle()
+    assert concurrency.limit == 2
+    for _ in range(10):
+        concurrency.on_success()
+    assert concurrency.limit > 2
+    for _ in range(10):
+        concurrency.on_throttle()
+    assert concurrency.limit == 1
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from core.step_parser import StepSpec, parse_end, parse_step
+
+
+@pytest.mark.parametrize("detail, expected", [
+    ("10min @ Z2 -- Fondo lento", StepSpec('time', '10min', 'pace.zone', 'Z2', 'Fondo lento')),
+    ("400m @pwr Z4", StepSpec('distance', '400m', 'power.zone', 'Z4', '')),
+    ("1:30 @hr Z1_HR", StepSpec('time', '1:30', 'heart.rate.zone', 'Z1_HR', '')),
+    ("1:30 @ Z2", StepSpec('time', '1:30', 'pace.zone', 'Z2', '')),
+    ("2.5km", StepSpec('distance', '2.5km', 'no.target', None, '')),
+    ("20s", StepSpec('time', '20s', 'no.target', None, '')),
+    ("1:00:00 @spd Z3", StepSpec('time', '1:00:00', 'speed.zone', 'Z3', '')),
+    ("lap-button -- Fino al lap", StepSpec('lap.button', None, 'no.target', None, 'Fino al lap')),
+    ("@ Z3", StepSpec('lap.button', None, 'pace.zone', 'Z3', '')),
+    ("", StepSpec('lap.button', None, 'no.target', None, '')),
+])
+def test_parse_step(detail, expected):
+    assert parse_step(detail) == expected
+
+
+def test_parse_step_keeps_only_first_description():
+    assert parse_step("5min -- Primo -- Secondo").description == "Primo"
+
+
+def test_parse_step_none_is_lap_button():
+    assert parse_step(None) == StepSpec('lap.button', None, 'no.target', None, '')
+
+
+def test_parse_step_is_cached():
+    parse_step.cache_clear()
+    first = parse_step("3km @ Z3")
+    assert parse_step("3km @ Z3") is first
+    assert parse_step.cache_info().hits == 1
+
+
+@pytest.mark.parametrize("token, expected", [
+    ("10min", ('time', '10min')),
+    (" 45s ", ('time', '45s')),
+    ("1:30", ('time', '1:30')),
+    ("800m", ('distance', '800m')),
+    ("lap-button", ('lap.button', None)),
+    ("qualcosa", ('lap.button', None)),
+])
+def test_parse_end(token, expected):
+    assert parse_end(token) == expected
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from core.sync_planner import (ACTION_CREATE, ACTION_UNCHANGED, ACTION_UPDATE, SyncPlan, SyncPlanner,
+                               normalize_workout_json, workout_fingerprint)
+
+from conftest import make_workout
+
+
+def _actions(plan):
+    return {op.workout.workout_name: (op.action, op.workout_id) for op in plan.operations}
+
+
+def test_fingerprint_ignores_server_fields_and_number_formats():
+    local = make_workout("W01S01").garminconnect_json()
+    remote = make_workout("W01S01").garminconnect_json()
+    remote.update({"workoutId": 42, "updateDate": "2026-10-01T10:00:00.0", "owner": 7})
+    step = remote["workoutSegments"][0]["workoutSteps"][0]
+    step.update({"stepId": 9001, "stepOrder": 5, "endConditionValue": "600.0"})
+
+    assert workout_fingerprint(remote) == workout_fingerprint(local)
+
+
+def test_fingerprint_changes_with_content():
+    base = workout_fingerprint(make_workout("W01S01").garminconnect_json())
+    assert workout_fingerprint(make_workout("W01S01", minutes=15).garminconnect_json()) != base
+    assert workout_fingerprint(make_workout("W01S02").garminconnect_json()) != base
+
+
+def test_normalize_flattens_segments():
+    normalized = normalize_workout_json(make_workout("W01S01").garminconnect_json())
+    assert [step["stepType"] for step in normalized["workoutSteps"]] == ["warmup", "repeat"]
+    assert normalized["workoutSteps"][1]["numberOfIterations"] == 4.0
+
+
+def test_plan_create_update_unchanged_delete(client):
+    client.remote[1] = make_workout("Invariato").garminconnect_json()
+    client.remote[2] = make_workout("Modificato").garminconnect_json()
+    client.remote[3] = make_workout("Obsoleto").garminconnect_json()
+    workouts = [make_workout("Invariato"), make_workout("Modificato", minutes=20), make_workout("Nuovo")]
+
+    plan = SyncPlanner(client).plan(workouts, client.list_workouts(), delete_missing=True)
+
+    assert _actions(plan) == {
+        "Invariato": (ACTION_UNCHANGED, 1),
+        "Modificato": (ACTION_UPDATE, 2),
+        "Nuovo": (ACTION_CREATE, None),
+    }
+    assert plan.deletes == [(3, "Obsoleto")]
+    assert plan.describe() == "1 da creare, 1 da aggiornare, 1 invariati, 1 da eliminare"
+
+
+def test_plan_without_replace_creates_everything(client):
+    client.remote[1] = make_workout("Invariato").garminconnect_json()
+    plan = SyncPlanner(client).plan([make_workout("Invariato")], client.list_workouts(), replace=False)
+    assert _actions(plan) == {"Invariato": (ACTION_CREATE, None)}
+    assert plan.deletes == []
+
+
+def test_plan_updates_when_remote_detail_unavailable(client):
+    client.remote[1] = make_workout("Illeggibile").garminconnect_json()
+    client.get_workout = lambda workout_id, update_date=None: None
+    plan = SyncPlanner(client).plan([make_workout("Illeggibile")], client.list_workouts())
+    assert _actions(plan) == {"Illeggibile": (ACTION_UPDATE, 1)}
+
+
+def test_plan_by_name():
+    plan = SyncPlan.by_name([make_workout("A"), make_workout("B")], {"A": 7}, replace=True)
+    assert _actions(plan) == {"A": (ACTION_UPDATE, 7), "B": (ACTION_CREATE, None)}
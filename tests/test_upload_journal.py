@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+
+from core.sync_planner import ACTION_CREATE, ACTION_UPDATE, SyncOperation, SyncPlan, SyncPlanner
+from core.upload_journal import UploadJournal
+from core.uploader import UploadEngine, UploadResult
+
+from conftest import make_library, make_workout, run_upload
+
+
+def test_journal_removed_after_clean_run(client, journal_path):
+    run_upload(client, make_library(), journal_path)
+    assert not os.path.exists(journal_path)
+
+
+def test_journal_kept_after_schedule_failure(client, journal_path):
+    client.fail_schedule = True
+    _, report = run_upload(client, make_library(), journal_path)
+    assert report.schedule_error_count == 3
+    assert os.path.exists(journal_path)
+
+
+def test_journal_resumes_creations_without_replace(client, journal_path):
+    client.fail_schedule = True
+    run_upload(client, make_library(), journal_path, replace=False)
+    created = set(client.remote)
+    client.fail_schedule = False
+    client.requests.clear()
+
+    # Stesso piano ripreso: gli allenamenti già creati non vengono duplicati
+    plan, report = run_upload(client, make_library(), journal_path, replace=False)
+
+    assert plan.count(ACTION_CREATE) == 3
+    assert client.count("POST") == 0
+    assert report.resumed_count == 3
+    assert set(client.remote) == created
+    assert {r.workout_id for r in report.results} == created
+    assert client.count("SCHEDULE") == 3
+    assert not os.path.exists(journal_path)
+
+
+def test_journal_does_not_hide_workout_deleted_remotely(client, journal_path):
+    client.fail_schedule = True
+    run_upload(client, make_library(), journal_path)
+
+    # L'utente elimina W0 su Garmin Connect prima di riprovare
+    deleted_id = next(i for i, detail in client.remote.items() if detail["workoutName"] == "W0")
+    del client.remote[deleted_id]
+    client.fail_schedule = False
+    client.requests.clear()
+
+    plan, report = run_upload(client, make_library(), journal_path)
+
+    assert plan.count(ACTION_CREATE) == 1
+    assert client.requests.count(("POST", "W0")) == 1
+    assert report.resumed_count == 0
+    assert report.error_count == 0
+    assert "W0" in {detail["workoutName"] for detail in client.remote.values()}
+    new_id = next(r.workout_id for r in report.results if r.workout.workout_name == "W0")
+    assert new_id != deleted_id
+    assert ("SCHEDULE", new_id, "2026-11-01") in client.requests
+
+
+def test_journal_does_not_resume_creation_deleted_remotely(client, journal_path):
+    client.fail_schedule = True
+    run_upload(client, make_library(count=1), journal_path, replace=False)
+    client.remote.clear()
+    client.fail_schedule = False
+    client.requests.clear()
+
+    _, report = run_upload(client, make_library(count=1), journal_path, replace=False)
+    assert client.count("POST") == 1
+    assert report.resumed_count == 0
+
+
+def test_journal_does_not_override_calendar(client, journal_path):
+    client.fail_schedule = True
+    run_upload(client, make_library(count=1), journal_path)
+    workout_id = next(iter(client.remote))
+
+    # Il journal registra una pianificazione che il calendario non contiene
+    journal = UploadJournal(journal_path)
+    journal.record_scheduled("W0", workout_id, "2026-11-01")
+    client.fail_schedule = False
+    client.requests.clear()
+
+    run_upload(client, make_library(count=1), journal_path)
+    assert client.requests == [("SCHEDULE", workout_id, "2026-11-01")]
+
+
+def test_journal_used_for_schedule_when_calendar_unavailable(client, journal_path):
+    client.fail_schedule = True
+    run_upload(client, make_library(count=1), journal_path)
+    workout_id = next(iter(client.remote))
+    UploadJournal(journal_path).record_scheduled("W0", workout_id, "2026-11-01")
+    client.calendar.available = False
+    client.fail_schedule = False
+    client.requests.clear()
+
+    _, report = run_upload(client, make_library(count=1), journal_path)
+    assert client.count("SCHEDULE") == 0
+    assert report.already_scheduled_count == 1
+
+
+def test_journal_skips_update_already_sent(client, journal_path):
+    client.remote[1] = make_workout("W0").garminconnect_json()
+    workout = make_workout("W0", minutes=20)
+    plan = SyncPlan([SyncOperation(workout, ACTION_UPDATE, 1)])
+
+    # Caricamento interrotto dopo l'aggiornamento
+    journal = UploadJournal(journal_path)
+    journal.begin(plan)
+    UploadEngine(client, 1, journal=journal)._upload_one(UploadResult(workout), plan.operations[0])
+    client.requests.clear()
+
+    # Stesso piano ripreso: l'aggiornamento già confermato non viene ripetuto
+    report = UploadEngine(client, 1, journal=UploadJournal(journal_path)).execute(plan, schedule=False)
+    assert client.count("PUT") == 0
+    assert report.resumed_count == 1
+
+
+def test_journal_discarded_for_different_plan(client, journal_path):
+    client.fail_schedule = True
+    run_upload(client, make_library(), journal_path)
+    assert UploadJournal(journal_path).has_pending()
+
+    plan = SyncPlanner(client).plan(make_library(minutes=15), client.list_workouts())
+    journal = UploadJournal(journal_path)
+    journal.begin(plan)
+    assert not journal.has_pending()
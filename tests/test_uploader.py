@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from conftest import make_library, run_upload
+
+
+def test_sync_schedule_sends_only_missing_dates(client):
+    _, report = run_upload(client, make_library())
+    assert client.count("SCHEDULE") == 3
+    assert report.scheduled_count == 3
+
+    # Secondo caricamento: il calendario è già allineato
+    client.requests.clear()
+    _, report = run_upload(client, make_library())
+    assert client.count("SCHEDULE") == 0
+    assert report.already_scheduled_count == 3
+
+
+def _add_manual_schedules(client):
+    """Aggiunge un duplicato di W0 e una pianificazione di un allenamento non gestito."""
+    workout_id = next(i for i, detail in client.remote.items() if detail["workoutName"] == "W0")
+    client.calendar.items["2026-11-01"].append({"id": 1, "workoutId": workout_id})
+    client.calendar.items.setdefault("2026-11-02", []).append({"id": 2, "workoutId": 999})
+    client.requests.clear()
+    return workout_id
+
+
+def test_sync_schedule_keeps_other_schedules_by_default(client):
+    run_upload(client, make_library())
+    workout_id = _add_manual_schedules(client)
+
+    workouts = make_library()
+    workouts[1].set_scheduled_date("2026-11-10")
+    _, report = run_upload(client, workouts)
+
+    assert client.requests == [("SCHEDULE", workout_id + 1, "2026-11-10")]
+    assert report.unscheduled == []
+    assert {"id": 1, "workoutId": workout_id} in client.calendar.items["2026-11-01"]
+    assert len(client.calendar.items["2026-11-02"]) == 2
+
+
+def test_sync_schedule_does_not_duplicate_existing_date(client):
+    run_upload(client, make_library(count=1))
+    _add_manual_schedules(client)
+
+    _, report = run_upload(client, make_library(count=1))
+    assert client.count("SCHEDULE") == 0
+    assert report.already_scheduled_count == 1
+
+
+def test_sync_schedule_prune_moves_dates_and_removes_duplicates(client):
+    run_upload(client, make_library())
+    workout_id = _add_manual_schedules(client)
+
+    workouts = make_library()
+    workouts[1].set_scheduled_date("2026-11-10")
+    progress = []
+    _, report = run_upload(client, workouts, prune_schedules=True,
+                           progress_callback=lambda done, total, name, message: progress.append((name, message)))
+
+    assert client.count("SCHEDULE") == 1
+    assert sorted(report.unscheduled) == [(workout_id, "2026-11-01"),
+                                          (workout_id + 1, "2026-11-02")]
+    assert sorted(p for p in progress if p[1] == "Pianificazione rimossa") == [
+        ("W0", "Pianificazione rimossa"), ("W1", "Pianificazione rimossa")]
+    # Le pianificazioni di allenamenti non gestiti restano invariate
+    assert {"id": 2, "workoutId": 999} in client.calendar.items["2026-11-02"]
+
+
+def test_create_without_workout_id_is_an_error(client):
+    client.add_workout = lambda workout: {}
+    _, report = run_upload(client, make_library(count=1))
+    assert report.error_count == 1
+    assert "ID" in report.results[0].error
+    assert client.count("SCHEDULE") == 0
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import copy
+import pickle
+
+import pytest
+
+from core.workout import Target, Workout, WorkoutStep, parse_end_condition_value
+
+from conftest import make_workout
+
+
+@pytest.mark.parametrize("obj", [Workout("running", "W01S01"),
+                                 WorkoutStep(0, "interval", end_condition="time", end_condition_value="1:00"),
+                                 Target("pace.zone", 3.8, 3.5)])
+def test_model_objects_have_no_instance_dict(obj):
+    assert not hasattr(obj, "__dict__")
+    with pytest.raises(AttributeError):
+        obj.attributo_inesistente = 1
+
+
+
+@pytest.mark.parametrize("end_condition, value, expected", [
+    ("time", "10min", 600),
+    ("time", "45s", 45),
+    ("time", "1:30", 90),
+    ("time", "1:00:00", 3600),
+    ("distance", "2.5km", 2500),
+    ("distance", "400m", 400),
+    ("lap.button", None, None),
+])
+def test_parse_end_condition_value(end_condition, value, expected):
+    assert parse_end_condition_value(end_condition, value) == expected
+
+
+def test_end_condition_parsed_when_set():
+    step = WorkoutStep(0, "interval", end_condition="time", end_condition_value="1:30")
+    assert step.parsed_end_condition_value() == 90
+
+    step.end_condition_value = "2:00"
+    assert step.parsed_end_condition_value() == 120
+    assert step.end_condition_value == "2:00"
+
+    step.end_condition = "distance"
+    step.end_condition_value = "1km"
+    assert step.parsed_end_condition_value() == 1000
+
+
+def test_invalid_end_condition_raises_on_use():
+    step = WorkoutStep(0, "interval", end_condition="time", end_condition_value="x:y")
+    with pytest.raises(ValueError):
+        step.parsed_end_condition_value()
+
+
+def test_aggregates_follow_step_changes():
+    workout = make_workout("W01S01")
+    assert workout.get_total_duration() == 600 + 4 * 120
+    assert workout.get_total_distance() == 4000
+
+    interval = workout.workout_steps[1].workout_steps[0]
+    interval.end_condition_value = "2km"
+    assert workout.get_total_distance() == 8000
+
+    workout.workout_steps.pop()
+    assert workout.get_total_distance() is None
+    assert workout.get_step_count() == 1
+
+
+@pytest.mark.parametrize("clone", [copy.deepcopy, lambda w: pickle.loads(pickle.dumps(w))])
+def test_copies_are_independent(clone):
+    workout = make_workout("W01S01")
+    workout.get_total_duration()
+    workout.garminconnect_json()
+
+    copied = clone(workout)
+    assert copied.get_total_duration() == workout.get_total_duration()
+    assert copied.garminconnect_json() == workout.garminconnect_json()
+
+    repeat = copied.workout_steps[1]
+    assert repeat._parent is copied
+    assert repeat.workout_steps[0]._parent is repeat
+
+    repeat.workout_steps[0].end_condition_value = "2km"
+    assert copied.get_total_distance() == 8000
+    assert workout.get_total_distance() == 4000
+
+
+def test_deepcopy_of_sub_steps_does_not_copy_parent():
+    workout = make_workout("W01S01")
+    steps = copy.deepcopy(workout.workout_steps[1].workout_steps)
+    assert type(steps) is list
+    assert all(step._parent is None for step in steps)
+
+
+def test_json_is_a_private_copy():
+    workout = make_workout("W01S01")
+    repeat = workout.workout_steps[1]
+
+    step_json = repeat.garminconnect_json()
+    step_json["numberOfIterations"] = 99
+    step_json["workoutSteps"][0]["targetType"]["workoutTargetTypeKey"] = "alterato"
+    workout_json = workout.garminconnect_json()
+    workout_json["workoutSegments"][0]["workoutSteps"][0]["description"] = "alterato"
+
+    expected = make_workout("W01S01").garminconnect_json()
+    assert workout.garminconnect_json() == expected
+    assert repeat.garminconnect_json() == expected["workoutSegments"][0]["workoutSteps"][1]
+
+
+def test_step_json_is_rebuilt_after_change():
+    workout = make_workout("W01S01")
+    interval = workout.workout_steps[1].workout_steps[0]
+    before = workout.garminconnect_json()
+
+    interval.end_condition_value = "2km"
+    after = workout.garminconnect_json()
+    assert after != before
+    assert after["workoutSegments"][0]["workoutSteps"][1]["workoutSteps"][0]["endConditionValue"] == 2000
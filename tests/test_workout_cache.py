@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+
+from core.workout_cache import WorkoutCache
+
+
+def test_cache_hit_only_for_same_update_date(tmp_path):
+    cache = WorkoutCache(str(tmp_path / "cache"))
+    detail = {"workoutId": 1, "workoutName": "W01S01"}
+    cache.put(1, "2026-10-01T10:00:00.0", detail)
+
+    assert cache.get(1, "2026-10-01T10:00:00.0") == detail
+    assert cache.get(1, "2026-10-02T10:00:00.0") is None
+    assert cache.get(1, None) is None
+    assert cache.get(2, "2026-10-01T10:00:00.0") is None
+
+
+def test_cache_without_update_date_is_not_stored(tmp_path):
+    cache = WorkoutCache(str(tmp_path / "cache"))
+    cache.put(1, None, {"workoutId": 1})
+    assert os.listdir(cache.cache_folder) == []
+
+
+def test_invalid_entry_is_ignored(tmp_path):
+    cache = WorkoutCache(str(tmp_path / "cache"))
+    with open(os.path.join(cache.cache_folder, "1.json"), "w", encoding="utf-8") as f:
+        f.write("{non valido")
+    assert cache.get(1, "2026-10-01") is None
+
+
+def test_invalidate_and_clear(tmp_path):
+    cache = WorkoutCache(str(tmp_path / "cache"))
+    cache.put(1, "d1", {"workoutId": 1})
+    cache.put(2, "d2", {"workoutId": 2})
+
+    cache.invalidate(1)
+    cache.invalidate(3)
+    assert cache.get(1, "d1") is None
+    assert cache.get(2, "d2") == {"workoutId": 2}
+
+    cache.clear()
+    assert cache.get(2, "d2") is None
+    assert os.path.isdir(cache.cache_folder)
@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import copy
+
+from core.zone_index import ZoneIndex, changed_zones
+from core.zones import ZoneTables
+
+from conftest import WORKOUT_CONFIG, make_workout
+
+
+def test_changed_zones():
+    new_config = copy.deepcopy(WORKOUT_CONFIG)
+    new_config["paces"]["Z4"] = "4:55"
+    new_config["heart_rates"]["max_hr"] = 190
+    del new_config["power_values"]["threshold"]
+    new_config["swim_paces"]["Z3"] = "1:50"
+
+    changed = changed_zones(ZoneTables(WORKOUT_CONFIG), ZoneTables(new_config))
+    assert changed == {
+        ('pace.zone', 'Z4'),
+        ('heart.rate.zone', 'max_hr'),
+        ('heart.rate.zone', 'Z1_HR'),
+        ('power.zone', 'threshold'),
+        ('pace.zone', 'Z3'),
+    }
+
+
+def test_changed_zones_same_config():
+    assert changed_zones(ZoneTables(WORKOUT_CONFIG), ZoneTables(copy.deepcopy(WORKOUT_CONFIG))) == set()
+
+
+def test_zone_index_retargets_only_affected_workouts():
+    affected = make_workout("W01S01 Ripetute", zone="Z4")
+    other = make_workout("W01S02 Fondo", zone="Z2")
+    index = ZoneIndex([affected, other])
+
+    new_config = copy.deepcopy(WORKOUT_CONFIG)
+    new_config["paces"]["Z4"] = "4:55"
+    new_tables = ZoneTables(new_config)
+    zones = changed_zones(ZoneTables(WORKOUT_CONFIG), new_tables)
+
+    assert index.workouts_for(zones) == [affected]
+    assert index.retarget(zones, new_tables) == [affected]
+    interval = affected.workout_steps[1].workout_steps[0]
+    assert (interval.target.to_value, interval.target.from_value) == new_tables.resolve('pace.zone', 'Z4')
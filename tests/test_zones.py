@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import copy
+
+import pytest
+
+from core.zones import FALLBACK_RANGES, OPEN_POWER_LIMIT, ZoneTables, compile_zones, config_hash
+
+from conftest import WORKOUT_CONFIG
+
+
+def test_pace_zones_with_margins():
+    tables = ZoneTables(WORKOUT_CONFIG)
+    assert tables.resolve('pace.zone', 'Z4') == pytest.approx((1000 / 297, 1000 / 303))
+    assert tables.resolve('pace.zone', 'tempo') == pytest.approx((1000 / 290, 1000 / 310))
+
+
+def test_swim_paces_only_for_swimming():
+    tables = ZoneTables(WORKOUT_CONFIG)
+    assert tables.resolve('pace.zone', 'Z2', 'swimming') == pytest.approx((100 / 117, 100 / 123))
+    assert tables.resolve('pace.zone', 'Z2', 'running') == pytest.approx((1000 / 357, 1000 / 363))
+
+
+def test_heart_rate_and_power_formats():
+    tables = ZoneTables(WORKOUT_CONFIG)
+    assert tables.resolve('heart.rate.zone', 'Z2_HR') == (150, 130)
+    assert tables.resolve('heart.rate.zone', 'Z1_HR') == (136, 111)
+    assert tables.resolve('heart.rate.zone', 'easy') == (145, 135)
+    assert tables.resolve('power.zone', 'Z5') == (OPEN_POWER_LIMIT, 375)
+    assert tables.resolve('power.zone', 'Z1') == (125, 0)
+    assert tables.resolve('power.zone', 'threshold') == (265, 235)
+
+
+def test_invalid_zones_and_margins_are_ignored():
+    config = {"paces": {"Z1": "veloce", "Z2": "6:00"}, "margins": {"faster": "", "hr_up": "x"}}
+    tables = ZoneTables(config)
+    assert not tables.has_zone('pace.zone', 'Z1')
+    assert tables.resolve('pace.zone', 'Z2') == pytest.approx((1000 / 357, 1000 / 363))
+
+
+def test_target_uses_fallback_for_unknown_zone():
+    target = ZoneTables(WORKOUT_CONFIG).target('heart.rate.zone', 'Z9_HR')
+    assert (target.to_value, target.from_value) == FALLBACK_RANGES['heart.rate.zone']
+    assert target.zone_name == 'Z9_HR'
+
+
+def test_compile_zones_reuses_tables_for_equal_config():
+    first = compile_zones(WORKOUT_CONFIG)
+    assert compile_zones(copy.deepcopy(WORKOUT_CONFIG)) is first
+
+    changed = copy.deepcopy(WORKOUT_CONFIG)
+    changed["paces"]["Z4"] = "4:55"
+    assert compile_zones(changed) is not first
+
+
+def test_config_hash_ignores_unrelated_keys():
+    other = dict(WORKOUT_CONFIG, name_prefix="altro", athlete_name="Atleta")
+    assert config_hash(other) == config_hash(WORKOUT_CONFIG)